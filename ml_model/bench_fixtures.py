@@ -0,0 +1,325 @@
+"""
+Synthetic fixtures for the ml_model benchmarks: a stub YouTube Data API client,
+generated video/feature tables and generated resume PDFs.
+Everything is seeded so repeated runs see identical inputs.
+"""
+
+import base64
+import hashlib
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+
+TOPIC_WORDS = [
+    "python", "javascript", "react", "node", "django", "sql", "docker", "kubernetes",
+    "machine", "learning", "data", "science", "web", "development", "api", "cloud",
+    "aws", "linux", "git", "algorithms", "system", "design", "frontend", "backend",
+]
+FILLER_WORDS = [
+    "complete", "course", "tutorial", "beginners", "advanced", "full", "guide", "learn",
+    "projects", "hours", "crash", "masterclass", "bootcamp", "explained", "step", "by",
+]
+COMMENT_TEMPLATES = [
+    "This course is amazing, thank you so much!",
+    "Great explanation, finally understood {word}.",
+    "Too fast and the audio is bad.",
+    "Best {word} tutorial on YouTube",
+    "nice",
+    "I got lost around the middle, not very clear.",
+    "Helpful and well structured, loved the projects.",
+    "Worst tutorial, skipped all the important parts.",
+]
+POSITIVE_COMMENTS = set(COMMENT_TEMPLATES[i] for i in (0, 1, 3, 4, 6))
+
+
+def _words(rng, count):
+    return " ".join(rng.choice(TOPIC_WORDS + FILLER_WORDS) for _ in range(count))
+
+
+def _duration(rng):
+    # Mostly short videos with a long tail of multi-hour courses, like real search results
+    seconds = int(rng.choice([
+        rng.randint(30, 59),
+        rng.randint(60, 1200),
+        rng.randint(600, 3600),
+        rng.randint(3600, 7199),
+        rng.randint(7200, 43200),
+    ]))
+    hours, rest = divmod(seconds, 3600)
+    minutes, secs = divmod(rest, 60)
+    return "PT" + (f"{hours}H" if hours else "") + (f"{minutes}M" if minutes else "") + (f"{secs}S" if secs else "")
+
+
+def make_video(rng, index):
+    published = datetime(2020, 1, 1) + timedelta(days=rng.randint(0, 1800))
+    views = rng.randint(100, 5_000_000)
+    return {
+        "video_id": f"v{index:010d}",
+        "title": _words(rng, rng.randint(4, 12)).title(),
+        "description": _words(rng, rng.randint(20, 300)),
+        "publishedAt": published.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "duration": _duration(rng),
+        "view_count": views,
+        "like_count": int(views * rng.uniform(0.001, 0.05)),
+        "comment_count": int(views * rng.uniform(0.0001, 0.005)),
+    }
+
+
+def make_raw_videos(count, seed=42):
+    """A raw_videos.csv-shaped DataFrame of `count` synthetic videos."""
+    import pandas as pd
+
+    rng = random.Random(seed)
+    return pd.DataFrame([make_video(rng, i) for i in range(count)])
+
+
+def make_features(count, seed=42, sentiment_shift=0.0):
+    """A features.csv-shaped DataFrame of `count` synthetic rows; `sentiment_shift` moves the comment sentiment distribution."""
+    import numpy as np
+    import pandas as pd
+
+    np_rng = np.random.default_rng(seed)
+    raw = make_raw_videos(count, seed)
+    df = raw[["view_count", "like_count", "comment_count"]].copy()
+    df["like_ratio"] = df["like_count"] / (df["view_count"] + 1)
+    df["comment_ratio"] = df["comment_count"] / (df["view_count"] + 1)
+    df["title_len"] = raw["title"].str.len()
+    df["desc_len"] = raw["description"].str.len()
+    df["desc_sentiment"] = np_rng.uniform(-0.2, 0.5, count)
+    df["comment_sentiment"] = np_rng.uniform(-0.3 + sentiment_shift, 0.6 + sentiment_shift, count)
+    df["duration_sec"] = np_rng.integers(30, 43200, count).astype(float)
+    df["age_days"] = np_rng.integers(1, 2000, count)
+    df["target_score"] = (
+        0.3 * df["like_ratio"] + 0.2 * df["comment_ratio"] +
+        0.4 * df["comment_sentiment"] + 0.1 * df["desc_sentiment"]
+    )
+    df["video_id"] = raw["video_id"]
+    df["title"] = raw["title"]
+    df["duration"] = raw["duration"]
+    return df
+
+
+class _Request:
+    def __init__(self, client, endpoint, handler, kwargs):
+        self.client = client
+        self.endpoint = endpoint
+        self.handler = handler
+        self.kwargs = kwargs
+
+    def execute(self):
+        with self.client.lock:
+            self.client.calls[self.endpoint] += 1
+        if self.client.latency_s:
+            time.sleep(self.client.latency_s)
+        return self.handler(**self.kwargs)
+
+
+class _Resource:
+    def __init__(self, client, endpoint, handler):
+        self.client = client
+        self.endpoint = endpoint
+        self.handler = handler
+
+    def list(self, **kwargs):
+        return _Request(self.client, self.endpoint, self.handler, kwargs)
+
+
+class FakeYouTube:
+    """
+    In-process stand-in for googleapiclient's YouTube v3 resource.
+    Supports search().list, videos().list and commentThreads().list and counts calls per endpoint.
+    Responses are derived from the seed and the request alone (video ids are hashes of
+    query/page/position, video details are seeded by id), so separate processes agree.
+    `latency_s` adds a fixed per-call delay to approximate network round trips.
+    """
+
+    def __init__(self, seed=42, comments_per_video=20, latency_s=0.0, max_search_results=500):
+        self.seed = seed
+        self.comments_per_video = comments_per_video
+        self.latency_s = latency_s
+        self.max_search_results = max_search_results
+        self.lock = threading.Lock()
+        self.calls = {"search": 0, "videos": 0, "commentThreads": 0}
+
+    def search(self):
+        return _Resource(self, "search", self._search)
+
+    def videos(self):
+        return _Resource(self, "videos", self._videos_list)
+
+    def commentThreads(self):
+        return _Resource(self, "commentThreads", self._comment_threads)
+
+    def _video_id(self, q, page, position):
+        digest = hashlib.blake2b(f"{self.seed}:{q}:{page}:{position}".encode(), digest_size=8).digest()
+        return base64.urlsafe_b64encode(digest).decode().rstrip("=")  # 11 chars, like real ids
+
+    def video(self, video_id):
+        video = make_video(random.Random(f"{self.seed}:{video_id}"), 0)
+        video["video_id"] = video_id
+        return video
+
+    def _search(self, q="", maxResults=5, pageToken=None, **kwargs):
+        page = int(pageToken or 0)
+        maxResults = int(maxResults)
+        count = max(0, min(maxResults, self.max_search_results - page * maxResults))
+        items = []
+        for position in range(count):
+            video = self.video(self._video_id(q, page, position))
+            items.append({"id": {"kind": "youtube#video", "videoId": video["video_id"]},
+                          "snippet": {"title": video["title"]}})
+        response = {"items": items, "pageInfo": {"totalResults": self.max_search_results, "resultsPerPage": maxResults}}
+        if (page + 1) * maxResults < self.max_search_results:
+            response["nextPageToken"] = str(page + 1)
+        return response
+
+    def _videos_list(self, id="", **kwargs):
+        items = []
+        for video_id in [v for v in id.split(",") if v]:
+            video = self.video(video_id)
+            items.append({
+                "id": video_id,
+                "snippet": {"title": video["title"], "description": video["description"],
+                            "publishedAt": video["publishedAt"], "channelId": "UC" + video_id[-8:],
+                            "channelTitle": "Channel " + video_id[-3:]},
+                "contentDetails": {"duration": video["duration"]},
+                "statistics": {"viewCount": str(video["view_count"]), "likeCount": str(video["like_count"]),
+                               "commentCount": str(video["comment_count"])},
+            })
+        return {"items": items}
+
+    def _comment_threads(self, videoId="", maxResults=20, pageToken=None, **kwargs):
+        rng = random.Random(f"{self.seed}:{videoId}:{pageToken}")
+        # Each video has its own audience mood, from near-unanimous to evenly split
+        positive_share = random.Random(f"{self.seed}:{videoId}:mood").random()
+        weights = [positive_share if template in POSITIVE_COMMENTS else 1 - positive_share for template in COMMENT_TEMPLATES]
+        start = int(pageToken or 0)
+        count = max(0, min(int(maxResults), self.comments_per_video - start))
+        items = []
+        for _ in range(count):
+            text = rng.choices(COMMENT_TEMPLATES, weights)[0].format(word=rng.choice(TOPIC_WORDS))
+            items.append({"snippet": {"topLevelComment": {"snippet": {"textDisplay": text, "textOriginal": text}}}})
+        response = {"items": items}
+        if start + count < self.comments_per_video:
+            response["nextPageToken"] = str(start + count)
+        return response
+
+
+RESUME_SECTIONS = [
+    ("John Doe", ["john.doe@example.com | +1 555 0100 | linkedin.com/in/johndoe | github.com/johndoe"]),
+    ("SUMMARY", ["Software engineer with {yoe} years of experience building web services and data pipelines."]),
+    ("EXPERIENCE", [
+        "Senior Engineer, Acme Corp - Built REST API services in {a} and {b} serving 2M requests per day.",
+        "Migrated deployment to {c} and kubernetes, cutting release time by 60 percent.",
+        "Engineer, Initech - Developed {a} dashboards with react and postgresql.",
+        "Mentored four junior engineers and ran agile ceremonies for the team.",
+    ]),
+    ("PROJECTS", [
+        "Resume ranker: a {b} and scikit-learn pipeline that scores candidates.",
+        "Realtime chat built with node.js, graphql and mongodb.",
+    ]),
+    ("SKILLS", ["{a}, {b}, {c}, docker, git, linux, aws, sql, html, css"]),
+    ("EDUCATION", ["B.Sc. Computer Science, State University, 2016"]),
+]
+
+
+def make_resume_text(seed=0):
+    rng = random.Random(seed)
+    a, b, c = rng.sample(["python", "java", "javascript", "typescript", "django", "flask",
+                          "fastapi", "tensorflow", "pytorch", "pandas", "docker", "aws"], 3)
+    lines = []
+    for heading, body in RESUME_SECTIONS:
+        lines.append(heading)
+        lines.extend(line.format(a=a, b=b, c=c, yoe=rng.randint(1, 12)) for line in body)
+    return "\n".join(lines)
+
+
+LONG_RESUME_FILLER = [
+    "Curriculum Vitae",
+    "{name} | {name_lower}@example.com | +1 555 01{n:02d} | 221B Baker Street, Springfield, 12345",
+    "linkedin.com/in/{name_lower} | github.com/{name_lower} | Portfolio: www.{name_lower}.dev",
+    "Date of birth: 01/02/1994 | Nationality: Examplestan | Driving licence: B",
+    "Objective",
+    "To obtain a challenging position in a reputed organization where I can use my skills and knowledge "
+    "for the growth of the organization as well as my own personal growth and career development.",
+    "I am a hardworking, punctual, honest and dedicated person who is a quick learner, a good team player "
+    "and able to work under pressure while meeting deadlines in a fast paced environment.",
+    "Education",
+    "Master of Science in Computer Science, Example Institute of Technology, 2017 - 2019, GPA 3.7/4.0",
+    "Bachelor of Engineering in Information Technology, State University, 2013 - 2017, First Class",
+    "Higher Secondary Certificate, City Public School, 2013, 91 percent",
+    "Relevant coursework: data structures, operating systems, computer networks, discrete mathematics",
+]
+LONG_RESUME_BODY = [
+    "Experience",
+    "Senior Software Engineer, Acme Corp, 2021 - present",
+    "Built {a} microservices handling 5M requests per day with p99 latency under 80 ms.",
+    "Led the migration of the monolith to {c} and kubernetes, reducing deployment time by 70%.",
+    "Designed a {b} data pipeline on aws that cut nightly batch processing from 6 hours to 45 minutes.",
+    "Mentored 5 engineers and introduced code review and ci/cd practices with git and docker.",
+    "Software Engineer, Initech, 2019 - 2021",
+    "Developed rest api endpoints in {a} and postgresql for the billing platform used by 200k users.",
+    "Implemented graphql gateway and caching layer, improving page load performance by 35%.",
+    "Attended daily stand-up meetings and sprint planning sessions with the team.",
+    "Projects",
+    "Open-source {b} library for feature stores with 1.2k GitHub stars, tested with pytest.",
+    "Realtime analytics dashboard in react and typescript backed by mongodb change streams.",
+    "Technical Skills",
+    "Languages: {a}, {b}, sql, javascript | Frameworks: {c}, react, django | Tools: docker, kubernetes, git, linux",
+    "Certifications",
+    "AWS Certified Solutions Architect - Associate, 2022",
+    "Interests",
+    "Cricket, travelling, reading novels, photography and playing the guitar.",
+    "References",
+    "Available upon request.",
+    "Declaration",
+    "I hereby declare that the above information is true to the best of my knowledge and belief.",
+]
+
+
+def make_long_resume_text(seed=0):
+    """A realistically padded resume: contact block, boilerplate objective and education come first,
+    so the skill-relevant experience starts well past the first couple of thousand characters."""
+    rng = random.Random(seed)
+    a, b, c = rng.sample(["python", "java", "fastapi", "flask", "tensorflow", "pytorch",
+                          "pandas", "node.js", "angular", "vue", "azure", "gcp"], 3)
+    name = rng.choice(["Jane Roe", "Alex Kim", "Sam Patel", "Maria Garcia", "Chen Wei"])
+    lines = [line.format(name=name, name_lower=name.split()[0].lower(), n=seed % 100) for line in LONG_RESUME_FILLER]
+    # Real resumes repeat their boilerplate; vary its length a little between seeds
+    lines += LONG_RESUME_FILLER[5:7] * rng.randint(1, 2)
+    lines += [line.format(a=a, b=b, c=c) for line in LONG_RESUME_BODY]
+    # Resume text reaches the prompt flattened, exactly as mock_interview_cli.parse_resume_file returns it
+    return " ".join(lines)
+
+
+def write_resume_pdf(path, text):
+    """Write a minimal single-page PDF containing `text`, one line per text row."""
+    def escape(line):
+        return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+    rows = ["BT /F1 10 Tf 50 780 Td 12 TL"]
+    rows.extend(f"({escape(line)}) Tj T*" for line in text.splitlines())
+    rows.append("ET")
+    stream = "\n".join(rows).encode("latin-1", "replace")
+
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents 4 0 R "
+        b"/Resources << /Font << /F1 5 0 R >> >> >>",
+        b"<< /Length " + str(len(stream)).encode() + b" >>\nstream\n" + stream + b"\nendstream",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n".encode() + body + b"\nendobj\n"
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    out += b"".join(f"{offset:010d} 00000 n \n".encode() for offset in offsets)
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+
+    with open(path, "wb") as f:
+        f.write(out)
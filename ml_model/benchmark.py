@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+
+"""
+ML Pipeline Benchmark Suite
+Times each stage of the ml_model pipeline on seeded synthetic fixtures with a
+stubbed YouTube client, so runs are reproducible and need no API key.
+
+Usage:
+    python benchmark.py                              # run, print JSON lines
+    python benchmark.py --videos 2000 --repeat 5     # bigger fixtures
+    python benchmark.py --save-baseline bench_baseline.json
+    python benchmark.py --compare bench_baseline.json --threshold 0.2
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import bench_fixtures
+
+
+@contextlib.contextmanager
+def quiet():
+    """Swallow the pipeline's progress prints so they don't skew timings or the JSON output."""
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        yield
+
+
+def time_runs(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with quiet():
+            func()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+# --- Benchmarks: each takes the parsed args and returns (callable, items_per_call, extra) ---
+
+def bench_collect(args, workdir):
+    import collect_data_for_ml
+
+    def run():
+        youtube = bench_fixtures.FakeYouTube(seed=args.seed)
+        remaining = args.videos
+        page = 0
+        while remaining > 0:
+            batch = min(50, remaining)
+            collect_data_for_ml.fetch_videos_for_ml(f"topic {page}", batch, youtube=youtube, use_index=False, dedupe=False)
+            remaining -= batch
+            page += 1
+
+    return run, args.videos, {}
+
+
+def bench_create_features(args, workdir):
+    import features
+
+    raw = bench_fixtures.make_raw_videos(args.videos, args.seed)
+    youtube = bench_fixtures.FakeYouTube(seed=args.seed)
+    return (lambda: features.create_features(raw.copy(), youtube=youtube)), args.videos, {}
+
+
+def bench_comment_sampling(args, workdir):
+    """Fixed-15 comment sampling, with fetch/score counts and ranking drift against scoring every comment."""
+    import pandas as pd
+    from scipy.stats import spearmanr
+
+    import features
+
+    raw = bench_fixtures.make_raw_videos(args.videos, args.seed)
+    youtube = bench_fixtures.FakeYouTube(seed=args.seed, comments_per_video=100)
+
+    def sample(max_comments=15):
+        rows, counts = [], []
+        for video in raw.to_dict("records"):
+            sentiment, stats = features.sample_comment_sentiment(youtube, video["video_id"], max_comments)
+            rows.append(features.feature_row(video, sentiment or 0.0))
+            counts.append(stats)
+        return pd.DataFrame(rows).set_index("video_id")["target_score"], pd.DataFrame(counts)
+
+    with quiet():
+        fixed_scores, fixed_counts = sample()
+        full_scores, _ = sample(100)  # every available comment, as the reference
+    top5 = lambda scores: set(scores.nlargest(5).index)
+    extra = {
+        "fixed_fetched_per_video": round(fixed_counts["fetched"].mean(), 2),
+        "fixed_scored_per_video": round(fixed_counts["scored"].mean(), 2),
+        "fixed_spearman_vs_all_comments": round(spearmanr(full_scores, fixed_scores[full_scores.index])[0], 4),
+        "top5_overlap_vs_all_comments": len(top5(fixed_scores) & top5(full_scores)),
+    }
+
+    def run():
+        for video_id in raw["video_id"]:
+            features.sample_comment_sentiment(youtube, video_id, 15)
+
+    return run, args.videos, extra
+
+
+def bench_train(args, workdir):
+    import train_and_rank
+
+    df = bench_fixtures.make_features(args.videos, args.seed)
+    return (lambda: train_and_rank.train_model(df, n_estimators=args.trees)), args.videos, {"trees": args.trees}
+
+
+def bench_rank(args, workdir):
+    import train_and_rank
+
+    path = os.path.join(workdir, "rank_features.csv")
+    bench_fixtures.make_features(args.videos, args.seed).to_csv(path, index=False)
+    with quiet():
+        model = train_and_rank.train_model(bench_fixtures.make_features(args.videos, args.seed), n_estimators=args.trees)
+
+    def run():
+        train_and_rank.rank_new_videos(path, model=model)
+
+    return run, args.videos, {}
+
+
+def bench_extract_skills(args, workdir):
+    import mock_interview_cli
+
+    texts = [bench_fixtures.make_resume_text(seed) for seed in range(args.resumes)]
+    with quiet():
+        nlp = mock_interview_cli.get_nlp()  # model load is not part of per-document cost
+    if nlp is None:
+        # Without the model only keyword matching runs, which is not what this stage measures
+        raise ImportError(f"{mock_interview_cli.SPACY_MODEL} model unavailable")
+    return (lambda: mock_interview_cli.extract_skills_batch(texts)), args.resumes, {}
+
+
+def bench_extract_resume_text(args, workdir):
+    import mock_interview_cli
+
+    paths = []
+    for seed in range(args.resumes):
+        path = os.path.join(workdir, f"resume_{seed}.pdf")
+        bench_fixtures.write_resume_pdf(path, bench_fixtures.make_resume_text(seed))
+        paths.append(path)
+
+    def run():
+        for path in paths:
+            mock_interview_cli.extract_resume_text(path)
+
+    return run, args.resumes, {}
+
+
+BENCHMARKS = {
+    "collect": bench_collect,
+    "create_features": bench_create_features,
+    "comment_sampling": bench_comment_sampling,
+    "train": bench_train,
+    "rank_new_videos": bench_rank,
+    "extract_skills": bench_extract_skills,
+    "extract_resume_text": bench_extract_resume_text,
+}
+
+
+def run_benchmarks(args):
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for name in args.only or BENCHMARKS:
+            record = {"benchmark": name}
+            try:
+                func, items, extra = BENCHMARKS[name](args, workdir)
+                if args.warmup:
+                    time_runs(func, 1)
+                timings = time_runs(func, args.repeat)
+                median = statistics.median(timings)
+                record.update({
+                    "status": "ok",
+                    "items": items,
+                    "repeat": args.repeat,
+                    "median_s": round(median, 6),
+                    "min_s": round(min(timings), 6),
+                    "max_s": round(max(timings), 6),
+                    "per_item_ms": round(median / items * 1000, 4) if items else None,
+                    **extra,
+                })
+            except ImportError as e:
+                # Stages whose optional dependencies (spaCy, pdfplumber, ...) are missing are skipped
+                record.update({"status": "skipped", "reason": str(e)})
+            except Exception as e:
+                record.update({"status": "error", "reason": f"{type(e).__name__}: {e}"})
+            results.append(record)
+            print(json.dumps(record), flush=True)
+    return results
+
+
+def compare(results, baseline_path, threshold):
+    """Flag benchmarks whose median is more than `threshold` slower than the stored baseline."""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {r["benchmark"]: r for r in json.load(f)["results"]}
+
+    regressions = []
+    for result in results:
+        base = baseline.get(result["benchmark"])
+        if result.get("status") != "ok" or not base or base.get("status") != "ok":
+            continue
+        ratio = result["median_s"] / base["median_s"] if base["median_s"] else float("inf")
+        row = {
+            "compare": result["benchmark"],
+            "baseline_s": base["median_s"],
+            "current_s": result["median_s"],
+            "ratio": round(ratio, 3),
+            "regression": ratio > 1 + threshold,
+        }
+        if row["regression"]:
+            regressions.append(result["benchmark"])
+        print(json.dumps(row))
+
+    print(json.dumps({"summary": True, "threshold": threshold, "regressions": regressions}))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--videos', type=int, default=500, help='Synthetic videos per pipeline benchmark')
+    parser.add_argument('--resumes', type=int, default=20, help='Synthetic resumes per resume benchmark')
+    parser.add_argument('--trees', type=int, default=300, help='Forest size for the train benchmark')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed runs per benchmark')
+    parser.add_argument('--seed', type=int, default=42, help='Fixture seed')
+    parser.add_argument('--no-warmup', dest='warmup', action='store_false', help='Skip the untimed warmup run')
+    parser.add_argument('--only', nargs='+', choices=list(BENCHMARKS), help='Run a subset of benchmarks')
+    parser.add_argument('--save-baseline', help='Write results to this JSON file')
+    parser.add_argument('--compare', help='Compare against a baseline JSON file')
+    parser.add_argument('--threshold', type=float, default=0.2, help='Allowed slowdown before flagging (0.2 = 20%%)')
+    args = parser.parse_args()
+
+    results = run_benchmarks(args)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump({
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "args": {k: v for k, v in vars(args).items() if k not in ("save_baseline", "compare")},
+                "results": results,
+            }, f, indent=2)
+
+    if args.compare and compare(results, args.compare, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,57 +1,131 @@
 import os
 import sys
-from dotenv import load_dotenv
-import googleapiclient.discovery
 import pandas as pd
-import re
+from console import configure_console
+from pipeline_metrics import metrics
+from video_filters import filter_videos, parse_duration
+from video_index import MIN_LOCAL_RESULTS, MIN_TERM_COVERAGE, VideoIndex
+from video_buffer import DESCRIPTION_SPILL_PATH, VideoBuffer
+from video_dedupe import dedupe_videos
+from youtube_client import build_youtube, youtube_configured
 
-# Fix Windows console encoding issues
-if sys.platform == 'win32':
-    import io
-    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
-    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
+def fetch_video_details(youtube, video_ids):
+    """
+    Fetch statistics/contentDetails/snippet for many videos using batched
+    videos().list calls (up to 50 ids per call) instead of one call per video.
+    """
+    videos = []
+    for start in range(0, len(video_ids), 50):
+        batch = video_ids[start:start + 50]
+        try:
+            stats = youtube.videos().list(
+                part="statistics,contentDetails,snippet", id=",".join(batch), maxResults=len(batch)
+            ).execute()
+            metrics.incr("api_calls.videos")
+        except Exception as e:
+            print(f"Error fetching details for {len(batch)} videos: {str(e)}")
+            continue
 
-load_dotenv()
-API_KEY = os.getenv("YOUTUBE_API_KEY")
+        for vid in stats["items"]:
+            videos.append({
+                "video_id": vid["id"],
+                "title": vid["snippet"]["title"],
+                "description": vid["snippet"].get("description", ""),
+                "channel_id": vid["snippet"].get("channelId", ""),
+                "publishedAt": vid["snippet"]["publishedAt"],
+                "duration": vid["contentDetails"]["duration"],
+                "view_count": int(vid["statistics"].get("viewCount", 0)),
+                "like_count": int(vid["statistics"].get("likeCount", 0)),
+                "comment_count": int(vid["statistics"].get("commentCount", 0)),
+            })
+    return videos
 
-def parse_duration_simple(duration_str):
-    """Simple duration parser for display purposes"""
-    if not duration_str or duration_str == 'PT0S':
-        return 0
-    
-    duration_str = duration_str.replace('PT', '')
-    
-    hours = 0
-    minutes = 0
-    seconds = 0
-    
-    hour_match = re.search(r'(\d+)H', duration_str)
-    if hour_match:
-        hours = int(hour_match.group(1))
-    
-    minute_match = re.search(r'(\d+)M', duration_str)
-    if minute_match:
-        minutes = int(minute_match.group(1))
-    
-    second_match = re.search(r'(\d+)S', duration_str)
-    if second_match:
-        seconds = int(second_match.group(1))
-    
-    return hours * 3600 + minutes * 60 + seconds
+def report_filter_savings(stats, detail_calls):
+    """Print and record how many API calls the batched fetch and early filtering saved"""
+    # One videos().list per video before batching; one commentThreads call per dropped video in features.py
+    saved_detail_calls = stats["fetched"] - detail_calls
+    saved_comment_calls = stats["dropped"]
+    metrics.set("filter.fetched", stats["fetched"])
+    metrics.set("filter.kept", stats["kept"])
+    metrics.set("filter.fallback", int(stats["fallback"]))
+    metrics.set("api_calls.saved.videos", saved_detail_calls)
+    metrics.set("api_calls.saved.commentThreads", saved_comment_calls)
+
+    print(f"Filtering: {stats['fetched']} -> {stats['kept']} videos", end="")
+    print(" (fallback: top longest videos)" if stats["fallback"] else "")
+    for reason, count in stats["reasons"].items():
+        print(f"   - {reason}: {count}")
+    print(f"API calls saved: {saved_detail_calls} videos.list + {saved_comment_calls} commentThreads.list")
 
-def fetch_videos_for_ml(query, max_results=50):
+def lookup_local_videos(index, youtube, query, max_results, apply_filters=True):
     """
-    Collect videos WITHOUT duration filtering for ML pipeline
-    This is step 1: collect maximum data for ML analysis
+    Answer a topic from the local video index. Hits get their statistics refreshed with
+    one batched videos().list call (1 quota unit per 50 videos vs. 100 for a search).
+    Returns the videos, or None when local recall is too low and the live search is needed.
+    Only hits containing MIN_TERM_COVERAGE of the query terms count: a topic that merely
+    shares a word with indexed videos ("python programming" vs. "javascript programming")
+    still goes to the live search.
     """
-    if not API_KEY or API_KEY == 'your_youtube_api_key_here':
+    hits = index.search(query, top_k=max_results, min_coverage=MIN_TERM_COVERAGE)
+    if len(hits) < MIN_LOCAL_RESULTS:
+        return None
+
+    videos = fetch_video_details(youtube, [video["video_id"] for _, video in hits])
+    index.add_videos(videos)
+    if apply_filters:
+        kept, stats = filter_videos(videos)
+        if stats["fallback"] or len(kept) < MIN_LOCAL_RESULTS:
+            return None
+        report_filter_savings(stats, (len(videos) + 49) // 50)
+        videos = kept
+
+    metrics.incr("cache_hits.video_index")
+    print(f"Local index: {len(hits)} matches for '{query}', {len(videos)} usable - skipping live search")
+    return videos
+
+def collapse_duplicates(videos):
+    videos, stats = dedupe_videos(videos)
+    if stats:
+        metrics.set("dedupe.videos", stats["videos"])
+        metrics.set("dedupe.duplicates", stats["duplicates"])
+        # Each collapsed duplicate is one commentThreads call features.py no longer makes
+        metrics.set("api_calls.saved.dedupe", stats["duplicates"])
+    return videos
+
+def to_frame(videos):
+    """Reduce collected video dicts into the compact columnar frame (video_buffer.py)."""
+    buffer = VideoBuffer(DESCRIPTION_SPILL_PATH).extend(videos)
+    buffer.close()
+    return buffer.to_frame()
+
+def fetch_videos_for_ml(query, max_results=50, youtube=None, apply_filters=True, use_index=True, dedupe=True):
+    """
+    Collect videos for ML pipeline
+    This is step 1: search, fetch details in batches, then drop videos that the
+    ranking step would discard anyway (duration / Shorts / views, see video_filters.py)
+    so no comment or sentiment work is spent on them.
+    Topics the local video index (video_index.py) can already answer skip the search call.
+    Near-duplicate re-uploads are collapsed to one video per cluster (video_dedupe.py).
+    The result is a compact columnar frame: descriptions are reduced to desc_len /
+    desc_sentiment (and a short snippet) here rather than in features.py.
+    Pass `youtube` to use an already-built (or stub) API client.
+    """
+    if youtube is None and not youtube_configured():
         print("WARNING: YouTube API key not configured")
         return pd.DataFrame()
     
-    print(f"STEP 1: Collecting UNFILTERED videos for ML analysis")
-    print(f"Query: '{query}' | Target: {max_results} videos (no duration filtering)")
+    print(f"STEP 1: Collecting videos for ML analysis")
+    print(f"Query: '{query}' | Target: {max_results} videos ({'filtered' if apply_filters else 'no filtering'})")
         
-    youtube = googleapiclient.discovery.build("youtube", "v3", developerKey=API_KEY)
+    if youtube is None:
+        youtube = build_youtube()
+
+    index = VideoIndex() if use_index else None
+    if index:
+        local_videos = lookup_local_videos(index, youtube, query, max_results, apply_filters)
+        if local_videos is not None:
+            index.close()
+            return to_frame(collapse_duplicates(local_videos) if dedupe else local_videos)
     
     # Search for maximum videos without filtering - let ML decide quality
     search_response = youtube.search().list(
@@ -61,45 +135,36 @@ def fetch_videos_for_ml(query, max_results=50):
         type="video",
         order="relevance"  # Get most relevant first
     ).execute()
+    metrics.incr("api_calls.search")
 
-    videos = []
-    
-    print(f"Processing {len(search_response['items'])} videos from YouTube...")
-    
-    for i, item in enumerate(search_response["items"], 1):
-        video_id = item["id"]["videoId"]
+    video_ids = [item["id"]["videoId"] for item in search_response["items"]]
+    print(f"Processing {len(video_ids)} videos from YouTube...")
 
-        # Fetch detailed video information
-        try:
-            stats = youtube.videos().list(
-                part="statistics,contentDetails,snippet", id=video_id
-            ).execute()
+    videos = fetch_video_details(youtube, video_ids)
+    if index:
+        # Everything fetched goes into the index, including videos filtered out below
+        index.add_videos(videos)
+        index.close()
+    for i, video_data in enumerate(videos, 1):
+        # Show progress
+        duration_min = parse_duration(video_data["duration"]) / 60
+        print(f"Video {i:2d}: '{video_data['title'][:45]}...' ({duration_min:.1f}min, {video_data['view_count']:,} views)")
 
-            for vid in stats["items"]:
-                video_data = {
-                    "video_id": video_id,
-                    "title": vid["snippet"]["title"],
-                    "description": vid["snippet"].get("description", ""),
-                    "publishedAt": vid["snippet"]["publishedAt"],
-                    "duration": vid["contentDetails"]["duration"],
-                    "view_count": int(vid["statistics"].get("viewCount", 0)),
-                    "like_count": int(vid["statistics"].get("likeCount", 0)),
-                    "comment_count": int(vid["statistics"].get("commentCount", 0)),
-                }
-                videos.append(video_data)
-                
-                # Show progress
-                duration_min = parse_duration_simple(video_data["duration"]) / 60
-                print(f"Video {i:2d}: '{video_data['title'][:45]}...' ({duration_min:.1f}min, {video_data['view_count']:,} views)")
-        
-        except Exception as e:
-            print(f"Error fetching video {i}: {str(e)}")
-            continue
+    if apply_filters:
+        # Only kept videos reach features.py, so they are also all train_and_rank.py trains on
+        # (see MIN_TRAINING_ROWS there for small topics)
+        detail_calls = (len(video_ids) + 49) // 50
+        videos, stats = filter_videos(videos)
+        report_filter_savings(stats, detail_calls)
+
+    if dedupe:
+        videos = collapse_duplicates(videos)
     
     print(f"SUCCESS: Collected {len(videos)} videos for ML analysis")
-    return pd.DataFrame(videos)
+    return to_frame(videos)
 
 if __name__ == "__main__":
+    configure_console()
     if len(sys.argv) > 1:
         query = sys.argv[1]
         max_results = int(sys.argv[2]) if len(sys.argv) > 2 else 50
@@ -111,10 +176,12 @@ if __name__ == "__main__":
     print(f"=" * 50)
     print(f"Query: {query}")
     print(f"Target videos: {max_results}")
-    print(f"Filtering: NONE (ML will analyze all videos)")
+    print(f"Filtering: duration/Shorts/views before comment analysis")
     print()
     
-    df = fetch_videos_for_ml(query, max_results)
+    with metrics.span("collect", query=query) as span:
+        df = fetch_videos_for_ml(query, max_results)
+        span["rows"] = len(df)
     
     if df.empty:
         print("No videos collected - API key issue")
@@ -143,7 +210,9 @@ if __name__ == "__main__":
         })
         print(f"Created sample dataset with {len(df)} videos (mixed durations)")
     
-    df.to_csv("raw_videos.csv", index=False)
+    df.to_csv("raw_videos.csv", index=False, date_format="%Y-%m-%dT%H:%M:%SZ")
+    metrics.set("rows.collected", len(df))
+    metrics.flush()
     print()
     print(f"Saved {len(df)} videos to raw_videos.csv")
     print(f"Next: Run features.py to analyze videos and extract features")
\ No newline at end of file
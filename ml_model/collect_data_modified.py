@@ -1,47 +1,32 @@
 
 import os
 import sys
-from dotenv import load_dotenv
-import googleapiclient.discovery
 import pandas as pd
-
-load_dotenv()
-API_KEY = os.getenv("YOUTUBE_API_KEY")
+from pipeline_metrics import metrics
+from collect_data_for_ml import fetch_video_details, report_filter_savings, to_frame
+from video_filters import filter_videos
+from youtube_client import build_youtube, youtube_configured
 
 def fetch_videos(query, max_results=10):
-    if not API_KEY or API_KEY == 'your_youtube_api_key_here':
+    if not youtube_configured():
         print("Warning: YouTube API key not configured")
         # Return empty dataframe for fallback
         return pd.DataFrame()
         
-    youtube = googleapiclient.discovery.build("youtube", "v3", developerKey=API_KEY)
+    youtube = build_youtube()
     search_response = youtube.search().list(
         q=query, part="snippet", maxResults=max_results, type="video"
     ).execute()
+    metrics.incr("api_calls.search")
 
-    videos = []
-    for item in search_response["items"]:
-        video_id = item["id"]["videoId"]
-
-        # Fetch video statistics
-        stats = youtube.videos().list(
-            part="statistics,contentDetails,snippet", id=video_id
-        ).execute()
-
-        for vid in stats["items"]:
-            data = {
-                "video_id": video_id,
-                "title": vid["snippet"]["title"],
-                "description": vid["snippet"].get("description", ""),
-                "publishedAt": vid["snippet"]["publishedAt"],
-                "duration": vid["contentDetails"]["duration"],
-                "view_count": int(vid["statistics"].get("viewCount", 0)),
-                "like_count": int(vid["statistics"].get("likeCount", 0)),
-                "comment_count": int(vid["statistics"].get("commentCount", 0)),
-            }
-            videos.append(data)
+    # Batched detail fetch, then drop videos ranking would discard before features.py fetches their comments
+    video_ids = [item["id"]["videoId"] for item in search_response["items"]]
+    videos = fetch_video_details(youtube, video_ids)
+    videos, stats = filter_videos(videos)
+    report_filter_savings(stats, (len(video_ids) + 49) // 50)
 
-    return pd.DataFrame(videos)
+    # Same compact frame as collect_data_for_ml.py: descriptions reduced to length / sentiment
+    return to_frame(videos)
 
 if __name__ == "__main__":
     if len(sys.argv) > 1:
@@ -52,7 +37,9 @@ if __name__ == "__main__":
         max_results = 10
         
     print(f"Fetching videos for: {query}")
-    df = fetch_videos(query, max_results)
+    with metrics.span("collect", query=query) as span:
+        df = fetch_videos(query, max_results)
+        span["rows"] = len(df)
     
     if df.empty:
         print("No videos fetched - API key not configured or API error")
@@ -68,5 +55,7 @@ if __name__ == "__main__":
             'comment_count': [1000, 500, 750]
         })
     
-    df.to_csv("raw_videos.csv", index=False)
+    df.to_csv("raw_videos.csv", index=False, date_format="%Y-%m-%dT%H:%M:%SZ")
+    metrics.set("rows.collected", len(df))
+    metrics.flush()
     print(f"Fetched and saved {len(df)} videos to raw_videos.csv")
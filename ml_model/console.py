@@ -0,0 +1,11 @@
+"""Console setup shared by the pipeline scripts' entry points."""
+
+import io
+import sys
+
+
+def configure_console():
+    """Fix Windows console encoding issues (emoji / non-ASCII titles) - call from __main__ only"""
+    if sys.platform == 'win32' and (sys.stdout.encoding or '').lower() != 'utf-8':
+        sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+        sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
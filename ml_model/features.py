@@ -1,22 +1,13 @@
 import pandas as pd
-from textblob import TextBlob
 import re
-from datetime import datetime
+from datetime import datetime, timezone
 import isodate
 import sys
 import os
-from dotenv import load_dotenv
-import googleapiclient.discovery
 import numpy as np
-
-# Fix Windows console encoding issues
-if sys.platform == 'win32':
-    import io
-    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
-    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
-
-load_dotenv()
-API_KEY = os.getenv("YOUTUBE_API_KEY")
+from console import configure_console
+from pipeline_metrics import metrics
+from youtube_client import build_youtube, youtube_configured
 
 def clean_text(text):
     if not isinstance(text, str):
@@ -26,6 +17,7 @@ def clean_text(text):
 def get_sentiment(text):
     if not text or pd.isna(text):
         return 0
+    from textblob import TextBlob  # pulls in nltk; only load it once there is text to score
     return TextBlob(text).sentiment.polarity  # between -1 and +1
 
 def iso_to_seconds(duration):
@@ -34,39 +26,58 @@ def iso_to_seconds(duration):
     except:
         return 0
 
-def get_comment_sentiment(video_id, max_comments=20):
+def build_youtube_client():
+    if not youtube_configured():
+        return None
+    return build_youtube()
+
+MIN_COMMENT_CHARS = 10
+# Partial response: only the comment text is downloaded
+COMMENT_FIELDS = "items/snippet/topLevelComment/snippet/textDisplay"
+
+def sample_comment_sentiment(youtube, video_id, max_comments=15):
+    """
+    Score a video's most relevant comments from a single page of `max_comments`.
+    Returns (mean sentiment or None, stats).
+    """
+    response = youtube.commentThreads().list(
+        part="snippet",
+        videoId=video_id,
+        maxResults=min(max_comments, 100),
+        order="relevance",  # Get most relevant comments
+        textFormat="plainText",
+        fields=COMMENT_FIELDS
+    ).execute()
+    metrics.incr("api_calls.commentThreads")
+
+    items = response.get('items', [])
+    sentiments = []
+    for comment in items:
+        comment_text = comment['snippet']['topLevelComment']['snippet']['textDisplay']
+        if len(comment_text.strip()) > MIN_COMMENT_CHARS:  # Only meaningful comments
+            sentiments.append(get_sentiment(comment_text))
+
+    metrics.incr("comments.fetched", len(items))
+    metrics.incr("comments.scored", len(sentiments))
+    stats = {"fetched": len(items), "scored": len(sentiments)}
+    return (float(np.mean(sentiments)) if sentiments else None), stats
+
+def get_comment_sentiment(video_id, max_comments=20, youtube=None):
     """
     Fetch and analyze comment sentiment for a video
     Returns average sentiment score from comments
     """
-    if not API_KEY or API_KEY == 'your_youtube_api_key_here':
+    if youtube is None and not youtube_configured():
         print(f"WARNING: No API key - using default sentiment for {video_id[:8]}...")
         return 0.1  # Neutral-positive default
     
     try:
-        youtube = googleapiclient.discovery.build("youtube", "v3", developerKey=API_KEY)
-        
-        # Fetch comments
-        comments_response = youtube.commentThreads().list(
-            part="snippet",
-            videoId=video_id,
-            maxResults=max_comments,
-            order="relevance"  # Get most relevant comments
-        ).execute()
+        if youtube is None:
+            youtube = build_youtube()
         
-        sentiments = []
-        comment_texts = []
-        
-        for comment in comments_response.get('items', []):
-            comment_text = comment['snippet']['topLevelComment']['snippet']['textDisplay']
-            if len(comment_text.strip()) > 10:  # Only meaningful comments
-                sentiment = get_sentiment(comment_text)
-                sentiments.append(sentiment)
-                comment_texts.append(comment_text[:50])
-        
-        if sentiments:
-            avg_sentiment = np.mean(sentiments)
-            print(f"Comments {video_id[:8]}: {len(sentiments)} comments, avg sentiment: {avg_sentiment:.3f}")
+        avg_sentiment, stats = sample_comment_sentiment(youtube, video_id, max_comments)
+        if avg_sentiment is not None:
+            print(f"Comments {video_id[:8]}: {stats['scored']}/{stats['fetched']} comments scored, avg sentiment: {avg_sentiment:.3f}")
             return avg_sentiment
         else:
             print(f"Comments {video_id[:8]}: No meaningful comments found")
@@ -76,7 +87,39 @@ def get_comment_sentiment(video_id, max_comments=20):
         print(f"WARNING: Comment analysis failed for {video_id[:8]}: {str(e)[:50]}")
         return 0.0  # Neutral default
 
-def create_features(df):
+FEATURE_COLUMNS = [
+    "view_count", "like_count", "comment_count",
+    "like_ratio", "comment_ratio", 
+    "title_len", "desc_len", 
+    "desc_sentiment", "comment_sentiment",  # Both sentiment types
+    "duration_sec", "age_days"
+]
+
+def quality_score(like_ratio, comment_ratio, comment_sentiment, desc_sentiment):
+    """Satisfaction score used as the training target (works on scalars and Series)"""
+    return (
+        0.3 * like_ratio +           # 30% - like engagement
+        0.2 * comment_ratio +       # 20% - comment engagement  
+        0.4 * comment_sentiment +   # 40% - comment sentiment (main ranking factor)
+        0.1 * desc_sentiment        # 10% - description sentiment
+    )
+
+def feature_row(video, comment_sentiment):
+    """Features for a single collected video dict - the row create_features would produce for it"""
+    row = {column: video[column] for column in ("view_count", "like_count", "comment_count")}
+    row["like_ratio"] = video["like_count"] / (video["view_count"] + 1)
+    row["comment_ratio"] = video["comment_count"] / (video["view_count"] + 1)
+    row["title_len"] = len(clean_text(video["title"]))
+    row["desc_len"] = len(clean_text(video["description"]))
+    row["desc_sentiment"] = get_sentiment(video["description"])
+    row["comment_sentiment"] = comment_sentiment
+    row["duration_sec"] = iso_to_seconds(video["duration"])
+    row["age_days"] = (datetime.now(timezone.utc) - datetime.fromisoformat(video["publishedAt"].replace("Z", "+00:00"))).days
+    row["target_score"] = quality_score(row["like_ratio"], row["comment_ratio"], comment_sentiment, row["desc_sentiment"])
+    row.update(video_id=video["video_id"], title=video["title"], duration=video["duration"])
+    return row
+
+def create_features(df, youtube=None):
     print(f"STEP 2: Feature Engineering with Comment Sentiment Analysis")
     print(f"=" * 55)
     print(f"Analyzing {len(df)} videos...")
@@ -86,27 +129,29 @@ def create_features(df):
     df["like_ratio"] = df["like_count"] / (df["view_count"] + 1)
     df["comment_ratio"] = df["comment_count"] / (df["view_count"] + 1)
     df["title_len"] = df["title"].apply(lambda x: len(clean_text(x)))
-    df["desc_len"] = df["description"].apply(lambda x: len(clean_text(x)))
-    df["desc_sentiment"] = df["description"].apply(get_sentiment)
-    df["duration_sec"] = df["duration"].apply(iso_to_seconds)
+    # Collection (video_buffer.py) already reduces descriptions and parses durations
+    if "desc_len" not in df.columns:
+        df["desc_len"] = df["description"].apply(lambda x: len(clean_text(x)))
+    if "desc_sentiment" not in df.columns:
+        df["desc_sentiment"] = df["description"].apply(get_sentiment)
+    if "duration_sec" not in df.columns:
+        df["duration_sec"] = df["duration"].apply(iso_to_seconds)
     
-    df["age_days"] = df["publishedAt"].apply(
-        lambda x: (datetime.now() - datetime.fromisoformat(x.replace("Z", ""))).days
-    )
+    df["age_days"] = (pd.Timestamp.now(tz="UTC") - pd.to_datetime(df["publishedAt"], utc=True)).dt.days
     
     # NEW: Comment sentiment analysis (the key ranking factor you wanted)
     print("Analyzing comment sentiment for ranking...")
-    df["comment_sentiment"] = df["video_id"].apply(
-        lambda video_id: get_comment_sentiment(video_id, max_comments=15)
-    )
+    # Build the API client once rather than once per video
+    youtube = youtube or build_youtube_client()
+    with metrics.span("comment_sentiment", rows=len(df)):
+        df["comment_sentiment"] = df["video_id"].apply(
+            lambda video_id: get_comment_sentiment(video_id, max_comments=15, youtube=youtube)
+        )
     
     # Enhanced satisfaction score with comment sentiment as major factor
     print("\nCalculating quality scores...")
-    df["target_score"] = (
-        0.3 * df["like_ratio"] +           # 30% - like engagement
-        0.2 * df["comment_ratio"] +       # 20% - comment engagement  
-        0.4 * df["comment_sentiment"] +   # 40% - comment sentiment (main ranking factor)
-        0.1 * df["desc_sentiment"]        # 10% - description sentiment
+    df["target_score"] = quality_score(
+        df["like_ratio"], df["comment_ratio"], df["comment_sentiment"], df["desc_sentiment"]
     )
     
     # Show duration distribution before filtering
@@ -117,15 +162,7 @@ def create_features(df):
     print(f"   - Average duration: {duration_minutes.mean():.1f} minutes")
     print(f"   - Longest video: {duration_minutes.max():.1f} minutes")
     
-    feature_cols = [
-        "view_count", "like_count", "comment_count",
-        "like_ratio", "comment_ratio", 
-        "title_len", "desc_len", 
-        "desc_sentiment", "comment_sentiment",  # Both sentiment types
-        "duration_sec", "age_days"
-    ]
-    
-    result_df = df[feature_cols + ["target_score", "video_id", "title", "duration"]]
+    result_df = df[FEATURE_COLUMNS + ["target_score", "video_id", "title", "duration"]]
     
     print(f"\nFeature engineering complete")
     print(f"Top video by ML score: '{result_df.loc[result_df['target_score'].idxmax(), 'title'][:60]}...'")
@@ -133,14 +170,18 @@ def create_features(df):
     return result_df
 
 if __name__ == "__main__":
+    configure_console()
     print("ML Pipeline Step 2: Feature Engineering")
     print("=" * 60)
     
     df = pd.read_csv("raw_videos.csv")
     print(f"Loaded {len(df)} videos from raw_videos.csv")
     
-    final_df = create_features(df)
+    with metrics.span("features", rows=len(df)):
+        final_df = create_features(df)
     final_df.to_csv("features.csv", index=False)
+    metrics.set("rows.features", len(final_df))
+    metrics.flush()
     
     print(f"\nSaved features for {len(final_df)} videos to features.csv")
     print(f"Next: Run train_and_rank.py for ML training and 2+ hour filtering")
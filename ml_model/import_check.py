@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+
+"""
+Import-time Regression Check
+Imports each ml_model module in a fresh interpreter (from an empty working
+directory) and fails if the import:
+    - loads a heavy dependency that should only load on first use (sklearn, googleapiclient, ...)
+    - prints anything, writes files, or touches model.pkl / the local databases
+    - takes longer than importing pandas + numpy alone, plus a margin
+
+Usage:
+    python import_check.py                 # exit code 1 on any regression
+    python import_check.py --margin-ms 150
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ML_DIR = os.path.dirname(os.path.abspath(__file__))
+
+MODULES = [
+    "bench_fixtures", "collect_data_for_ml", "collect_data_modified", "features",
+    "load_test", "mock_interview_cli", "pipeline_metrics", "question_model_stub", "resume_condenser",
+    "streaming_pipeline", "topic_cache", "train_and_rank", "video_buffer", "video_dedupe", "video_filters",
+    "video_index", "youtube_client",
+]
+
+# Loaded only inside the functions that need them
+LAZY_DEPENDENCIES = [
+    "sklearn", "joblib", "googleapiclient", "httplib2", "textblob", "nltk",
+    "spacy", "pdfplumber", "google.generativeai", "dotenv",
+]
+
+# The shared baseline every pipeline module is allowed to pay for
+BASELINE = "pandas, numpy"
+
+PROBE = """
+import contextlib, io, json, sys, time
+sys.path.insert(0, {ml_dir!r})
+out = io.StringIO()
+start = time.perf_counter()
+with contextlib.redirect_stdout(out):
+    import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"elapsed_ms": elapsed * 1000, "stdout": out.getvalue(),
+                  "loaded": [name for name in {lazy!r} if name in sys.modules]}}))
+"""
+
+
+def probe(module, runs):
+    """Best-of-`runs` import time for `module` in fresh interpreters, plus what the import did."""
+    best = None
+    for _ in range(runs):
+        with tempfile.TemporaryDirectory() as cwd:
+            result = subprocess.run(
+                [sys.executable, "-c", PROBE.format(ml_dir=ML_DIR, module=module, lazy=LAZY_DEPENDENCIES)],
+                cwd=cwd, capture_output=True, text=True,
+            )
+            if result.returncode != 0:
+                return {"error": result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "import failed"}
+            record = json.loads(result.stdout.strip().splitlines()[-1])
+            record["files_written"] = sorted(os.listdir(cwd))
+        if best is None or record["elapsed_ms"] < best["elapsed_ms"]:
+            best = record
+    return best
+
+
+def ml_dir_snapshot():
+    """Modification times of everything in ml_model, so an import that writes there is caught."""
+    return {name: os.stat(os.path.join(ML_DIR, name)).st_mtime_ns
+            for name in os.listdir(ML_DIR) if name != "__pycache__"}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=3, help="Fresh-interpreter imports per module (best is kept)")
+    parser.add_argument("--margin-ms", type=float, default=float(os.getenv("IMPORT_CHECK_MARGIN_MS", 250)),
+                        help="Allowed import time on top of the pandas + numpy baseline")
+    parser.add_argument("modules", nargs="*", default=MODULES)
+    args = parser.parse_args()
+
+    baseline = probe(BASELINE, args.runs)
+    budget_ms = baseline["elapsed_ms"] + args.margin_ms
+    print(f"Baseline (import {BASELINE}): {baseline['elapsed_ms']:.0f}ms, budget per module: {budget_ms:.0f}ms")
+
+    failures = 0
+    for module in args.modules:
+        before = ml_dir_snapshot()
+        record = probe(module, args.runs)
+        after = ml_dir_snapshot()
+
+        problems = []
+        if "error" in record:
+            problems.append(record["error"])
+        else:
+            if record["loaded"]:
+                problems.append(f"loads {', '.join(record['loaded'])}")
+            if record["stdout"]:
+                problems.append(f"prints {record['stdout'].strip()[:60]!r}")
+            if record["files_written"]:
+                problems.append(f"writes {', '.join(record['files_written'])}")
+            if record["elapsed_ms"] > budget_ms:
+                problems.append(f"{record['elapsed_ms']:.0f}ms > {budget_ms:.0f}ms")
+        changed = sorted(name for name in after if before.get(name) != after[name])
+        if changed:
+            problems.append(f"modifies {', '.join(changed)}")
+
+        failures += bool(problems)
+        elapsed = f"{record['elapsed_ms']:6.0f}ms" if "elapsed_ms" in record else "     --"
+        print(f"{'FAIL' if problems else 'ok  '} {module:<22} {elapsed}  {'; '.join(problems)}")
+
+    print(f"\n{len(args.modules) - failures}/{len(args.modules)} modules import cleanly")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
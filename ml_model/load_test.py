@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+
+"""
+Load Test Harness
+Drives the Python entry points the server spawns at increasing concurrency, with
+external services stubbed (YOUTUBE_API_MODE=fake, GEMINI_API_MODE=stub), and reports
+throughput, p50/p95/p99 latency, CPU and peak RSS per worker and the saturation point.
+
+Scenarios (what each simulated user request runs):
+    parse_resume        mock_interview_cli.py parse_resume --file <pdf>      (/api/parse-resume)
+    generate_questions  mock_interview_cli.py generate_questions ...         (/api/mock-interview/start)
+    ml_pipeline         collect_data_for_ml.py -> features.py -> train_and_rank.py  (mlService)
+
+Modes:
+    subprocess  one Python process per step, as server/mlService.runPythonScript does;
+                CPU and RSS are the spawned process's own (os.wait4, Unix only)
+    inprocess   the library equivalents on a pool of warm worker processes (a long-running
+                Python service); CPU and RSS are per pool worker (RSS needs `resource`)
+Where these are unavailable (Windows) the CPU / RSS columns are null.
+
+Every request runs in its own scratch directory, so concurrent pipelines don't overwrite
+each other's CSVs / model.pkl (the server currently shares ml_model/ between requests).
+
+Index state (ml_pipeline):
+    cold  every request gets an empty video index / dedupe store, so each topic is searched
+          live as on its first request (default)
+    warm  one index / dedupe store shared by all requests; with only len(TOPICS) topics,
+          most requests are then answered from the local index
+
+Usage:
+    python load_test.py --scenario ml_pipeline --concurrency 1,2,4,8,16,20
+    python load_test.py --scenario generate_questions --mode inprocess --requests-per-user 5
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from pipeline_metrics import peak_rss_mb
+
+ML_DIR = os.path.dirname(os.path.abspath(__file__))
+TOPICS = ["python", "react", "docker", "kubernetes", "machine learning", "sql", "rust", "golang"]
+# Throughput must grow by at least this much per concurrency step, otherwise the step before saturated
+SATURATION_GAIN = 0.10
+# Matches the server's runPythonScript timeout
+TIMEOUT_S = 300
+
+STUB_ENV = {
+    "YOUTUBE_API_MODE": "fake",
+    "YOUTUBE_FAKE_LATENCY": "80:0.5",
+    "GEMINI_API_MODE": "stub",
+    "PYTHONIOENCODING": "utf-8",
+}
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))] if ordered else None
+
+
+def _rss_mb(maxrss):
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    return maxrss / (1024 * 1024) if sys.platform == "darwin" else maxrss / 1024
+
+
+# --- Scenarios: the subprocess steps and the in-process equivalent of one request ---
+
+def scenario_steps(scenario, request_id, fixtures):
+    if scenario == "parse_resume":
+        return [["mock_interview_cli.py", "parse_resume", "--file", fixtures["pdf"]]]
+    if scenario == "generate_questions":
+        return [["mock_interview_cli.py", "generate_questions", "--text", fixtures["resume_text"][:5000],
+                 "--position", "Backend Engineer", "--count", "5"]]
+    if scenario == "ml_pipeline":
+        topic = TOPICS[request_id % len(TOPICS)]
+        return [["collect_data_for_ml.py", topic, "50"], ["features.py"], ["train_and_rank.py"]]
+    raise ValueError(f"Unknown scenario: {scenario}")
+
+
+def store_paths(workdir):
+    """Video index / dedupe store locations for one request's cold start."""
+    return {"VIDEO_INDEX_PATH": os.path.join(workdir, "video_index.sqlite"),
+            "VIDEO_DEDUPE_PATH": os.path.join(workdir, "video_dedupe.sqlite")}
+
+
+def run_inprocess(scenario, request_id, fixtures, workdir):
+    if scenario == "parse_resume":
+        import mock_interview_cli
+        mock_interview_cli.extract_resume_text(fixtures["pdf"])
+    elif scenario == "generate_questions":
+        import mock_interview_cli
+        result = json.loads(mock_interview_cli.generate_questions(fixtures["resume_text"][:5000], "Backend Engineer", "3"))
+        if "error" in result:
+            raise RuntimeError(result["error"])
+    elif scenario == "ml_pipeline":
+        import video_dedupe
+        import video_index
+        from collect_data_for_ml import fetch_videos_for_ml
+        from features import create_features
+        from train_and_rank import rank_new_videos, train_model
+
+        if fixtures["index_state"] == "cold":
+            paths = store_paths(workdir)
+            video_index.INDEX_PATH, video_dedupe.DEDUPE_PATH = paths["VIDEO_INDEX_PATH"], paths["VIDEO_DEDUPE_PATH"]
+        df = fetch_videos_for_ml(TOPICS[request_id % len(TOPICS)], 50)
+        features_df = create_features(df)
+        path = os.path.join(workdir, "features.csv")
+        features_df.to_csv(path, index=False)
+        rank_new_videos(path, model=train_model(features_df))
+    else:
+        raise ValueError(f"Unknown scenario: {scenario}")
+
+
+# --- Request execution ---
+
+def _run_step(argv, cwd, env):
+    """
+    Run one script to completion; returns (exit code, output, cpu seconds, peak RSS MB) of that
+    process. CPU and RSS are None where os.wait4 is unavailable.
+    """
+    proc = subprocess.Popen(argv, cwd=cwd, env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+    timer = threading.Timer(TIMEOUT_S, proc.kill)
+    timer.start()
+    try:
+        output = proc.stdout.read()
+        if hasattr(os, "wait4"):
+            # Reap with wait4 so the child's own CPU time and peak RSS are kept
+            _, status, usage = os.wait4(proc.pid, 0)
+            proc.returncode = os.waitstatus_to_exitcode(status)
+            cpu_s, rss_mb = usage.ru_utime + usage.ru_stime, _rss_mb(usage.ru_maxrss)
+        else:
+            proc.wait()
+            cpu_s = rss_mb = None
+    finally:
+        timer.cancel()
+        proc.stdout.close()
+    return proc.returncode, output.decode(errors="replace"), cpu_s, rss_mb
+
+
+def _total(values, combine):
+    """Combine per-step / per-request measurements, or None if any of them is unavailable."""
+    return None if not values or any(v is None for v in values) else combine(values)
+
+
+def subprocess_request(scenario, request_id, fixtures, env):
+    """Run one request as the server would: each step a fresh `python script.py` process."""
+    workdir = tempfile.mkdtemp(prefix="load_", dir=fixtures["scratch"])
+    if fixtures["index_state"] == "cold":
+        env = {**env, **store_paths(workdir)}
+    start = time.perf_counter()
+    cpu, rss, error = [], [], None
+    try:
+        for step in scenario_steps(scenario, request_id, fixtures):
+            code, output, step_cpu_s, step_rss_mb = _run_step(
+                [sys.executable, os.path.join(ML_DIR, step[0]), *step[1:]], workdir, env)
+            cpu.append(step_cpu_s)
+            rss.append(step_rss_mb)
+            if code != 0:
+                error = f"{step[0]}: exit {code}: {output.strip()[-120:]}"
+                break
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return {"latency_s": time.perf_counter() - start, "cpu_s": _total(cpu, sum), "rss_mb": _total(rss, max),
+            "worker": None, "error": error}
+
+
+def _init_worker(env):
+    os.environ.update(env)
+    sys.path.insert(0, ML_DIR)
+    sys.stdout = open(os.devnull, "w")
+    # Warm the imports a long-running service would already have loaded
+    import collect_data_for_ml, features, mock_interview_cli, train_and_rank  # noqa: F401
+
+
+def inprocess_request(scenario, request_id, fixtures):
+    workdir = tempfile.mkdtemp(prefix="load_", dir=fixtures["scratch"])
+    cpu_before = time.process_time()
+    start = time.perf_counter()
+    error = None
+    try:
+        run_inprocess(scenario, request_id, fixtures, workdir)
+    except Exception as e:
+        error = f"{type(e).__name__}: {str(e)[:120]}"
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return {
+        "latency_s": time.perf_counter() - start,
+        "cpu_s": time.process_time() - cpu_before,
+        "rss_mb": peak_rss_mb(),
+        "worker": os.getpid(),
+        "error": error,
+    }
+
+
+def run_level(args, concurrency, fixtures, env):
+    """Closed loop: `concurrency` users each sending `requests_per_user` requests back to back."""
+    total = concurrency * args.requests_per_user
+    start = time.perf_counter()
+    if args.mode == "subprocess":
+        with ThreadPoolExecutor(concurrency) as pool:
+            results = list(pool.map(lambda i: subprocess_request(args.scenario, i, fixtures, env), range(total)))
+    else:
+        with ProcessPoolExecutor(concurrency, initializer=_init_worker, initargs=(env,)) as pool:
+            # An untimed warmup round so first-call model/client setup isn't counted as latency
+            list(pool.map(inprocess_request, [args.scenario] * concurrency, range(concurrency), [fixtures] * concurrency))
+            start = time.perf_counter()
+            results = list(pool.map(inprocess_request, [args.scenario] * total, range(total), [fixtures] * total))
+    wall_s = time.perf_counter() - start
+
+    ok = [r for r in results if not r["error"]]
+    latencies = [r["latency_s"] for r in ok]
+    per_worker = {}
+    for r in results:
+        if r["worker"] is not None:
+            per_worker.setdefault(r["worker"], []).append(r)
+    cpu = [r["cpu_s"] for r in results]
+    rss = [r["rss_mb"] for r in results]
+    worker_rss = [_total([r["rss_mb"] for r in rows], max) for rows in per_worker.values()] if per_worker else rss
+    record = {
+        "scenario": args.scenario,
+        "mode": args.mode,
+        "index_state": args.index_state,
+        "concurrency": concurrency,
+        "requests": total,
+        "errors": total - len(ok),
+        "wall_s": round(wall_s, 3),
+        "throughput_rps": round(len(ok) / wall_s, 3) if wall_s else None,
+        "latency_p50_s": round(percentile(latencies, 0.5), 3) if latencies else None,
+        "latency_p95_s": round(percentile(latencies, 0.95), 3) if latencies else None,
+        "latency_p99_s": round(percentile(latencies, 0.99), 3) if latencies else None,
+        "cpu_s_per_request": _total(cpu, lambda values: round(statistics.mean(values), 3)),
+        # subprocess: peak RSS of the largest spawned process; inprocess: per long-lived pool worker
+        "rss_mb_per_worker_max": _total(rss, lambda values: round(max(values), 1)),
+        "rss_mb_per_worker_mean": _total(worker_rss, lambda values: round(statistics.mean(values), 1)),
+        "host_cpu_utilisation": _total(cpu, lambda values: round(sum(values) / (wall_s * os.cpu_count()), 3)) if wall_s else None,
+    }
+    if any(r["error"] for r in results):
+        record["first_error"] = next(r["error"] for r in results if r["error"])
+    return record
+
+
+def find_saturation(levels):
+    """The last concurrency level that still raised throughput by SATURATION_GAIN over the previous one."""
+    best = levels[0]
+    for previous, current in zip(levels, levels[1:]):
+        if not current["throughput_rps"] or current["throughput_rps"] < previous["throughput_rps"] * (1 + SATURATION_GAIN):
+            return previous, True
+        best = current
+    return best, False
+
+
+def make_fixtures(scratch):
+    import bench_fixtures
+
+    resume_text = bench_fixtures.make_long_resume_text(0)
+    pdf = os.path.join(scratch, "resume.pdf")
+    bench_fixtures.write_resume_pdf(pdf, bench_fixtures.make_resume_text(0))
+    return {"scratch": scratch, "pdf": pdf, "resume_text": resume_text}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scenario", choices=["parse_resume", "generate_questions", "ml_pipeline"], default="ml_pipeline")
+    parser.add_argument("--mode", choices=["subprocess", "inprocess"], default="subprocess")
+    parser.add_argument("--concurrency", default="1,2,4,8,16,20", help="Comma-separated concurrency levels")
+    parser.add_argument("--requests-per-user", type=int, default=3)
+    parser.add_argument("--index-state", choices=["cold", "warm"], default="cold",
+                        help="cold: a fresh video index / dedupe store per request; warm: one shared by all")
+    args = parser.parse_args()
+
+    levels = [int(level) for level in args.concurrency.split(",")]
+    with tempfile.TemporaryDirectory(prefix="load_test_") as scratch:
+        env = {
+            **os.environ,
+            **{key: os.environ.get(key, value) for key, value in STUB_ENV.items()},
+            # Shared by all requests with --index-state warm (cold requests use their own),
+            # and kept out of ml_model/ either way
+            "VIDEO_INDEX_PATH": os.path.join(scratch, "video_index.sqlite"),
+            "VIDEO_DEDUPE_PATH": os.path.join(scratch, "video_dedupe.sqlite"),
+            "PIPELINE_METRICS_FILE": "",
+        }
+        os.environ.update(env)
+        sys.path.insert(0, ML_DIR)
+        fixtures = make_fixtures(scratch)
+        fixtures["index_state"] = args.index_state
+
+        results = []
+        for concurrency in levels:
+            results.append(run_level(args, concurrency, fixtures, env))
+            print(json.dumps(results[-1]), flush=True)
+
+    saturation, saturated = find_saturation(results)
+    print(json.dumps({
+        "summary": True,
+        "scenario": args.scenario,
+        "mode": args.mode,
+        "index_state": args.index_state,
+        "cpu_count": os.cpu_count(),
+        "saturation_concurrency": saturation["concurrency"] if saturated else None,
+        "max_throughput_rps": max(r["throughput_rps"] or 0 for r in results),
+        "p95_at_saturation_s": saturation["latency_p95_s"] if saturated else None,
+        "note": None if saturated else f"no saturation up to concurrency {levels[-1]}; test higher levels",
+    }))
+
+
+if __name__ == "__main__":
+    main()
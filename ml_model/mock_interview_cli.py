@@ -3,13 +3,10 @@ import os
 import json
 import re
 import argparse
-import pdfplumber
-import spacy
-import google.generativeai as genai
-from dotenv import load_dotenv
-
-# Load environment variables
-load_dotenv()
+import time
+from functools import partial
+from multiprocessing import Pool, cpu_count
+from resume_condenser import RESUME_TOKEN_BUDGET, condense_resume
 
 # Predefined Skill Keywords (Same as Notebook)
 SKILL_KEYWORDS = {
@@ -20,19 +17,50 @@ SKILL_KEYWORDS = {
     "html", "css", "sass", "rest api", "graphql", "ci/cd", "agile", "scrum", "linux"
 }
 
-def load_spacy_model():
+# Only the NER component is needed for skill extraction; everything else is excluded at load time
+SPACY_MODEL = "en_core_web_sm"
+SPACY_EXCLUDE = ["tagger", "parser", "attribute_ruler", "lemmatizer", "senter"]
+NER_LABELS = {"ORG", "PRODUCT", "WORK_OF_ART"}
+
+# nlp.pipe tuning (overridable from the environment)
+NLP_BATCH_SIZE = int(os.environ.get("NLP_BATCH_SIZE", 16))
+NLP_N_PROCESS = int(os.environ.get("NLP_N_PROCESS", 1))
+NLP_MAX_DOC_CHARS = int(os.environ.get("NLP_MAX_DOC_CHARS", 20000))
+
+def load_spacy_model(trimmed=True):
+    import spacy
+
     try:
-        return spacy.load("en_core_web_sm")
+        if not trimmed:
+            return spacy.load(SPACY_MODEL)
+        model = spacy.load(SPACY_MODEL, exclude=SPACY_EXCLUDE)
+        # en_core_web_sm's NER has its own embedding layer; drop the shared tok2vec if nothing listens to it
+        if "tok2vec" in model.pipe_names and not model.get_pipe("tok2vec").listening_components:
+            model.remove_pipe("tok2vec")
+        model.max_length = max(model.max_length, NLP_MAX_DOC_CHARS)
+        return model
     except OSError:
         # Silently try to download if missing, or warn
         print("Warning: 'en_core_web_sm' not found. NLP extraction reduced.", file=sys.stderr)
         return None
 
-nlp = load_spacy_model()
+_nlp = None
+_nlp_loaded = False
 
-def extract_resume_text(file_path):
+def get_nlp():
+    """Load the spaCy model on first use and reuse it for the life of the process."""
+    global _nlp, _nlp_loaded
+    if not _nlp_loaded:
+        _nlp = load_spacy_model()
+        _nlp_loaded = True
+    return _nlp
+
+def parse_resume_file(file_path):
+    """Extract and normalize the text of a resume PDF, returning a result dict."""
     if not os.path.exists(file_path):
-        return json.dumps({"error": f"File not found: {file_path}"})
+        return {"error": f"File not found: {file_path}"}
+
+    import pdfplumber
 
     text = ""
     try:
@@ -42,50 +70,84 @@ def extract_resume_text(file_path):
                 if extracted:
                     text += extracted + "\n"
     except Exception as e:
-        return json.dumps({"error": f"Error parsing PDF: {str(e)}"})
+        return {"error": f"Error parsing PDF: {str(e)}"}
     
     clean_text = re.sub(r'\s+', ' ', text).strip()
-    return json.dumps({"success": True, "text": clean_text, "length": len(clean_text)})
+    return {"success": True, "text": clean_text, "length": len(clean_text)}
 
-def extract_skills(text):
+def extract_resume_text(file_path):
+    return json.dumps(parse_resume_file(file_path))
+
+def match_skill_keywords(text):
     text_lower = text.lower()
     found_skills = set()
 
-    # 1. Keyword Matching
     for skill in SKILL_KEYWORDS:
         if re.search(r'\b' + re.escape(skill) + r'\b', text_lower):
             found_skills.add(skill)
 
+    return found_skills
+
+def extract_skills_batch(texts, batch_size=None, n_process=None, max_doc_chars=None):
+    """
+    Extract skills for many texts at once, streaming them through nlp.pipe.
+    Texts longer than max_doc_chars are truncated before NER.
+    """
+    batch_size = batch_size or NLP_BATCH_SIZE
+    n_process = n_process or NLP_N_PROCESS
+    max_doc_chars = max_doc_chars or NLP_MAX_DOC_CHARS
+
+    # 1. Keyword Matching
+    results = [match_skill_keywords(text) for text in texts]
+
     # 2. NLP Extraction
+    nlp = get_nlp()
     if nlp:
-        doc = nlp(text)
-        for ent in doc.ents:
-             if ent.label_ in {"ORG", "PRODUCT", "WORK_OF_ART"}:
-                candidate = ent.text.lower().strip()
-                if candidate in SKILL_KEYWORDS:
-                     found_skills.add(candidate)
+        docs = nlp.pipe((text[:max_doc_chars] for text in texts), batch_size=batch_size, n_process=n_process)
+        for found_skills, doc in zip(results, docs):
+            for ent in doc.ents:
+                if ent.label_ in NER_LABELS:
+                    candidate = ent.text.lower().strip()
+                    if candidate in SKILL_KEYWORDS:
+                        found_skills.add(candidate)
 
-    return list(found_skills)
+    return [list(found_skills) for found_skills in results]
 
-def generate_questions(resume_text, position, yoe, total_questions=5):
-    api_key = os.environ.get("GEMINI_API_KEY")
-    if not api_key:
-        return json.dumps({"error": "GEMINI_API_KEY not set"})
+def extract_skills(text):
+    return extract_skills_batch([text], n_process=1)[0]
 
-    skills = extract_skills(resume_text)
-    
+def truncate_resume(resume_text, max_chars=2000):
+    """The original prompt context: the first max_chars characters of the resume"""
+    return f"{resume_text[:max_chars]}... (truncated)" if len(resume_text) > max_chars else resume_text
+
+def resume_context(resume_text, skills, token_budget=None):
+    """
+    Resume context for the question prompt: the most skill-relevant sentences packed
+    under RESUME_TOKEN_BUDGET tokens (see resume_condenser.py), or plain truncation
+    when the budget is 0.
+    """
+    token_budget = RESUME_TOKEN_BUDGET if token_budget is None else token_budget
+    if token_budget > 0:
+        condensed, _ = condense_resume(resume_text, skills, token_budget)
+        if condensed:
+            return condensed
+    return truncate_resume(resume_text)
+
+def build_question_prompt(resume_context, position, yoe, skills, total_questions):
     technical_count = max(1, int(total_questions * 0.6))
     project_count = max(1, int(total_questions * 0.25))
     behavioral_count = total_questions - technical_count - project_count
+    highlights = "\n".join(f"      {line}" for line in resume_context.splitlines())
     
-    prompt = f"""
+    return f"""
     You are a Senior Technical Interviewer. Generate a mock interview.
     
     **Candidate:**
     - Position: {position}
     - Experience: {yoe} Years
     - Detected Skills: {', '.join(skills)}
-    - Full Resume Context: {resume_text[:2000]}... (truncated)
+    - Resume Highlights:
+{highlights}
 
     **Task:**
     Generate exactly {total_questions} questions:
@@ -104,32 +166,288 @@ def generate_questions(resume_text, position, yoe, total_questions=5):
     Do not use markdown blocks. Return ONLY JSON.
     """
 
+def load_question_model():
+    # GEMINI_API_MODE=stub: local model charging latency per token (load tests, offline runs)
+    if os.environ.get("GEMINI_API_MODE", "live").lower() == "stub":
+        from question_model_stub import StubQuestionModel
+        return StubQuestionModel.from_env()
+    api_key = os.environ.get("GEMINI_API_KEY")
+    if not api_key:
+        return None
+    import google.generativeai as genai
     genai.configure(api_key=api_key)
-    model = genai.GenerativeModel('gemini-pro')
+    return genai.GenerativeModel('gemini-pro')
+
+def parse_questions_response(text):
+    text = text.strip()
     
+    if text.startswith("```json"):
+        text = text[7:]
+    if text.endswith("```"):
+        text = text[:-3]
+        
+    return json.loads(text).get("questions", [])
+
+def generate_questions(resume_text, position, yoe, total_questions=5, model=None):
+    model = model or load_question_model()
+    if model is None:
+        return json.dumps({"error": "GEMINI_API_KEY not set"})
+
+    skills = extract_skills(resume_text)
+    prompt = build_question_prompt(resume_context(resume_text, skills), position, yoe, skills, total_questions)
+    return json.dumps(generate_from_prompt(model, prompt, skills))
+
+def generate_from_prompt(model, prompt, skills):
+    """Single-shot generation for an already built prompt; returns a result dict."""
     try:
         response = model.generate_content(prompt)
-        text = response.text.strip()
-        
-        if text.startswith("```json"):
-            text = text[7:]
-        if text.endswith("```"):
-            text = text[:-3]
-            
-        data = json.loads(text)
-        return json.dumps({"success": True, "skills": skills, "questions": data.get("questions", [])})
+        questions = parse_questions_response(response.text)
+        return {"success": True, "skills": skills, "questions": questions}
         
     except Exception as e:
-        return json.dumps({"error": str(e)})
+        return {"error": str(e)}
+
+class QuestionStreamParser:
+    """
+    Incrementally pulls completed string items out of the "questions" array
+    of a JSON reply as its chunks arrive, tolerating a leading code fence.
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self.pos = 0
+        self.in_array = False
+        self.done = False
+
+    def feed(self, chunk):
+        self.buffer += chunk
+        questions = []
+
+        if not self.in_array:
+            key = self.buffer.find('"questions"')
+            if key == -1:
+                return questions
+            start = self.buffer.find('[', key)
+            if start == -1:
+                return questions
+            self.in_array = True
+            self.pos = start + 1
+
+        while not self.done:
+            # Skip separators up to the next item or the end of the array
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in ' \t\r\n,':
+                self.pos += 1
+            if self.pos >= len(self.buffer):
+                break
+            if self.buffer[self.pos] == ']':
+                self.done = True
+                break
+            if self.buffer[self.pos] != '"':
+                raise ValueError(f"Unexpected character in questions array: {self.buffer[self.pos]!r}")
+
+            end = self._string_end(self.pos)
+            if end == -1:
+                break  # string literal still incomplete
+            questions.append(json.loads(self.buffer[self.pos:end + 1]))
+            self.pos = end + 1
+
+        return questions
+
+    def _string_end(self, start):
+        i = start + 1
+        while i < len(self.buffer):
+            char = self.buffer[i]
+            if char == '\\':
+                i += 2
+                continue
+            if char == '"':
+                return i
+            i += 1
+        return -1
+
+def generate_questions_stream(resume_text, position, yoe, total_questions=5, model=None, out=None):
+    """
+    Stream questions as JSON lines as soon as each one is complete, followed by a final
+    summary line. Falls back to parsing the full reply if incremental parsing fails, and
+    to single-shot generation if the model cannot stream.
+    """
+    out = out or sys.stdout
+
+    def emit(record):
+        out.write(json.dumps(record) + "\n")
+        out.flush()
+
+    model = model or load_question_model()
+    if model is None:
+        emit({"error": "GEMINI_API_KEY not set"})
+        return
+
+    start = time.perf_counter()
+    skills = extract_skills(resume_text)
+    prompt = build_question_prompt(resume_context(resume_text, skills), position, yoe, skills, total_questions)
+
+    parser = QuestionStreamParser()
+    questions = []
+    full_text = ""
+    incremental = True
+
+    try:
+        response = model.generate_content(prompt, stream=True)
+        for chunk in response:
+            text = chunk.text or ""
+            full_text += text
+            if not incremental:
+                continue
+            try:
+                new_questions = parser.feed(text)
+            except ValueError:
+                incremental = False
+                continue
+            for question in new_questions:
+                questions.append(question)
+                emit({"index": len(questions) - 1, "question": question,
+                      "elapsed_ms": round((time.perf_counter() - start) * 1000, 2)})
+    except Exception as e:
+        if not full_text:
+            # Streaming not available - fall back to the single-shot request, reusing the prompt
+            result = generate_from_prompt(model, prompt, skills)
+            if "error" in result:
+                emit(result)
+                return
+            questions = []
+            for question in result["questions"]:
+                questions.append(question)
+                emit({"index": len(questions) - 1, "question": question,
+                      "elapsed_ms": round((time.perf_counter() - start) * 1000, 2)})
+            emit({"success": True, "done": True, "streamed": False, "skills": skills, "questions": questions})
+            return
+        print(f"Warning: stream interrupted: {str(e)}", file=sys.stderr)
+
+    if not parser.done:
+        # Reply was not in the expected shape while streaming; parse whatever arrived in one go
+        try:
+            remaining = parse_questions_response(full_text)[len(questions):]
+        except Exception as e:
+            if not questions:
+                emit({"error": str(e)})
+                return
+            remaining = []
+        for question in remaining:
+            questions.append(question)
+            emit({"index": len(questions) - 1, "question": question,
+                  "elapsed_ms": round((time.perf_counter() - start) * 1000, 2)})
+
+    emit({"success": True, "done": True, "streamed": True, "skills": skills, "questions": questions})
+
+def collect_batch_files(directory=None, manifest=None):
+    """Resolve the PDFs for a batch run from a directory and/or a manifest file (one path per line)."""
+    files = []
+    if directory:
+        for root, _, names in os.walk(directory):
+            for name in sorted(names):
+                if name.lower().endswith('.pdf'):
+                    files.append(os.path.join(root, name))
+    if manifest:
+        base_dir = os.path.dirname(os.path.abspath(manifest))
+        with open(manifest, encoding='utf-8') as f:
+            for line in f:
+                path = line.strip()
+                if not path or path.startswith('#'):
+                    continue
+                files.append(path if os.path.isabs(path) else os.path.join(base_dir, path))
+    return files
+
+def _init_batch_worker():
+    # Load spaCy once per worker instead of once per resume
+    get_nlp()
+
+def process_resume_for_batch(file_path, include_text=False):
+    """
+    Parse one resume and extract its skills, returning a JSON-serializable record with timing.
+    The extracted text is only attached when `include_text` is set, so it isn't sent back
+    to the parent process for nothing.
+    """
+    start = time.perf_counter()
+    result = parse_resume_file(file_path)
+    parse_ms = (time.perf_counter() - start) * 1000
+
+    record = {"file": file_path, "pid": os.getpid(), "parse_ms": round(parse_ms, 2)}
+    if "error" in result:
+        record["success"] = False
+        record["error"] = result["error"]
+    else:
+        try:
+            skills_start = time.perf_counter()
+            record["skills"] = extract_skills(result["text"])
+            record["skills_ms"] = round((time.perf_counter() - skills_start) * 1000, 2)
+            record["success"] = True
+            record["length"] = result["length"]
+            if include_text:
+                record["text"] = result["text"]
+        except Exception as e:
+            record["success"] = False
+            record["error"] = f"Error extracting skills: {str(e)}"
+
+    record["total_ms"] = round((time.perf_counter() - start) * 1000, 2)
+    return record
+
+def run_batch(files, workers=None, include_text=False, out=None):
+    """
+    Process resumes across a process pool, streaming one JSON line per file as it completes,
+    followed by a final summary line with throughput stats.
+    """
+    out = out or sys.stdout
+    workers = workers or cpu_count()
+    workers = max(1, min(workers, len(files) or 1))
+
+    start = time.perf_counter()
+    succeeded = 0
+    failed = 0
+    total_file_ms = 0.0
+
+    with Pool(processes=workers, initializer=_init_batch_worker) as pool:
+        worker = partial(process_resume_for_batch, include_text=include_text)
+        for record in pool.imap_unordered(worker, files, chunksize=1):
+            if record["success"]:
+                succeeded += 1
+            else:
+                failed += 1
+            total_file_ms += record["total_ms"]
+            out.write(json.dumps(record) + "\n")
+            out.flush()
+
+    elapsed = time.perf_counter() - start
+    summary = {
+        "summary": True,
+        "files": len(files),
+        "succeeded": succeeded,
+        "failed": failed,
+        "workers": workers,
+        "elapsed_s": round(elapsed, 3),
+        "files_per_sec": round(len(files) / elapsed, 2) if elapsed > 0 else None,
+        "avg_file_ms": round(total_file_ms / len(files), 2) if files else None,
+    }
+    out.write(json.dumps(summary) + "\n")
+    out.flush()
+    return summary
 
 def main():
+    # Load environment variables (GEMINI_API_KEY) for CLI runs
+    from dotenv import load_dotenv
+    load_dotenv()
+
     parser = argparse.ArgumentParser()
-    parser.add_argument('mode', choices=['parse_resume', 'generate_questions'])
+    parser.add_argument('mode', choices=['parse_resume', 'generate_questions', 'batch_parse'])
     parser.add_argument('--file', help='Path to resume PDF')
     parser.add_argument('--text', help='Resume text content')
     parser.add_argument('--position', help='Job position')
     parser.add_argument('--yoe', type=str, default='3', help='Years of experience')
     parser.add_argument('--count', type=int, default=5, help='Number of questions')
+    parser.add_argument('--stream', action='store_true', help='Emit each question as a JSON line as soon as it is generated')
+    parser.add_argument('--dir', help='Directory of resume PDFs (batch_parse)')
+    parser.add_argument('--manifest', help='File listing one resume PDF path per line (batch_parse)')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count)')
+    parser.add_argument('--include-text', action='store_true', help='Include extracted text in batch records')
     
     args = parser.parse_args()
     
@@ -142,8 +460,16 @@ def main():
     elif args.mode == 'generate_questions':
         if not args.text or not args.position:
             print(json.dumps({"error": "Missing --text or --position argument"}))
+        elif args.stream:
+            generate_questions_stream(args.text, args.position, args.yoe, args.count)
         else:
             print(generate_questions(args.text, args.position, args.yoe, args.count))
 
+    elif args.mode == 'batch_parse':
+        if not args.dir and not args.manifest:
+            print(json.dumps({"error": "Missing --dir or --manifest argument"}))
+        else:
+            run_batch(collect_batch_files(args.dir, args.manifest), args.workers, args.include_text)
+
 if __name__ == "__main__":
     main()
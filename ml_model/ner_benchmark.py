@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+
+"""
+NER Benchmark Utility
+Compare the full en_core_web_sm pipeline against the trimmed NER-only pipeline
+used by mock_interview_cli.extract_skills on a corpus of resume PDFs.
+
+Each variant runs in its own process so peak memory is measured in isolation.
+
+Usage:
+    python ner_benchmark.py [--dir resumes/] [--repeat 5] [--batch-size 16]
+"""
+
+import argparse
+import glob
+import json
+import os
+import subprocess
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from pipeline_metrics import peak_rss_mb
+
+# Emitted for every variant, as null when they could not be measured
+RESULT_FIELDS = ["components", "documents", "avg_chars", "load_s", "pipe_ms_per_doc",
+                 "single_ms_per_doc", "model_rss_mb", "peak_rss_mb"]
+
+
+def load_corpus(directory):
+    from mock_interview_cli import parse_resume_file
+
+    texts = []
+    for path in sorted(glob.glob(os.path.join(directory, "*.pdf"))):
+        result = parse_resume_file(path)
+        if result.get("success") and result["text"]:
+            texts.append(result["text"])
+    return texts
+
+
+def run_variant(variant, directory, repeat, batch_size):
+    """Measure load time, per-document NER latency and peak RSS for one pipeline variant."""
+    import mock_interview_cli as cli
+
+    record = {"variant": variant, **dict.fromkeys(RESULT_FIELDS)}
+    texts = load_corpus(directory)
+    if not texts:
+        return {**record, "error": f"No readable PDFs in {directory}"}
+
+    rss_before = peak_rss_mb()
+    start = time.perf_counter()
+    nlp = cli.load_spacy_model(trimmed=(variant == "trimmed"))
+    load_s = time.perf_counter() - start
+    if nlp is None:
+        return {**record, "error": f"{cli.SPACY_MODEL} is not installed"}
+
+    docs = [text[:cli.NLP_MAX_DOC_CHARS] for text in texts] * repeat
+    start = time.perf_counter()
+    for _ in nlp.pipe(docs, batch_size=batch_size):
+        pass
+    pipe_s = time.perf_counter() - start
+
+    # One-at-a-time calls, which is how extract_skills used to run
+    start = time.perf_counter()
+    for text in docs:
+        nlp(text)
+    single_s = time.perf_counter() - start
+
+    rss_after = peak_rss_mb()
+    return {
+        **record,
+        "components": nlp.pipe_names,
+        "documents": len(docs),
+        "avg_chars": round(sum(len(t) for t in docs) / len(docs)),
+        "load_s": round(load_s, 3),
+        "pipe_ms_per_doc": round(pipe_s / len(docs) * 1000, 2),
+        "single_ms_per_doc": round(single_s / len(docs) * 1000, 2),
+        # None where resource.getrusage is unavailable (Windows)
+        "model_rss_mb": round(rss_after - rss_before, 1) if rss_after is not None else None,
+        "peak_rss_mb": rss_after,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--dir', default=os.path.dirname(os.path.abspath(__file__)), help='Directory of resume PDFs')
+    parser.add_argument('--repeat', type=int, default=5, help='Times to repeat the corpus')
+    parser.add_argument('--batch-size', type=int, default=16, help='nlp.pipe batch size')
+    parser.add_argument('--variant', choices=['full', 'trimmed'], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.variant:
+        print(json.dumps(run_variant(args.variant, args.dir, args.repeat, args.batch_size)))
+        return
+
+    results = []
+    for variant in ("full", "trimmed"):
+        output = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--variant', variant, '--dir', args.dir,
+             '--repeat', str(args.repeat), '--batch-size', str(args.batch_size)],
+            capture_output=True, text=True, check=True
+        ).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+
+    for result in results:
+        print(json.dumps(result))
+
+    def ratio(a, b):
+        return round(a / b, 2) if a is not None and b else None
+
+    full, trimmed = results
+    # Batching and component trimming are reported separately, each under a single call mode
+    print(json.dumps({
+        "summary": True,
+        "full_single_ms_per_doc": full["single_ms_per_doc"],
+        "full_pipe_ms_per_doc": full["pipe_ms_per_doc"],
+        "trimmed_single_ms_per_doc": trimmed["single_ms_per_doc"],
+        "trimmed_pipe_ms_per_doc": trimmed["pipe_ms_per_doc"],
+        "batching_speedup_full": ratio(full["single_ms_per_doc"], full["pipe_ms_per_doc"]),
+        "batching_speedup_trimmed": ratio(trimmed["single_ms_per_doc"], trimmed["pipe_ms_per_doc"]),
+        "trimming_speedup_single": ratio(full["single_ms_per_doc"], trimmed["single_ms_per_doc"]),
+        "trimming_speedup_pipe": ratio(full["pipe_ms_per_doc"], trimmed["pipe_ms_per_doc"]),
+        "full_peak_rss_mb": full["peak_rss_mb"],
+        "trimmed_peak_rss_mb": trimmed["peak_rss_mb"],
+        "memory_saved_mb": round(full["peak_rss_mb"] - trimmed["peak_rss_mb"], 1)
+        if full["peak_rss_mb"] is not None and trimmed["peak_rss_mb"] is not None else None,
+        "errors": [r["error"] for r in results if "error" in r],
+    }))
+
+
+if __name__ == "__main__":
+    main()
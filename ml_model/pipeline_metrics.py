@@ -0,0 +1,130 @@
+"""
+Lightweight stage instrumentation for the ranking pipeline.
+
+Scripts record spans and counters on the module-level `metrics` object:
+
+    from pipeline_metrics import metrics
+
+    with metrics.span("features", rows=len(df)):
+        ...
+        metrics.incr("api_calls.commentThreads")
+    metrics.flush()
+
+When PIPELINE_METRICS_FILE is set (pipeline_runner.py does this for its child
+scripts), flush() appends the process's record to that file as one JSON line,
+so the runner can merge every stage into a single metrics record.
+"""
+
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+METRICS_FILE_ENV = "PIPELINE_METRICS_FILE"
+
+
+def peak_rss_mb(children=False):
+    """Peak resident set size of this process (or its finished children) in MiB, if available."""
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF)
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    divisor = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    return round(usage.ru_maxrss / divisor, 1)
+
+
+class Metrics:
+    def __init__(self, process=None):
+        self.process = process or os.path.basename(sys.argv[0]) or "python"
+        self.spans = []
+        self.counters = {}
+        self._stack = []
+
+    @contextmanager
+    def span(self, name, **attrs):
+        """Time a block; nested spans are recorded with a dotted parent path."""
+        self._stack.append(name)
+        record = {"name": ".".join(self._stack), **attrs}
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record["duration_s"] = round(time.perf_counter() - start, 4)
+            record["peak_rss_mb"] = peak_rss_mb()
+            self.spans.append(record)
+            self._stack.pop()
+
+    def incr(self, name, amount=1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def set(self, name, value):
+        self.counters[name] = value
+
+    def record(self):
+        return {
+            "process": self.process,
+            "pid": os.getpid(),
+            "spans": self.spans,
+            "counters": self.counters,
+            "peak_rss_mb": peak_rss_mb(),
+        }
+
+    def flush(self, path=None):
+        """Append this process's record to the metrics file, if one is configured."""
+        path = path or os.environ.get(METRICS_FILE_ENV)
+        if not path:
+            return
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(self.record()) + "\n")
+
+
+metrics = Metrics()
+
+
+def load_records(path):
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def merge_records(records, **extra):
+    """Combine per-process records into one: spans concatenated, counters summed, memory maxed."""
+    merged = {**extra, "spans": [], "counters": {}, "peak_rss_mb": None}
+    for record in records:
+        merged["spans"].extend({"process": record["process"], **span} for span in record["spans"])
+        for name, value in record["counters"].items():
+            merged["counters"][name] = merged["counters"].get(name, 0) + value
+        if record.get("peak_rss_mb") is not None:
+            merged["peak_rss_mb"] = max(merged["peak_rss_mb"] or 0, record["peak_rss_mb"])
+    return merged
+
+
+def _metric_name(name):
+    return "".join(c if c.isalnum() else "_" for c in name)
+
+
+def to_prometheus(record, prefix="ml_pipeline"):
+    """Render a merged record in the Prometheus text exposition format (for node_exporter's textfile collector)."""
+    lines = [
+        f"# HELP {prefix}_span_duration_seconds Wall time of each pipeline stage.",
+        f"# TYPE {prefix}_span_duration_seconds gauge",
+    ]
+    for span in record["spans"]:
+        lines.append(f'{prefix}_span_duration_seconds{{span="{span["name"]}",process="{span["process"]}"}} {span["duration_s"]}')
+
+    for name, value in sorted(record["counters"].items()):
+        metric = f"{prefix}_{_metric_name(name)}"
+        lines.append(f"# TYPE {metric} gauge")
+        lines.append(f"{metric} {value}")
+
+    if record.get("peak_rss_mb") is not None:
+        lines.append(f"# TYPE {prefix}_peak_rss_megabytes gauge")
+        lines.append(f"{prefix}_peak_rss_megabytes {record['peak_rss_mb']}")
+    return "\n".join(lines) + "\n"
@@ -2,34 +2,58 @@
 import subprocess
 import sys
 import os
+import json
+import argparse
+import tempfile
 import pandas as pd
 
 import time
+from pipeline_metrics import METRICS_FILE_ENV, Metrics, load_records, merge_records, peak_rss_mb, to_prometheus
+
+QUIET = False
+
+def log(message):
+    if not QUIET:
+        print(message, flush=True)
+
+def run_stage(metrics, name, args, env):
+    # Child stage output is human-readable chatter only; drop it in quiet mode
+    with metrics.span(name):
+        subprocess.run(
+            [sys.executable, *args], check=True, env=env,
+            stdout=subprocess.DEVNULL if QUIET else None
+        )
+
+def run_ml_pipeline(topic, max_videos=10, metrics_out=None, prometheus_out=None):
+    metrics = Metrics(process="pipeline_runner.py")
+    fd, metrics_file = tempfile.mkstemp(prefix="pipeline_metrics_", suffix=".jsonl")
+    os.close(fd)
+    env = {**os.environ, METRICS_FILE_ENV: metrics_file}
+    ok = False
 
-def run_ml_pipeline(topic, max_videos=10):
     try:
         start_total = time.time()
-        
+
         # Step 1: Collect data
-        print(f"Collecting data for: {topic}", flush=True)
+        log(f"Collecting data for: {topic}")
         start_t = time.time()
-        subprocess.run([sys.executable, "collect_data_modified.py", topic, str(max_videos)], check=True)
-        print(f"Step 1 Complete: {time.time() - start_t:.2f}s", flush=True)
-        
+        run_stage(metrics, "stage.collect", ["collect_data_modified.py", topic, str(max_videos)], env)
+        log(f"Step 1 Complete: {time.time() - start_t:.2f}s")
+
         # Step 2: Create features
-        print("Creating features...", flush=True)
+        log("Creating features...")
         start_t = time.time()
-        subprocess.run([sys.executable, "features.py"], check=True)
-        print(f"Step 2 Complete: {time.time() - start_t:.2f}s", flush=True)
-        
+        run_stage(metrics, "stage.features", ["features.py"], env)
+        log(f"Step 2 Complete: {time.time() - start_t:.2f}s")
+
         # Step 3: Train and rank
-        print("Training and ranking...", flush=True)
+        log("Training and ranking...")
         start_t = time.time()
-        subprocess.run([sys.executable, "train_and_rank.py"], check=True)
-        print(f"Step 3 Complete: {time.time() - start_t:.2f}s", flush=True)
-        
-        print(f"Total Pipeline Time: {time.time() - start_total:.2f}s", flush=True)
-        
+        run_stage(metrics, "stage.train_and_rank", ["train_and_rank.py"], env)
+        log(f"Step 3 Complete: {time.time() - start_t:.2f}s")
+
+        log(f"Total Pipeline Time: {time.time() - start_total:.2f}s")
+
         # Read the results
         if os.path.exists("features.csv"):
             df = pd.read_csv("features.csv")
@@ -46,18 +70,52 @@ def run_ml_pipeline(topic, max_videos=10):
                          print(f"   - Duration: {duration:.1f} minutes", flush=True)
                     else:
                          print(f"   - Duration: {row.get('duration', '0')} minutes", flush=True)
-                         
+
                     print(f"   - ML Score: {row.get('target_score', 0):.3f}", flush=True)
-                return True
-        
-        print("No results generated", flush=True)
-        return False
-        
+                ok = True
+
+        if not ok:
+            print("No results generated", flush=True)
+
     except Exception as e:
         print(f"Pipeline failed: {str(e)}", flush=True)
-        return False
+
+    finally:
+        metrics.set("pipeline.success", int(ok))
+        record = merge_records(
+            [metrics.record(), *load_records(metrics_file)],
+            topic=topic, max_videos=max_videos
+        )
+        record["peak_rss_mb_children"] = peak_rss_mb(children=True)
+        os.remove(metrics_file)
+        emit_metrics(record, metrics_out, prometheus_out)
+
+    return ok
+
+def emit_metrics(record, metrics_out=None, prometheus_out=None):
+    """Write the merged metrics record as one JSON line (stdout or file) and optionally as Prometheus text."""
+    line = json.dumps({"metrics": record})
+    if metrics_out:
+        with open(metrics_out, "w", encoding="utf-8") as f:
+            f.write(line + "\n")
+    else:
+        print(line, flush=True)
+
+    if prometheus_out:
+        # Write-then-rename so a scraping textfile collector never reads a partial file
+        tmp_path = prometheus_out + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(to_prometheus(record))
+        os.replace(tmp_path, prometheus_out)
 
 if __name__ == "__main__":
-    topic = sys.argv[1] if len(sys.argv) > 1 else "programming"
-    max_videos = int(sys.argv[2]) if len(sys.argv) > 2 else 10
-    run_ml_pipeline(topic, max_videos)
+    parser = argparse.ArgumentParser()
+    parser.add_argument('topic', nargs='?', default='programming')
+    parser.add_argument('max_videos', nargs='?', type=int, default=10)
+    parser.add_argument('--quiet', action='store_true', help='Only print results and the metrics record')
+    parser.add_argument('--metrics-out', help='Write the JSON metrics record to this file instead of stdout')
+    parser.add_argument('--prometheus-out', help='Also write metrics in Prometheus text format to this file')
+    args = parser.parse_args()
+
+    QUIET = args.quiet
+    run_ml_pipeline(args.topic, args.max_videos, args.metrics_out, args.prometheus_out)
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+
+"""
+Offline stand-in for the Gemini question model.
+
+GEMINI_API_MODE=stub swaps the Gemini model used by mock_interview_cli for
+StubQuestionModel, which charges latency per token:
+
+    GEMINI_STUB_PROMPT_MS_PER_TOKEN  prompt processing per prompt token (default 0.4)
+    GEMINI_STUB_OUTPUT_MS_PER_TOKEN  generation per output token (default 2.0)
+
+resume_condenser.py bench builds one directly with explicit per-token costs.
+"""
+
+import json
+import os
+import re
+import time
+
+
+class _StubResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class StubQuestionModel:
+    """
+    Local stand-in for the Gemini GenerativeModel used by mock_interview_cli.
+    Replies with as many questions as the prompt asks for ("Generate exactly N questions").
+    Latency is charged per token: a fixed overhead, prompt processing per prompt token
+    (~4 characters) and generation per output token. Streaming yields the reply in chunks.
+    """
+
+    TOPICS = ["python", "api", "database", "caching", "testing", "deployment", "concurrency"]
+
+    def __init__(self, prompt_ms_per_token=0.4, output_ms_per_token=2.0, overhead_ms=50.0, default_questions=5):
+        self.prompt_ms_per_token = prompt_ms_per_token
+        self.output_ms_per_token = output_ms_per_token
+        self.overhead_ms = overhead_ms
+        self.default_questions = default_questions
+        self.prompt_tokens = []
+
+    @classmethod
+    def from_env(cls):
+        return cls(prompt_ms_per_token=float(os.getenv("GEMINI_STUB_PROMPT_MS_PER_TOKEN", 0.4)),
+                   output_ms_per_token=float(os.getenv("GEMINI_STUB_OUTPUT_MS_PER_TOKEN", 2.0)))
+
+    def _reply(self, prompt):
+        match = re.search(r"exactly (\d+) questions", prompt)
+        count = int(match.group(1)) if match else self.default_questions
+        questions = [f"Question {i + 1}: walk me through a {self.TOPICS[i % len(self.TOPICS)]} design decision you made."
+                     for i in range(count)]
+        return json.dumps({"questions": questions})
+
+    def generate_content(self, prompt, stream=False):
+        tokens = max(1, len(prompt) // 4)
+        self.prompt_tokens.append(tokens)
+        reply = self._reply(prompt)
+        time.sleep((self.overhead_ms + tokens * self.prompt_ms_per_token) / 1000)
+        if not stream:
+            time.sleep(len(reply) // 4 * self.output_ms_per_token / 1000)
+            return _StubResponse(reply)
+        return self._stream(reply)
+
+    def _stream(self, reply):
+        for start in range(0, len(reply), 16):
+            chunk = reply[start:start + 16]
+            time.sleep(len(chunk) / 4 * self.output_ms_per_token / 1000)
+            yield _StubResponse(chunk)
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+
+"""
+Question Streaming Test Utility
+Exercise generate_questions_stream offline with in-process fake models: incremental
+parsing across chunk boundaries, the fenced / non-incremental reply path, and the
+single-shot fallback when the model cannot stream.
+"""
+
+import io
+import json
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import mock_interview_cli as cli
+
+RESUME = "Backend engineer. Built REST API services in Python and Django on AWS with Docker and PostgreSQL."
+QUESTIONS = ['Explain "idempotent" APIs.', "How would you scale Django?", "Describe a Docker incident."]
+
+
+class _Response:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeStreamingModel:
+    """Replies with `reply`, streamed in `chunk_size`-character chunks."""
+
+    def __init__(self, reply, chunk_size=7):
+        self.reply = reply
+        self.chunk_size = chunk_size
+        self.prompts = []
+
+    def generate_content(self, prompt, stream=False):
+        self.prompts.append(prompt)
+        if not stream:
+            return _Response(self.reply)
+        return (_Response(self.reply[i:i + self.chunk_size]) for i in range(0, len(self.reply), self.chunk_size))
+
+
+class FakeSingleShotModel(FakeStreamingModel):
+    """A model whose streaming call fails before any output, like a client without stream support."""
+
+    def generate_content(self, prompt, stream=False):
+        if stream:
+            self.prompts.append(prompt)
+            raise RuntimeError("streaming not supported")
+        return super().generate_content(prompt)
+
+
+def run_stream(model):
+    out = io.StringIO()
+    cli.generate_questions_stream(RESUME, "Backend Engineer", "3", len(QUESTIONS), model=model, out=out)
+    return [json.loads(line) for line in out.getvalue().splitlines()]
+
+
+def reply_json():
+    return json.dumps({"questions": QUESTIONS})
+
+
+def test_incremental_stream():
+    """Every question is emitted as its own line before the summary, whatever the chunk size."""
+    print("🧪 Testing incremental streaming")
+    for chunk_size in (1, 3, 7, 64):
+        records = run_stream(FakeStreamingModel(reply_json(), chunk_size))
+        items, summary = records[:-1], records[-1]
+        assert [r["question"] for r in items] == summary["questions"], records
+        assert len(items) == len(QUESTIONS) and summary["streamed"] is True, records
+        print(f"✅ chunk size {chunk_size:2}: {len(items)} questions streamed")
+    print()
+
+
+def test_fenced_reply():
+    """A reply wrapped in a ```json fence still yields every question."""
+    print("🧪 Testing fenced reply")
+    records = run_stream(FakeStreamingModel("```json\n" + reply_json() + "\n```"))
+    assert len(records[-1]["questions"]) == len(QUESTIONS), records
+    print(f"✅ {len(records[-1]['questions'])} questions from a fenced reply")
+    print()
+
+
+def test_single_shot_fallback():
+    """Without streaming, the fallback reuses the already built prompt and extracts skills once."""
+    print("🧪 Testing single-shot fallback")
+    calls = []
+    original = cli.extract_skills
+    cli.extract_skills = lambda text: calls.append(text) or original(text)
+    try:
+        model = FakeSingleShotModel(reply_json())
+        records = run_stream(model)
+    finally:
+        cli.extract_skills = original
+    summary = records[-1]
+    assert summary["success"] and summary["streamed"] is False, records
+    assert len(summary["questions"]) == len(QUESTIONS), records
+    assert len(calls) == 1, f"skills extracted {len(calls)} times"
+    assert len(model.prompts) == 2 and model.prompts[0] == model.prompts[1], "fallback rebuilt the prompt"
+    print(f"✅ fallback returned {len(summary['questions'])} questions, skills extracted once, same prompt")
+    print()
+
+
+if __name__ == "__main__":
+    print("💬 Question Streaming Test Suite")
+    print("=" * 70)
+    print()
+
+    test_incremental_stream()
+    test_fenced_reply()
+    test_single_shot_fallback()
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+
+"""
+Resume condensation for the interview-question prompt.
+
+Instead of the first 2,000 raw characters (mostly contact details and headers),
+the prompt gets the most skill-dense sentences of the resume, packed under a
+token budget:
+
+    1. segment the extracted text into sections (Experience, Projects, Skills, ...)
+    2. split sections into sentences / bullets and drop contact-only fragments
+    3. score each sentence by skill and keyword density, weighted by section,
+       with diminishing credit for skills already covered
+    4. greedily pack the best sentences under RESUME_TOKEN_BUDGET and emit them
+       in resume order, grouped by section
+
+Token counts are estimated at ~4 characters per token.
+
+Usage:
+    python resume_condenser.py condense --file resume.pdf [--budget 350]
+    python resume_condenser.py bench [--resumes 20] [--dir resumes/] [--ms-per-token 0.4]
+"""
+
+import argparse
+import json
+import math
+import os
+import re
+import statistics
+import sys
+import time
+
+RESUME_TOKEN_BUDGET = int(os.getenv("RESUME_TOKEN_BUDGET", 350))
+CHARS_PER_TOKEN = 4
+
+# Section weights: how much a matching sentence in that section is worth to the interviewer
+SECTION_WEIGHTS = {
+    "experience": 1.0,
+    "projects": 1.0,
+    "skills": 0.8,
+    "summary": 0.6,
+    "certifications": 0.5,
+    "achievements": 0.4,
+    "education": 0.3,
+    "header": 0.1,
+    "other": 0.2,
+}
+SECTION_HEADINGS = {
+    "summary": ["professional summary", "summary", "objective", "profile", "about me"],
+    "experience": ["work experience", "professional experience", "experience", "employment history", "employment", "internships"],
+    "projects": ["personal projects", "projects"],
+    "skills": ["technical skills", "skills", "technologies", "tech stack"],
+    "education": ["education"],
+    "certifications": ["certifications", "certificates", "courses"],
+    "achievements": ["achievements", "awards", "publications", "leadership", "activities"],
+    "other": ["interests", "hobbies", "references", "declaration"],
+}
+
+# Non-skill words that still signal concrete, interview-worthy content
+IMPACT_KEYWORDS = {
+    "built", "designed", "developed", "implemented", "led", "optimized", "migrated", "deployed",
+    "architected", "automated", "scaled", "reduced", "improved", "increased", "integrated",
+    "refactored", "launched", "maintained", "mentored", "owned", "api", "pipeline", "production",
+    "latency", "performance", "users", "requests", "database", "microservices", "testing",
+}
+CONTACT_PATTERN = re.compile(r"@|https?://|www\.|linkedin\.com|github\.com|\+?\d[\d\s().-]{7,}\d")
+NUMBER_PATTERN = re.compile(r"\d+(?:\.\d+)?\s*(?:%|x\b|k\b|m\b|ms\b)|\b\d{2,}\b", re.IGNORECASE)
+SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+(?=[A-Z])|\s*[\n•▪●–|]\s*|\s+[-*—]\s+(?=[A-Z])")
+
+
+def estimate_tokens(text):
+    return max(1, math.ceil(len(text) / CHARS_PER_TOKEN)) if text else 0
+
+
+def _heading_pattern():
+    # Headings survive PDF extraction as Title Case or UPPER CASE words inside flattened text
+    variants = []
+    for section, names in SECTION_HEADINGS.items():
+        for name in sorted(names, key=len, reverse=True):
+            variants.extend((name.title(), name.upper(), name.capitalize()))
+    alternation = "|".join(re.escape(v) for v in sorted(set(variants), key=len, reverse=True))
+    return re.compile(rf"(?:^|(?<=[\s:]))({alternation})(?=\s*[:\-—\n]|\s+[A-Z0-9”\"])")
+
+
+HEADING_PATTERN = _heading_pattern()
+_HEADING_SECTION = {name: section for section, names in SECTION_HEADINGS.items() for name in names}
+
+
+def segment_sections(text):
+    """Split resume text into [(section, body)], with anything before the first heading as "header"."""
+    sections = []
+    last_end, last_section = 0, "header"
+    for match in HEADING_PATTERN.finditer(text):
+        sections.append((last_section, text[last_end:match.start()]))
+        last_section = _HEADING_SECTION[match.group(1).lower()]
+        last_end = match.end()
+    sections.append((last_section, text[last_end:]))
+    return [(section, body.strip(" :\n—-")) for section, body in sections if body.strip(" :\n—-")]
+
+
+def split_sentences(body):
+    return [part.strip(" ,;:") for part in SENTENCE_SPLIT.split(body) if len(part.strip(" ,;:")) > 2]
+
+
+def _skill_patterns(skills):
+    return {skill: re.compile(r"(?<![a-z0-9])" + re.escape(skill) + r"(?![a-z0-9])") for skill in skills}
+
+
+def condense_resume(text, skills, token_budget=None):
+    """
+    Pack the most skill-relevant sentences of `text` into at most `token_budget` tokens.
+    Returns (condensed_text, stats).
+    """
+    token_budget = RESUME_TOKEN_BUDGET if token_budget is None else token_budget
+    patterns = _skill_patterns({skill.lower() for skill in skills})
+
+    candidates = []
+    for section, body in segment_sections(text):
+        for sentence in split_sentences(body):
+            lowered = sentence.lower()
+            if CONTACT_PATTERN.search(sentence) and not any(p.search(lowered) for p in patterns.values()):
+                continue
+            words = re.findall(r"[a-z][a-z0-9+#.]*", lowered)
+            candidates.append({
+                "position": len(candidates),
+                "section": section,
+                "text": sentence,
+                "tokens": estimate_tokens(sentence) + 1,
+                "skills": {skill for skill, pattern in patterns.items() if pattern.search(lowered)},
+                "keywords": sum(word in IMPACT_KEYWORDS for word in words),
+                "numbers": len(NUMBER_PATTERN.findall(sentence)),
+            })
+
+    covered = set()
+    chosen = []
+    used = 0
+    remaining = list(candidates)
+    while remaining:
+        def score(c):
+            new_skills = len(c["skills"] - covered)
+            signal = new_skills + 0.3 * (len(c["skills"]) - new_skills) + 0.5 * c["keywords"] + 0.3 * min(c["numbers"], 2)
+            return SECTION_WEIGHTS.get(c["section"], 0.2) * signal / math.sqrt(c["tokens"])
+
+        best = max(remaining, key=score)
+        if score(best) <= 0:
+            break
+        remaining.remove(best)
+        if used + best["tokens"] > token_budget:
+            continue
+        chosen.append(best)
+        used += best["tokens"]
+        covered |= best["skills"]
+
+    # Resume order, one line per section
+    lines = []
+    for candidate in sorted(chosen, key=lambda c: c["position"]):
+        label = candidate["section"].title()
+        if lines and lines[-1][0] == label:
+            lines[-1][1].append(candidate["text"])
+        else:
+            lines.append((label, [candidate["text"]]))
+    condensed = "\n".join(f"{label}: " + "; ".join(sentences) for label, sentences in lines)
+
+    stats = {
+        "original_tokens": estimate_tokens(text),
+        "condensed_tokens": estimate_tokens(condensed),
+        "sentences": len(candidates),
+        "kept_sentences": len(chosen),
+        "skills_covered": len(covered),
+        "skills_total": len(patterns),
+    }
+    return condensed, stats
+
+
+# --- Benchmark: prompt size and stub-LLM latency, raw truncation vs condensation ---
+
+def _skill_coverage(context, skills):
+    patterns = _skill_patterns({skill.lower() for skill in skills})
+    lowered = context.lower()
+    return sum(bool(pattern.search(lowered)) for pattern in patterns.values())
+
+
+def run_benchmark(resumes, directory, budget, ms_per_token, output_ms_per_token):
+    import bench_fixtures
+    import mock_interview_cli as cli
+    from question_model_stub import StubQuestionModel
+
+    texts = [bench_fixtures.make_long_resume_text(seed) for seed in range(resumes)]
+    if directory:
+        texts += [cli.parse_resume_file(path).get("text", "") for path in cli.collect_batch_files(directory)]
+    texts = [text for text in texts if text]
+
+    model = StubQuestionModel(prompt_ms_per_token=ms_per_token, output_ms_per_token=output_ms_per_token)
+    results = {"raw": [], "condensed": []}
+    for text in texts:
+        skills = cli.extract_skills(text)
+        for mode in results:
+            start = time.perf_counter()
+            if mode == "raw":
+                context = cli.truncate_resume(text)
+            else:
+                context, _ = condense_resume(text, skills, budget)
+            condense_ms = (time.perf_counter() - start) * 1000
+            prompt = cli.build_question_prompt(context, "Backend Engineer", 3, skills, 5)
+
+            start = time.perf_counter()
+            model.generate_content(prompt)
+            results[mode].append({
+                "prompt_tokens": estimate_tokens(prompt),
+                "llm_ms": (time.perf_counter() - start) * 1000,
+                "condense_ms": condense_ms,
+                "skill_coverage": _skill_coverage(context, skills) / len(skills) if skills else 1.0,
+            })
+
+    summary = {"resumes": len(texts), "token_budget": budget, "ms_per_prompt_token": ms_per_token}
+    for mode, rows in results.items():
+        for key in ("prompt_tokens", "llm_ms", "condense_ms", "skill_coverage"):
+            summary[f"{mode}_{key}"] = round(statistics.mean(row[key] for row in rows), 3)
+    summary["prompt_token_reduction"] = round(1 - summary["condensed_prompt_tokens"] / summary["raw_prompt_tokens"], 3)
+    summary["llm_latency_reduction"] = round(1 - summary["condensed_llm_ms"] / summary["raw_llm_ms"], 3)
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    sub = parser.add_subparsers(dest="command", required=True)
+    condense = sub.add_parser("condense", help="Print the condensed context for one resume")
+    condense.add_argument("--file", help="Resume PDF")
+    condense.add_argument("--text", help="Resume text")
+    condense.add_argument("--budget", type=int, default=RESUME_TOKEN_BUDGET)
+    bench = sub.add_parser("bench", help="Prompt size and stub-LLM latency: raw truncation vs condensation")
+    bench.add_argument("--resumes", type=int, default=20, help="Synthetic resumes")
+    bench.add_argument("--dir", help="Also include the resume PDFs in this directory")
+    bench.add_argument("--budget", type=int, default=RESUME_TOKEN_BUDGET)
+    bench.add_argument("--ms-per-token", type=float, default=0.4, help="Stub model prompt-processing cost")
+    bench.add_argument("--output-ms-per-token", type=float, default=2.0, help="Stub model generation cost")
+    args = parser.parse_args()
+
+    if args.command == "condense":
+        import mock_interview_cli as cli
+
+        if args.file:
+            parsed = cli.parse_resume_file(args.file)
+            if "error" in parsed:
+                print(json.dumps(parsed))
+                sys.exit(1)
+            text = parsed["text"]
+        else:
+            text = args.text or sys.stdin.read()
+        condensed, stats = condense_resume(text, cli.extract_skills(text), args.budget)
+        print(condensed)
+        print(json.dumps(stats), file=sys.stderr)
+    elif args.command == "bench":
+        print(json.dumps(run_benchmark(args.resumes, args.dir, args.budget, args.ms_per_token, args.output_ms_per_token)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+
+"""
+Streaming ranking pipeline: collection, comment sentiment, feature rows and
+ranking overlap through bounded queues instead of running as barriered steps.
+
+    search pages -> detail fetch + filters + dedupe -> comment sentiment workers -> ranker
+
+The ranker scores each feature row as it arrives and emits a provisional top-K
+(one JSON line) as soon as K long-form candidates are scored, updating it while
+the remaining videos stream in. The final ranking is printed in the same
+"Top 5 ranked video links:" format as train_and_rank.py and written to
+raw_videos.csv / features.csv.
+
+Near-duplicates keep the most-viewed video of each cluster, as DuplicateDetector.dedupe
+does for the batch collector. Videos stream on before the whole cluster is known, so a
+more-viewed copy arriving after a mirror is scored as well and supersedes it in the ranking.
+
+Usage:
+    python streaming_pipeline.py "python programming" [max_videos] [--top-k 5] [--workers 8]
+    python streaming_pipeline.py bench [--latency-ms 80]   # compare with the sequential flow
+"""
+
+import argparse
+import heapq
+import json
+import os
+import queue
+import sys
+import threading
+import time
+
+import pandas as pd
+
+from collect_data_for_ml import fetch_video_details
+from features import FEATURE_COLUMNS, feature_row, get_comment_sentiment
+from pipeline_metrics import metrics
+from video_dedupe import DuplicateDetector
+from video_filters import FALLBACK_COUNT, is_valid_tutorial_video, parse_duration
+from youtube_client import build_youtube, youtube_configured
+
+_DONE = object()
+# How long a stage blocks on a full queue before checking whether its consumers are gone
+PUT_TIMEOUT_S = 0.5
+
+
+class PipelineStopped(Exception):
+    """Raised in a stage whose output can no longer be consumed (the ranker has finished)."""
+
+
+def default_youtube_factory():
+    # httplib2-backed clients are not thread-safe, so every stage thread builds its own
+    return build_youtube()
+
+
+class StreamingPipeline:
+    def __init__(self, query, max_results=50, top_k=5, comment_workers=8, queue_size=50,
+                 model=None, youtube_factory=None, dedupe=True, on_update=None):
+        self.query = query
+        self.max_results = max_results
+        self.top_k = top_k
+        self.comment_workers = comment_workers
+        self.model = model
+        self.youtube_factory = youtube_factory or default_youtube_factory
+        self.dedupe = dedupe
+        self.on_update = on_update or (lambda record: None)
+
+        self.ids_queue = queue.Queue(maxsize=queue_size)
+        self.video_queue = queue.Queue(maxsize=queue_size)
+        self.row_queue = queue.Queue(maxsize=queue_size)
+
+        self.collected = []
+        self.rejected = []
+        self.rows = []
+        # Videos replaced by a more-viewed copy from the same near-duplicate cluster
+        self.superseded = set()
+        self.errors = []
+        self.stopped = threading.Event()
+        self.start = None
+        self.first_provisional_s = None
+
+    def _elapsed(self):
+        return round(time.perf_counter() - self.start, 4)
+
+    def _put(self, q, item):
+        """Queue.put that gives up with PipelineStopped instead of blocking on a consumer that has gone."""
+        while True:
+            if self.stopped.is_set():
+                raise PipelineStopped()
+            try:
+                q.put(item, timeout=PUT_TIMEOUT_S)
+                return
+            except queue.Full:
+                continue
+
+    def _guard(self, stage, func, *done_queues):
+        """Run a stage; on failure record the error and still signal downstream so nothing blocks."""
+        def run():
+            try:
+                func()
+            except PipelineStopped:
+                self.errors.append(f"{stage}: stopped, no consumers left")
+            except Exception as e:
+                self.errors.append(f"{stage}: {e}")
+                try:
+                    for q in done_queues:
+                        self._put(q, _DONE)
+                except PipelineStopped:
+                    pass
+        return threading.Thread(target=run, name=stage, daemon=True)
+
+    # --- Stages ---
+
+    def _search_stage(self):
+        youtube = self.youtube_factory()
+        page_token = None
+        remaining = self.max_results
+        while remaining > 0:
+            response = youtube.search().list(
+                q=f"{self.query} tutorial course", part="snippet", maxResults=min(remaining, 50),
+                type="video", order="relevance", pageToken=page_token
+            ).execute()
+            metrics.incr("api_calls.search")
+            video_ids = [item["id"]["videoId"] for item in response["items"]]
+            if video_ids:
+                self._put(self.ids_queue, video_ids)
+            remaining -= len(video_ids)
+            page_token = response.get("nextPageToken")
+            if not page_token or not video_ids:
+                break
+        self._put(self.ids_queue, _DONE)
+
+    def _details_stage(self):
+        detector = None
+        best = {}  # cluster id -> (view_count, video_id) of the video kept for it
+        try:
+            youtube = self.youtube_factory()
+            # SQLite connections belong to the thread that opened them
+            detector = DuplicateDetector() if self.dedupe else None
+            while True:
+                video_ids = self.ids_queue.get()
+                if video_ids is _DONE:
+                    break
+                for video in fetch_video_details(youtube, video_ids):
+                    self.collected.append(video)
+                    if not is_valid_tutorial_video(video)[0]:
+                        self.rejected.append(video)
+                        continue
+                    if detector:
+                        cluster_id = detector.assign(video)
+                        current = best.get(cluster_id)
+                        if current is not None:
+                            metrics.incr("dedupe.duplicates")
+                            if video["view_count"] <= current[0]:
+                                continue
+                            self.superseded.add(current[1])
+                        best[cluster_id] = (video["view_count"], video["video_id"])
+                    self._put(self.video_queue, video)
+
+            if not any(is_valid_tutorial_video(v)[0] for v in self.collected):
+                # Same fallback as collection: nothing long-form, so score the longest few
+                for video in sorted(self.rejected, key=lambda v: parse_duration(v["duration"]), reverse=True)[:FALLBACK_COUNT]:
+                    self._put(self.video_queue, video)
+        finally:
+            if detector:
+                detector.conn.commit()
+                detector.close()
+            for _ in range(self.comment_workers):
+                self._put(self.video_queue, _DONE)
+
+    def _comment_worker(self):
+        try:
+            youtube = self.youtube_factory()
+            while True:
+                video = self.video_queue.get()
+                if video is _DONE:
+                    break
+                sentiment = get_comment_sentiment(video["video_id"], max_comments=15, youtube=youtube)
+                self._put(self.row_queue, feature_row(video, sentiment))
+        finally:
+            # The ranker counts these; a failed worker still sends one (its error is in self.errors)
+            self._put(self.row_queue, _DONE)
+
+    # --- Ranker (runs on the calling thread) ---
+
+    def _score(self, row):
+        if self.model is None:
+            return row["target_score"]
+        columns = list(getattr(self.model, "feature_names_in_", FEATURE_COLUMNS))
+        return float(self.model.predict(pd.DataFrame([row])[columns])[0])
+
+    def run(self):
+        self.start = time.perf_counter()
+        threads = [
+            self._guard("search", self._search_stage, self.ids_queue),
+            # details and comment stages signal downstream from their own finally blocks
+            self._guard("details", self._details_stage),
+        ]
+        threads += [self._guard(f"comments-{i}", self._comment_worker) for i in range(self.comment_workers)]
+        for thread in threads:
+            thread.start()
+
+        heap = []  # min-heap of (score, video_id) holding the current top-K
+        finished_workers = 0
+        last_top = None
+        try:
+            while finished_workers < self.comment_workers:
+                row = self.row_queue.get()
+                if row is _DONE:
+                    finished_workers += 1
+                    continue
+                if row["video_id"] in self.superseded:
+                    continue
+                row["predicted_score"] = self._score(row)
+                self.rows.append(row)
+
+                if any(video_id in self.superseded for _, video_id in heap):
+                    # A kept video was replaced by a more-viewed copy: rebuild the top-K without it
+                    heap = heapq.nlargest(self.top_k, ((r["predicted_score"], r["video_id"]) for r in self.rows
+                                                       if r["video_id"] not in self.superseded and r is not row))
+                    heapq.heapify(heap)
+                entry = (row["predicted_score"], row["video_id"])
+                if len(heap) < self.top_k:
+                    heapq.heappush(heap, entry)
+                elif entry > heap[0]:
+                    heapq.heapreplace(heap, entry)
+
+                top = [video_id for _, video_id in sorted(heap, reverse=True)]
+                if len(heap) == self.top_k and top != last_top:
+                    if self.first_provisional_s is None:
+                        self.first_provisional_s = self._elapsed()
+                    last_top = top
+                    self.on_update({"provisional": True, "elapsed_s": self._elapsed(), "scored": len(self.rows), "top": top})
+        finally:
+            # Nothing reads the queues any more: upstream stages still blocked on a put give up
+            self.stopped.set()
+            for thread in threads:
+                thread.join()
+
+        failed_workers = [error for error in self.errors if error.startswith("comments-")]
+        if len(failed_workers) == self.comment_workers:
+            raise RuntimeError(f"All {self.comment_workers} comment workers failed: {failed_workers[0]}")
+
+        # The details stage is done, so every replacement is known by now
+        self.rows = [row for row in self.rows if row["video_id"] not in self.superseded]
+        ranked = sorted(self.rows, key=lambda r: r["predicted_score"], reverse=True)
+        result = {
+            "final": True,
+            "elapsed_s": self._elapsed(),
+            "first_provisional_s": self.first_provisional_s,
+            "collected": len(self.collected),
+            "scored": len(self.rows),
+            "top": [row["video_id"] for row in ranked[:self.top_k]],
+            "errors": self.errors,
+        }
+        self.on_update(result)
+        return ranked, result
+
+
+def load_model(path="model.pkl"):
+    import joblib
+    return joblib.load(path) if os.path.exists(path) else None
+
+
+def print_ranked(ranked, top_k=5):
+    """Print the final ranking in the format server/mlService.js parses"""
+    print("Top 5 ranked video links:")
+    for i, row in enumerate(ranked[:top_k], 1):
+        print(f"{i}. https://www.youtube.com/watch?v={row['video_id']}")
+        print(f"   - Title: {row['title'][:60]}...")
+        print(f"   - Duration: {row['duration_sec'] / 60:.1f} minutes")
+        print(f"   - ML Score: {row['predicted_score']:.3f}")
+        print()
+
+
+# --- Benchmark against the sequential flow ---
+
+def run_sequential(youtube, query, max_results, model):
+    """In-process equivalent of pipeline_runner: collect, then features, then rank."""
+    from collect_data_for_ml import fetch_videos_for_ml
+    from features import create_features
+
+    start = time.perf_counter()
+    df = fetch_videos_for_ml(query, max_results, youtube=youtube, use_index=False, dedupe=False)
+    features_df = create_features(df, youtube=youtube)
+    columns = list(getattr(model, "feature_names_in_", FEATURE_COLUMNS))
+    features_df = features_df.assign(predicted_score=model.predict(features_df[columns]))
+    ranked = features_df.sort_values("predicted_score", ascending=False)
+    return time.perf_counter() - start, ranked
+
+
+def run_benchmark(max_results, latency_ms, workers, repeat):
+    import contextlib
+    import io
+
+    from sklearn.ensemble import RandomForestRegressor
+
+    import bench_fixtures
+
+    training = bench_fixtures.make_features(500)
+    model = RandomForestRegressor(n_estimators=100, random_state=42).fit(training[FEATURE_COLUMNS], training["target_score"])
+
+    results = []
+    for run in range(repeat):
+        query = f"bench topic {run}"
+        with contextlib.redirect_stdout(io.StringIO()):
+            sequential_s, _ = run_sequential(bench_fixtures.FakeYouTube(latency_s=latency_ms / 1000), query, max_results, model)
+
+            youtube = bench_fixtures.FakeYouTube(latency_s=latency_ms / 1000)
+            pipeline = StreamingPipeline(query, max_results, comment_workers=workers, model=model,
+                                         youtube_factory=lambda: youtube, dedupe=False)
+            _, streamed = pipeline.run()
+
+        results.append({
+            "run": run,
+            "videos": max_results,
+            "latency_ms": latency_ms,
+            "sequential_s": round(sequential_s, 3),
+            "streaming_s": streamed["elapsed_s"],
+            "first_provisional_s": streamed["first_provisional_s"],
+            "speedup": round(sequential_s / streamed["elapsed_s"], 2) if streamed["elapsed_s"] else None,
+        })
+        print(json.dumps(results[-1]), flush=True)
+    return results
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "bench":
+        parser = argparse.ArgumentParser(prog="streaming_pipeline.py bench")
+        parser.add_argument("--videos", type=int, default=50)
+        parser.add_argument("--latency-ms", type=float, default=80)
+        parser.add_argument("--workers", type=int, default=8)
+        parser.add_argument("--repeat", type=int, default=3)
+        args = parser.parse_args(sys.argv[2:])
+        run_benchmark(args.videos, args.latency_ms, args.workers, args.repeat)
+        return
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("topic", nargs="?", default="programming")
+    parser.add_argument("max_videos", nargs="?", type=int, default=50)
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent comment-sentiment workers")
+    parser.add_argument("--queue-size", type=int, default=50, help="Bound on each inter-stage queue")
+    args = parser.parse_args()
+
+    if not youtube_configured():
+        print("WARNING: YouTube API key not configured")
+        sys.exit(1)
+
+    pipeline = StreamingPipeline(
+        args.topic, args.max_videos, args.top_k, args.workers, args.queue_size, model=load_model(),
+        on_update=lambda record: print(json.dumps(record), flush=True)
+    )
+    with metrics.span("streaming_pipeline", query=args.topic):
+        ranked, _ = pipeline.run()
+
+    pd.DataFrame(pipeline.collected).to_csv("raw_videos.csv", index=False)
+    pd.DataFrame(ranked).drop(columns=["predicted_score"], errors="ignore").to_csv("features.csv", index=False)
+    metrics.flush()
+    print_ranked(ranked, args.top_k)
+
+
+if __name__ == "__main__":
+    main()
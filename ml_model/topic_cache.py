@@ -0,0 +1,500 @@
+#!/usr/bin/env python3
+
+"""
+Ranked-results cache for roadmap topics, with a background pre-warming job.
+
+server/mlService.js checks this cache before running the multi-minute
+collect -> features -> train_and_rank pipeline, and stores the result after a
+miss. The pre-warming job keeps the cache warm for the topics users request most:
+
+    - the configured hot topics (PREWARM_HOT_TOPICS, default: the topicMappings
+      values in server/mlService.js)
+    - recently requested topics, weighted by a request count that decays with
+      a half-life of TOPIC_RECENT_HALF_LIFE_S
+
+Entries are refreshed once less than TOPIC_CACHE_REFRESH_AHEAD of their TTL is
+left, so a warm topic never expires between two scheduler passes. Pipeline runs
+are charged against PREWARM_QUOTA_BUDGET YouTube quota units per rolling 24 h
+(measured from the pipeline's api_calls.* counters), run at low CPU priority,
+and each runs in its own scratch directory so it never overwrites the CSVs or
+model.pkl of a user-facing request.
+
+Results are keyed by topic and by the request parameters that change them (maxVideos,
+as the number of videos it makes the pipeline collect, and minDurationMinutes); the
+pre-warmer warms the getVideoRecommendations defaults. Stored in a single SQLite file
+(TOPIC_CACHE_PATH, default topic_cache.sqlite).
+
+Usage:
+    python topic_cache.py get "python programming" [--max-videos 10] [--min-duration 120]
+    python topic_cache.py put "python programming" '<videos json>' [--max-videos 10] [--min-duration 120]
+    python topic_cache.py prewarm [--once] [--dry-run]
+    python topic_cache.py status
+    python topic_cache.py bench [--days 7] [--requests-per-day 2000]
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+
+from pipeline_metrics import METRICS_FILE_ENV, load_records, merge_records
+from video_filters import FALLBACK_COUNT, MIN_DURATION_MINUTES
+from youtube_client import QUOTA_COSTS
+
+ML_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_PATH = os.getenv("TOPIC_CACHE_PATH", os.path.join(ML_DIR, "topic_cache.sqlite"))
+CACHE_TTL_S = float(os.getenv("TOPIC_CACHE_TTL_S", 24 * 3600))
+# Refresh an entry once less than this fraction of its TTL is left
+REFRESH_AHEAD = float(os.getenv("TOPIC_CACHE_REFRESH_AHEAD", 0.25))
+RECENT_HALF_LIFE_S = float(os.getenv("TOPIC_RECENT_HALF_LIFE_S", 24 * 3600))
+
+# YouTube quota units the pre-warmer may spend per rolling 24 h (a project gets 10,000 by default)
+PREWARM_QUOTA_BUDGET = int(os.getenv("PREWARM_QUOTA_BUDGET", 5000))
+PREWARM_INTERVAL_S = float(os.getenv("PREWARM_INTERVAL_S", 300))
+# Recently requested topics considered per pass, and the decayed request count they need
+PREWARM_RECENT_TOPICS = int(os.getenv("PREWARM_RECENT_TOPICS", 10))
+PREWARM_MIN_REQUESTS = float(os.getenv("PREWARM_MIN_REQUESTS", 2.0))
+# getVideoRecommendations(topic, maxVideos = 10, minDurationMinutes = 120) in server/mlService.js
+DEFAULT_MAX_VIDEOS = 10
+DEFAULT_MIN_DURATION_MINUTES = 120.0
+# The request variant pre-warmed: maxVideos, and the duration filter the pipeline applies
+PREWARM_MAX_VIDEOS = int(os.getenv("PREWARM_MAX_VIDEOS", DEFAULT_MAX_VIDEOS))
+PREWARM_MIN_DURATION_MINUTES = MIN_DURATION_MINUTES
+PREWARM_NICE = int(os.getenv("PREWARM_NICE", 10))
+# Matches the server's runPythonScript timeout
+PIPELINE_TIMEOUT_S = 300
+
+# The topicMappings values in server/mlService.js
+DEFAULT_HOT_TOPICS = [
+    "web development", "frontend development", "backend development", "full stack development",
+    "machine learning", "data science", "artificial intelligence", "mobile app development",
+    "android development", "ios development", "react development", "node.js development",
+    "python programming", "javascript programming", "devops engineering",
+]
+# Priority of a configured hot topic, in decayed requests
+HOT_TOPIC_WEIGHT = 5.0
+
+PIPELINE_STEPS = [["collect_data_for_ml.py", "{topic}", "{count}"], ["features.py"], ["train_and_rank.py"]]
+
+
+def normalize_topic(topic):
+    # Same key as the server's in-memory videoCache
+    return " ".join(topic.lower().split())
+
+
+def fetch_count(max_videos):
+    """Videos collect_data_for_ml.py is asked for, as getVideoRecommendations computes it."""
+    return max(max_videos * 10, 50)
+
+
+PREWARM_FETCH_COUNT = fetch_count(PREWARM_MAX_VIDEOS)
+# Share of a search page that passes the video filters (filter.kept / filter.fetched,
+# about 16/50 in pipeline metrics); only those videos get a comment page
+PREWARM_KEPT_SHARE = float(os.getenv("PREWARM_KEPT_SHARE", 0.32))
+
+
+def cache_key(topic, max_videos=None, min_duration_minutes=None):
+    """Results key: the topic plus the fetch count maxVideos implies and the minimum duration."""
+    max_videos = DEFAULT_MAX_VIDEOS if max_videos is None else max_videos
+    min_duration_minutes = DEFAULT_MIN_DURATION_MINUTES if min_duration_minutes is None else min_duration_minutes
+    return f"{normalize_topic(topic)}|fetch={fetch_count(max_videos)}|min={float(min_duration_minutes):g}"
+
+
+def hot_topics():
+    configured = os.getenv("PREWARM_HOT_TOPICS")
+    topics = configured.split(",") if configured else DEFAULT_HOT_TOPICS
+    return list(dict.fromkeys(normalize_topic(t) for t in topics if t.strip()))
+
+
+class TopicCache:
+    def __init__(self, path=None):
+        self.path = path or CACHE_PATH
+        self.conn = sqlite3.connect(self.path, timeout=30)
+        self.conn.executescript("""
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+            CREATE TABLE IF NOT EXISTS results (
+                topic TEXT PRIMARY KEY,
+                videos TEXT NOT NULL,
+                refreshed_at REAL NOT NULL,
+                expires_at REAL NOT NULL,
+                quota_units INTEGER,
+                source TEXT
+            );
+            CREATE TABLE IF NOT EXISTS requests (
+                topic TEXT PRIMARY KEY,
+                score REAL NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS spend (at REAL NOT NULL, topic TEXT, units INTEGER NOT NULL);
+        """)
+
+    def close(self):
+        self.conn.close()
+
+    def get(self, topic, max_videos=None, min_duration_minutes=None, now=None):
+        """The cached entry for `topic` with these request parameters, or None when missing or expired."""
+        now = time.time() if now is None else now
+        row = self.conn.execute(
+            "SELECT videos, refreshed_at, expires_at FROM results WHERE topic = ?",
+            (cache_key(topic, max_videos, min_duration_minutes),)).fetchone()
+        if row is None or row[2] <= now:
+            return None
+        return {"videos": json.loads(row[0]), "age_s": round(now - row[1], 1), "expires_in_s": round(row[2] - now, 1)}
+
+    def put(self, topic, videos, max_videos=None, min_duration_minutes=None, quota_units=None, source="request",
+            now=None, ttl_s=None):
+        now = time.time() if now is None else now
+        ttl_s = CACHE_TTL_S if ttl_s is None else ttl_s
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)",
+                (cache_key(topic, max_videos, min_duration_minutes), json.dumps(videos), now, now + ttl_s,
+                 quota_units, source))
+
+    def record_request(self, topic, now=None):
+        """Count a user request; older requests decay with a half-life of RECENT_HALF_LIFE_S."""
+        now = time.time() if now is None else now
+        topic = normalize_topic(topic)
+        with self.conn:
+            row = self.conn.execute("SELECT score, updated_at FROM requests WHERE topic = ?", (topic,)).fetchone()
+            score = _decay(row[0], now - row[1]) + 1 if row else 1.0
+            self.conn.execute("INSERT OR REPLACE INTO requests VALUES (?, ?, ?)", (topic, score, now))
+
+    def recent_topics(self, limit, now=None):
+        """The `limit` topics with the highest decayed request count, as [(topic, score)]."""
+        now = time.time() if now is None else now
+        rows = self.conn.execute("SELECT topic, score, updated_at FROM requests").fetchall()
+        scored = sorted(((topic, _decay(score, now - updated)) for topic, score, updated in rows),
+                        key=lambda item: item[1], reverse=True)
+        return scored[:limit]
+
+    def expiry(self, topic, max_videos=None, min_duration_minutes=None):
+        """(refreshed_at, expires_at, quota_units) of the cached entry for `topic`, or None."""
+        return self.conn.execute(
+            "SELECT refreshed_at, expires_at, quota_units FROM results WHERE topic = ?",
+            (cache_key(topic, max_videos, min_duration_minutes),)).fetchone()
+
+    def spend(self, topic, units, now=None):
+        now = time.time() if now is None else now
+        with self.conn:
+            self.conn.execute("INSERT INTO spend VALUES (?, ?, ?)", (now, topic, units))
+            self.conn.execute("DELETE FROM spend WHERE at < ?", (now - 24 * 3600,))
+
+    def spent_last_day(self, now=None):
+        now = time.time() if now is None else now
+        row = self.conn.execute("SELECT SUM(units) FROM spend WHERE at >= ?", (now - 24 * 3600,)).fetchone()
+        return row[0] or 0
+
+
+def _decay(score, elapsed_s):
+    return score * 0.5 ** (max(elapsed_s, 0) / RECENT_HALF_LIFE_S)
+
+
+# --- Scheduling ---
+
+def estimate_quota(fetch_count=None):
+    """
+    Expected units for one pipeline run: one search page, one batched video details call,
+    and one comment page per video the filters keep (PREWARM_KEPT_SHARE of the page).
+    """
+    fetch_count = PREWARM_FETCH_COUNT if fetch_count is None else fetch_count
+    page = min(fetch_count, 50)  # collect_data_for_ml.py reads a single search page
+    kept = max(FALLBACK_COUNT, round(page * PREWARM_KEPT_SHARE))
+    return QUOTA_COSTS["search"] + QUOTA_COSTS["videos"] + kept * QUOTA_COSTS["commentThreads"]
+
+
+def plan_prewarm(cache, topics=None, now=None):
+    """
+    Topics due for (re)warming, highest priority first, as [(topic, priority, estimated units)].
+    Due means missing, expired, or inside the refresh-ahead window.
+    """
+    now = time.time() if now is None else now
+    topics = hot_topics() if topics is None else topics
+    priorities = {topic: HOT_TOPIC_WEIGHT for topic in topics}
+    for topic, score in cache.recent_topics(PREWARM_RECENT_TOPICS, now):
+        if score >= PREWARM_MIN_REQUESTS or topic in priorities:
+            priorities[topic] = priorities.get(topic, 0.0) + score
+
+    due = []
+    for topic, priority in priorities.items():
+        row = cache.expiry(topic, PREWARM_MAX_VIDEOS, PREWARM_MIN_DURATION_MINUTES)
+        if row is not None:
+            refreshed_at, expires_at, quota_units = row
+            if expires_at - now > REFRESH_AHEAD * (expires_at - refreshed_at):
+                continue
+        # The last measured cost for this topic, when there is one
+        units = row[2] if row is not None and row[2] is not None else estimate_quota()
+        due.append((topic, priority, units))
+    return sorted(due, key=lambda item: item[1], reverse=True)
+
+
+def prewarm_once(cache, warm=None, topics=None, budget=None, now=None, dry_run=False):
+    """
+    One scheduler pass: warm every due topic, in priority order, that still fits the
+    rolling 24 h quota budget. `warm(topic)` returns (videos, quota units spent).
+    """
+    warm = warm_topic if warm is None else warm
+    budget = PREWARM_QUOTA_BUDGET if budget is None else budget
+    clock = (lambda: now) if now is not None else time.time
+    summary = {"due": 0, "warmed": 0, "failed": 0, "skipped_budget": 0, "units": 0}
+    for topic, priority, estimate in plan_prewarm(cache, topics, clock()):
+        summary["due"] += 1
+        if cache.spent_last_day(clock()) + estimate > budget:
+            summary["skipped_budget"] += 1
+            continue
+        if dry_run:
+            print(json.dumps({"topic": topic, "priority": round(priority, 2), "estimated_units": estimate}), flush=True)
+            continue
+        try:
+            videos, units = warm(topic)
+        except PrewarmError as e:
+            videos, units = None, e.units
+            print(f"Pre-warm failed for '{topic}': {e}", file=sys.stderr, flush=True)
+        cache.spend(topic, units, clock())
+        summary["units"] += units
+        if videos:
+            cache.put(topic, videos, PREWARM_MAX_VIDEOS, PREWARM_MIN_DURATION_MINUTES,
+                      quota_units=units, source="prewarm", now=clock())
+            summary["warmed"] += 1
+        else:
+            summary["failed"] += 1
+    return summary
+
+
+# --- Running the pipeline ---
+
+class PrewarmError(RuntimeError):
+    def __init__(self, message, units):
+        super().__init__(message)
+        self.units = units
+
+
+def lower_priority():
+    """Run this process (and the pipeline steps it spawns) below user-facing requests."""
+    if hasattr(os, "nice"):
+        os.nice(PREWARM_NICE)
+
+
+def quota_units(counters):
+    return sum(QUOTA_COSTS[name] * counters.get(f"api_calls.{name}", 0) for name in QUOTA_COSTS)
+
+
+def warm_topic(topic, fetch_count=None):
+    """
+    Run collect -> features -> train_and_rank for `topic` in a scratch directory, exactly
+    as the server does. Returns (videos, quota units spent); raises PrewarmError on failure.
+    """
+    fetch_count = PREWARM_FETCH_COUNT if fetch_count is None else fetch_count
+    # Windows has no nice(); start each step below normal priority instead
+    creationflags = getattr(subprocess, "BELOW_NORMAL_PRIORITY_CLASS", 0)
+    with tempfile.TemporaryDirectory(prefix="prewarm_") as workdir:
+        metrics_file = os.path.join(workdir, "metrics.jsonl")
+        env = {**os.environ, METRICS_FILE_ENV: metrics_file, "PYTHONIOENCODING": "utf-8"}
+        output, error = "", None
+        for step in PIPELINE_STEPS:
+            argv = [arg.format(topic=topic, count=fetch_count) for arg in step]
+            try:
+                result = subprocess.run(
+                    [sys.executable, os.path.join(ML_DIR, argv[0]), *argv[1:]], cwd=workdir, env=env,
+                    capture_output=True, text=True, encoding="utf-8", errors="replace",
+                    timeout=PIPELINE_TIMEOUT_S, creationflags=creationflags)
+            except subprocess.TimeoutExpired:
+                error = f"{argv[0]}: timeout after {PIPELINE_TIMEOUT_S}s"
+                break
+            if result.returncode != 0:
+                error = f"{argv[0]}: exit {result.returncode}: {(result.stderr or result.stdout).strip()[-200:]}"
+                break
+            if "No videos collected" in result.stdout:
+                # collect_data_for_ml.py substitutes a placeholder dataset, which must not be cached
+                error = f"{argv[0]}: no videos collected"
+                break
+            output = result.stdout
+        units = quota_units(merge_records(load_records(metrics_file))["counters"])
+
+    if error:
+        raise PrewarmError(error, units)
+    videos = parse_ranked_videos(output)
+    if not videos:
+        raise PrewarmError("no ranked videos", units)
+    return videos, units
+
+
+LINK_PATTERN = re.compile(r"^(\d+)\. (https://www\.youtube\.com/watch\?v=([a-zA-Z0-9_-]{11}))")
+
+
+def parse_ranked_videos(output):
+    """train_and_rank.py's "Top 5 ranked video links" block, in the shape mlService.js returns."""
+    videos = []
+    in_section = False
+    for line in output.splitlines():
+        if "Top 5 ranked video links:" in line:
+            in_section = True
+            continue
+        if not in_section or not line.strip():
+            continue
+        match = LINK_PATTERN.match(line)
+        if match:
+            video_id = match.group(3)
+            videos.append({
+                "title": f"ML Recommended Tutorial - {video_id}",
+                "url": match.group(2),
+                "videoId": video_id,
+                "thumbnail": f"https://img.youtube.com/vi/{video_id}/mqdefault.jpg",
+                "source": "ml_recommendation",
+            })
+        elif videos and "- Title:" in line:
+            videos[-1]["title"] = line.split("- Title:", 1)[1].strip()
+        elif videos and "- Duration:" in line:
+            duration = re.search(r"Duration:\s*([\d.]+)\s*minutes", line)
+            if duration:
+                videos[-1]["duration"] = f"PT{int(float(duration.group(1)))}M"
+        elif videos and "- ML Score:" in line:
+            score = re.search(r"ML Score:\s*([\d.]+)", line)
+            if score:
+                videos[-1]["mlScore"] = float(score.group(1))
+    return videos[:5]
+
+
+def run_prewarmer(once=False, dry_run=False):
+    lower_priority()
+    cache = TopicCache()
+    topics = hot_topics()
+    print(f"Topic pre-warmer: {len(topics)} hot topics, budget {PREWARM_QUOTA_BUDGET} units/24h, "
+          f"every {PREWARM_INTERVAL_S:g}s", flush=True)
+    try:
+        while True:
+            summary = prewarm_once(cache, topics=topics, dry_run=dry_run)
+            print(json.dumps({"prewarm": True, **summary, "spent_24h": cache.spent_last_day()}), flush=True)
+            if once or dry_run:
+                break
+            time.sleep(PREWARM_INTERVAL_S)
+    finally:
+        cache.close()
+
+
+# --- Benchmark: simulated request stream, on-demand caching vs pre-warming ---
+
+def run_benchmark(days=7, requests_per_day=2000, tail_topics=300, cost=None, pipeline_s=180.0, seed=11):
+    """
+    Replays a Zipf-distributed request stream (the hot topics near the head, plus topics
+    that aren't on the hot list) against the real TopicCache and scheduler, with simulated
+    time and pipeline runs. Compares cache-on-miss only against cache-on-miss + pre-warming.
+    """
+    cost = estimate_quota() if cost is None else cost
+    rng = random.Random(seed)
+    topics = hot_topics()
+    others = [f"tail topic {i}" for i in range(tail_topics)]
+    head = topics + others[:10]
+    rng.shuffle(head)
+    ranked = head + others[10:]
+    weights = [1 / (rank + 1) ** 1.1 for rank in range(len(ranked))]
+
+    start = 1_700_000_000.0
+    arrivals = sorted(start + rng.uniform(0, days * 86400) for _ in range(int(days * requests_per_day)))
+    requested = rng.choices(ranked, weights, k=len(arrivals))
+
+    results = {}
+    for policy in ("on_demand", "prewarm"):
+        with tempfile.TemporaryDirectory() as scratch:
+            cache = TopicCache(os.path.join(scratch, "bench.sqlite"))
+            stats = {"hits": 0, "hot_requests": 0, "hot_hits": 0, "first_hour": 0, "first_hour_hits": 0,
+                     "prewarm_runs": 0, "prewarm_units": 0, "user_runs": 0}
+            next_tick = start
+            for now, topic in zip(arrivals, requested):
+                while policy == "prewarm" and next_tick <= now:
+                    summary = prewarm_once(cache, warm=lambda t: ([{"videoId": t}], cost), topics=topics, now=next_tick)
+                    stats["prewarm_runs"] += summary["warmed"]
+                    stats["prewarm_units"] += summary["units"]
+                    next_tick += PREWARM_INTERVAL_S
+                cache.record_request(topic, now)
+                hit = cache.get(topic, now=now) is not None
+                if not hit:
+                    stats["user_runs"] += 1
+                    cache.put(topic, [{"videoId": topic}], quota_units=cost, now=now)
+                stats["hits"] += hit
+                if now < start + 3600:
+                    stats["first_hour"] += 1
+                    stats["first_hour_hits"] += hit
+                if topic in topics:
+                    stats["hot_requests"] += 1
+                    stats["hot_hits"] += hit
+            cache.close()
+        misses = len(arrivals) - stats["hits"]
+        results[policy] = {
+            "hit_rate": round(stats["hits"] / len(arrivals), 4),
+            "hot_topic_hit_rate": round(stats["hot_hits"] / stats["hot_requests"], 4) if stats["hot_requests"] else None,
+            # The cache starts empty, as after a restart
+            "first_hour_hit_rate": round(stats["first_hour_hits"] / stats["first_hour"], 4) if stats["first_hour"] else None,
+            "mean_wait_s": round(misses * pipeline_s / len(arrivals), 1),
+            "user_pipeline_runs_per_day": round(stats["user_runs"] / days, 1),
+            "prewarm_runs_per_day": round(stats["prewarm_runs"] / days, 1),
+            "prewarm_units_per_day": round(stats["prewarm_units"] / days),
+        }
+        print(json.dumps({"policy": policy, **results[policy]}), flush=True)
+
+    summary = {
+        "summary": True, "days": days, "requests_per_day": requests_per_day, "topics": len(ranked),
+        "hot_topics": len(topics), "ttl_s": CACHE_TTL_S, "refresh_ahead": REFRESH_AHEAD,
+        "budget_units_per_day": PREWARM_QUOTA_BUDGET, "units_per_run": cost,
+        "hit_rate_gain": round(results["prewarm"]["hit_rate"] - results["on_demand"]["hit_rate"], 4),
+    }
+    print(json.dumps(summary))
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    sub = parser.add_subparsers(dest="command", required=True)
+    get = sub.add_parser("get", help="Look up a topic (and count the request)")
+    get.add_argument("topic")
+    put = sub.add_parser("put", help="Store the ranked videos for a topic")
+    put.add_argument("topic")
+    put.add_argument("videos", help="JSON list of videos")
+    for command in (get, put):
+        command.add_argument("--max-videos", type=int, default=DEFAULT_MAX_VIDEOS)
+        command.add_argument("--min-duration", type=float, default=DEFAULT_MIN_DURATION_MINUTES, help="Minutes")
+    prewarm = sub.add_parser("prewarm", help="Run the pre-warming scheduler")
+    prewarm.add_argument("--once", action="store_true", help="A single pass instead of a loop")
+    prewarm.add_argument("--dry-run", action="store_true", help="Print the topics a pass would warm")
+    sub.add_parser("status", help="Cached topics, request counts and quota spent")
+    bench = sub.add_parser("bench", help="Hit rate with and without pre-warming on a simulated request stream")
+    bench.add_argument("--days", type=float, default=7)
+    bench.add_argument("--requests-per-day", type=int, default=2000)
+    bench.add_argument("--tail-topics", type=int, default=300)
+    bench.add_argument("--units-per-run", type=int, default=None,
+                       help="Quota units per pipeline run (default: the expected cost for PREWARM_FETCH_COUNT)")
+    args = parser.parse_args()
+
+    if args.command == "get":
+        cache = TopicCache()
+        cache.record_request(args.topic)
+        entry = cache.get(args.topic, args.max_videos, args.min_duration)
+        print(json.dumps({"hit": entry is not None, **(entry or {})}))
+    elif args.command == "put":
+        TopicCache().put(args.topic, json.loads(args.videos), args.max_videos, args.min_duration)
+        print(json.dumps({"stored": cache_key(args.topic, args.max_videos, args.min_duration)}))
+    elif args.command == "prewarm":
+        run_prewarmer(args.once, args.dry_run)
+    elif args.command == "status":
+        cache = TopicCache()
+        now = time.time()
+        for topic, videos, refreshed_at, expires_at, units, source in cache.conn.execute(
+                "SELECT * FROM results ORDER BY expires_at"):
+            print(json.dumps({"topic": topic, "videos": len(json.loads(videos)), "source": source,
+                              "age_s": round(now - refreshed_at), "expires_in_s": round(expires_at - now),
+                              "quota_units": units}))
+        print(json.dumps({"recent": [[t, round(s, 2)] for t, s in cache.recent_topics(PREWARM_RECENT_TOPICS)],
+                          "spent_24h": cache.spent_last_day(), "budget": PREWARM_QUOTA_BUDGET}))
+    elif args.command == "bench":
+        run_benchmark(args.days, args.requests_per_day, args.tail_topics, args.units_per_run)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,32 @@
 import pandas as pd
-from sklearn.model_selection import train_test_split
-from sklearn.ensemble import RandomForestRegressor
-import joblib
+import os
 import sys
 import re
+import time
+from console import configure_console
+from pipeline_metrics import metrics
+from video_filters import FALLBACK_COUNT, MIN_DURATION_MINUTES
 
-# Fix Windows console encoding issues
-if sys.platform == 'win32':
-    import io
-    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
-    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
+# Incremental training (MODEL_TRAINING=incremental or --incremental): each run grows the
+# saved forest with trees fit on the new features only, and rebuilds from the full
+# feature history every MODEL_REBUILD_EVERY updates to correct for drift.
+MODEL_TRAINING = os.getenv("MODEL_TRAINING", "full").lower()
+TREES_PER_UPDATE = int(os.getenv("MODEL_TREES_PER_UPDATE", 30))
+MAX_TREES = int(os.getenv("MODEL_MAX_TREES", 300))
+REBUILD_EVERY = int(os.getenv("MODEL_REBUILD_EVERY", 10))
+# Rows of older history replayed alongside each update, as a multiple of the new rows
+REPLAY_RATIO = float(os.getenv("MODEL_REPLAY_RATIO", 2.0))
+FEATURE_HISTORY_PATH = os.getenv("FEATURE_HISTORY_PATH", "feature_history.csv")
+# Updates replay from a bounded uniform sample of the history (reservoir sampling), so their
+# cost doesn't grow with it; only rebuilds read the whole feature history.
+REPLAY_RESERVOIR_SIZE = int(os.getenv("MODEL_REPLAY_RESERVOIR_SIZE", 2000))
+REPLAY_RESERVOIR_PATH = os.getenv("MODEL_REPLAY_RESERVOIR_PATH", "replay_reservoir.csv")
+# Collection filters before features.py, so a topic can leave only a handful of rows
+# (FALLBACK_COUNT at worst). Below this a full run keeps the saved model instead of
+# refitting it on those rows alone.
+MIN_TRAINING_ROWS = int(os.getenv("MODEL_MIN_TRAINING_ROWS", 20))
+
+META_COLUMNS = ["target_score", "video_id", "title", "duration"]
 
 def parse_duration_to_minutes(duration_str):
     """Parse YouTube duration to minutes for display"""
@@ -37,52 +54,165 @@ def parse_duration_to_minutes(duration_str):
     total_minutes = hours * 60 + minutes + seconds / 60
     return total_minutes
 
-print("ML Pipeline Step 3: Training & Ranking")
-print("=" * 60)
+def train_model(df, n_estimators=300):
+    """Fit the ranking forest on a features DataFrame"""
+    from sklearn.model_selection import train_test_split
+    from sklearn.ensemble import RandomForestRegressor
+
+    # Prepare features (exclude metadata columns)
+    feature_columns = [col for col in df.columns if col not in ["target_score", "video_id", "title", "duration"]]
+    X = df[feature_columns]
+    y = df["target_score"]
+
+    print(f"Training features: {len(feature_columns)} features")
+    print(f"Target: ML quality scores based on engagement + comment sentiment")
+
+    # Handle small datasets by adjusting test size
+    if len(df) < 5:
+        test_size = 0.0  # Use all data for training if dataset is very small
+    else:
+        test_size = 0.2
+
+    if test_size > 0:
+        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=test_size, random_state=42)
+    else:
+        X_train, X_test, y_train, y_test = X, X, y, y
+
+    # Train model
+    model = RandomForestRegressor(n_estimators=n_estimators, random_state=42)
+    model.fit(X_train, y_train)
+    return model
+
+def update_model(model, new_df, trees_per_update=None, max_trees=None, history=None, replay_ratio=None):
+    """
+    Add `trees_per_update` trees to an existing forest (warm_start), fit on `new_df` plus a
+    random sample of `history` of REPLAY_RATIO x its size, so the cost scales with the new
+    rows rather than the whole history. Past `max_trees` the oldest trees are dropped,
+    keeping the forest weighted towards recent topics.
+    """
+    trees_per_update = TREES_PER_UPDATE if trees_per_update is None else trees_per_update
+    max_trees = MAX_TREES if max_trees is None else max_trees
+    replay_ratio = REPLAY_RATIO if replay_ratio is None else replay_ratio
+    if model is None:
+        return train_model(new_df)
+    if history is not None and len(history) and replay_ratio > 0:
+        replay = history.sample(min(len(history), int(len(new_df) * replay_ratio)), random_state=len(history))
+        new_df = pd.concat([new_df, replay], ignore_index=True)
 
-# Load dataset
-df = pd.read_csv("features.csv")
-print(f"Loaded {len(df)} videos with features")
+    feature_columns = list(model.feature_names_in_)
+    missing = [col for col in feature_columns if col not in new_df.columns]
+    if missing:
+        raise ValueError(f"New features are missing {missing}; run a full rebuild")
 
-if len(df) == 0:
-    print("❌ No data available for training")
-    exit(1)
+    model.set_params(warm_start=True, n_estimators=len(model.estimators_) + trees_per_update)
+    model.fit(new_df[feature_columns], new_df["target_score"])
+    if len(model.estimators_) > max_trees:
+        model.estimators_ = model.estimators_[-max_trees:]
+        model.set_params(n_estimators=max_trees)
+    model.updates_since_rebuild_ = getattr(model, "updates_since_rebuild_", 0) + 1
+    return model
 
-# Prepare features (exclude metadata columns)
-feature_columns = [col for col in df.columns if col not in ["target_score", "video_id", "title", "duration"]]
-X = df[feature_columns]
-y = df["target_score"]
+def update_reservoir(reservoir, new_df, seen, size=None):
+    """
+    Reservoir sampling (Algorithm R): keep a uniform sample of at most `size` rows out of the
+    `seen` rows streamed before `new_df` plus `new_df` itself. Returns the new reservoir.
+    """
+    import numpy as np
 
-print(f"Training features: {len(feature_columns)} features")
-print(f"Target: ML quality scores based on engagement + comment sentiment")
+    size = REPLAY_RESERVOIR_SIZE if size is None else size
+    reservoir = new_df.iloc[:0] if reservoir is None else reservoir
+    room = max(0, size - len(reservoir))
+    sample = pd.concat([reservoir, new_df.iloc[:room]], ignore_index=True)
+    rest = new_df.iloc[room:][sample.columns]
+    # Row k of new_df replaces a random slot with probability size / (seen + k + 1)
+    slots = np.random.default_rng(seen).integers(0, seen + np.arange(room, len(new_df)) + 1)
+    for position, slot in enumerate(slots):
+        if slot < size:
+            sample.iloc[slot] = rest.iloc[position]
+    return sample
 
-# Handle small datasets by adjusting test size
-if len(df) < 5:
-    test_size = 0.0  # Use all data for training if dataset is very small
-else:
-    test_size = 0.2
+def train_incremental(features_csv="features.csv", model_path="model.pkl", history_path=None, reservoir_path=None,
+                      trees_per_update=None, max_trees=None, rebuild_every=None, replay_ratio=None):
+    """
+    Append the new features to the history and update the saved model with them (replaying
+    rows from the bounded reservoir), or rebuild it from the whole history when there is no
+    model yet or a rebuild is due.
+    """
+    import joblib
 
-if test_size > 0:
-    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=test_size, random_state=42)
-else:
-    X_train, X_test, y_train, y_test = X, X, y, y
+    history_path = history_path or FEATURE_HISTORY_PATH
+    reservoir_path = reservoir_path or REPLAY_RESERVOIR_PATH
+    rebuild_every = REBUILD_EVERY if rebuild_every is None else rebuild_every
+    df = pd.read_csv(features_csv)
+    print(f"Loaded {len(df)} new videos with features")
+    if len(df) == 0:
+        print("❌ No data available for training")
+        return None
 
-# Train model
-model = RandomForestRegressor(n_estimators=300, random_state=42)
-model.fit(X_train, y_train)
+    # Append-only log, read back only by rebuilds
+    df.to_csv(history_path, mode="a", header=not os.path.exists(history_path), index=False)
+    model = joblib.load(model_path) if os.path.exists(model_path) else None
+    rebuild = model is None or getattr(model, "updates_since_rebuild_", 0) >= rebuild_every
 
-print("✅ Model trained successfully!")
+    with metrics.span("train", rows=len(df), mode="rebuild" if rebuild else "update"):
+        if rebuild:
+            # Re-collected videos keep their latest features
+            history = pd.read_csv(history_path).drop_duplicates("video_id", keep="last")
+            model = train_model(history)
+            model.updates_since_rebuild_ = 0
+            model.rows_seen_ = len(history)
+            reservoir = history.sample(min(len(history), REPLAY_RESERVOIR_SIZE), random_state=len(history))
+            print(f"✅ Model rebuilt from {len(history)} videos of feature history")
+        else:
+            reservoir = pd.read_csv(reservoir_path) if os.path.exists(reservoir_path) else None
+            model = update_model(model, df, trees_per_update, max_trees, history=reservoir, replay_ratio=replay_ratio)
+            seen = getattr(model, "rows_seen_", 0)
+            reservoir = update_reservoir(reservoir, df, seen)
+            model.rows_seen_ = seen + len(df)
+            print(f"✅ Model updated: {len(model.estimators_)} trees, update {model.updates_since_rebuild_}/{rebuild_every} before rebuild")
 
-# Save model
-joblib.dump(model, "model.pkl")
-print("💾 Saved model as model.pkl")
+    reservoir.to_csv(reservoir_path, index=False)
+    joblib.dump(model, model_path)
+    print(f"💾 Saved model as {model_path}")
+    return model
+
+def train_and_save(features_csv="features.csv", model_path="model.pkl"):
+    """Train on a features CSV and save the model. Returns the model, or None if there is no data."""
+    import joblib
+
+    df = pd.read_csv(features_csv)
+    print(f"Loaded {len(df)} videos with features")
+
+    if len(df) == 0:
+        print("❌ No data available for training")
+        return None
+
+    if len(df) < MIN_TRAINING_ROWS and os.path.exists(model_path):
+        model = joblib.load(model_path)
+        if set(model.feature_names_in_) <= set(df.columns):
+            print(f"⚠️ Only {len(df)} videos passed the filters (< {MIN_TRAINING_ROWS}) - ranking with the saved model")
+            metrics.set("train.skipped_rows", len(df))
+            return model
+    if len(df) < MIN_TRAINING_ROWS:
+        print(f"⚠️ Training on only {len(df)} videos (< {MIN_TRAINING_ROWS}) - no saved model to fall back on")
+
+    with metrics.span("train", rows=len(df)):
+        model = train_model(df)
+    print("✅ Model trained successfully!")
+
+    # Save model
+    joblib.dump(model, model_path)
+    print(f"💾 Saved model as {model_path}")
+    return model
 
 # Function to rank new videos
-def rank_new_videos(new_videos_features_csv):
+def rank_new_videos(new_videos_features_csv, model=None, model_path="model.pkl"):
     print("\nStep 4: Filtering & Ranking Videos")
     print("=" * 50)
     
-    model = joblib.load("model.pkl")
+    if model is None:
+        import joblib
+        model = joblib.load(model_path)
     df_new = pd.read_csv(new_videos_features_csv)
     
     if len(df_new) == 0:
@@ -96,12 +226,13 @@ def rank_new_videos(new_videos_features_csv):
         df_new["duration_min"] = df_new["duration"].apply(parse_duration_to_minutes)
     
     # Filter videos longer than 2 hours (120 minutes) - YOUR REQUIREMENT
+    # Collection already applies this (video_filters.py); kept as a guard for older features.csv files
     if "duration_sec" in df_new.columns:
         original_count = len(df_new)
-        df_new = df_new[df_new["duration_sec"] >= 7200]  # 2 hours = 7200 seconds
+        df_new = df_new[df_new["duration_sec"] >= MIN_DURATION_MINUTES * 60]
         filtered_count = len(df_new)
         
-        print(f"Duration filtering: {original_count} -> {filtered_count} videos (>=2 hours)")
+        print(f"Duration filtering: {original_count} -> {filtered_count} videos (>={MIN_DURATION_MINUTES:g} min)")
         
         if filtered_count > 0:
             avg_duration = df_new["duration_min"].mean() if "duration_min" in df_new.columns else "N/A"
@@ -109,10 +240,12 @@ def rank_new_videos(new_videos_features_csv):
     
     # Handle case where all videos are filtered out
     if len(df_new) == 0:
-        print("WARNING: No videos >=2 hours found - using top 3 longest videos as fallback")
+        print(f"WARNING: No videos >={MIN_DURATION_MINUTES:g} min found - using top {FALLBACK_COUNT} longest videos as fallback")
         df_new = pd.read_csv(new_videos_features_csv)
         if "duration_sec" in df_new.columns:
-            df_new = df_new.nlargest(3, "duration_sec")
+            df_new = df_new.nlargest(FALLBACK_COUNT, "duration_sec")
+        if "duration" in df_new.columns:
+            df_new["duration_min"] = df_new["duration"].apply(parse_duration_to_minutes)
     
     # Prepare features for ML prediction
     feature_columns = [col for col in df_new.columns if col not in ["video_id", "title", "target_score", "duration", "duration_min"]]
@@ -139,9 +272,120 @@ def rank_new_videos(new_videos_features_csv):
     
     return ranked[["title", "video_link", "predicted_score", "duration_min"] if "duration_min" in ranked.columns else ["title", "video_link", "predicted_score"]]
 
-if __name__ == "__main__":
+def run_update_benchmark(batches=20, rows=200, trees_per_update=None, rebuild_every=None, replay_ratio=None, seed=7):
+    """
+    Stream synthetic topic batches (with a slowly drifting sentiment distribution) through
+    train_incremental, as `--incremental` runs do, and compare with refitting train_model on
+    the full history every batch. Each batch is scored by the models trained on the batches
+    before it, then used to train.
+    """
+    import contextlib
+    import io
+    import json
+    import tempfile
+
+    import numpy as np
+
+    import bench_fixtures
+
+    rebuild_every = REBUILD_EVERY if rebuild_every is None else rebuild_every
+    stream = []
+    for b in range(batches):
+        batch = bench_fixtures.make_features(rows, seed + b, sentiment_shift=0.02 * b)
+        batch["video_id"] = f"b{b}_" + batch["video_id"]
+        stream.append(batch)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        features_csv = os.path.join(tmp, "features.csv")
+        paths = {"model_path": os.path.join(tmp, "model.pkl"), "history_path": os.path.join(tmp, "history.csv"),
+                 "reservoir_path": os.path.join(tmp, "reservoir.csv")}
+
+        def incremental(batch):
+            batch.to_csv(features_csv, index=False)
+            start = time.perf_counter()
+            model = train_incremental(features_csv, trees_per_update=trees_per_update, rebuild_every=rebuild_every,
+                                      replay_ratio=replay_ratio, **paths)
+            return model, time.perf_counter() - start
+
+        history = stream[0]
+        with contextlib.redirect_stdout(io.StringIO()):
+            full_model = train_model(history)
+            incremental_model, _ = incremental(history)
+
+        records = []
+        for b, batch in enumerate(stream[1:], 1):
+            columns = list(full_model.feature_names_in_)
+            mae = {name: float(np.mean(np.abs(model.predict(batch[columns]) - batch["target_score"])))
+                   for name, model in (("full", full_model), ("incremental", incremental_model))}
+
+            history = pd.concat([history, batch], ignore_index=True)
+            with contextlib.redirect_stdout(io.StringIO()):
+                incremental_model, incremental_s = incremental(batch)
+                start = time.perf_counter()
+                full_model = train_model(history)
+                full_s = time.perf_counter() - start
+            kind = "rebuild" if incremental_model.updates_since_rebuild_ == 0 else "update"
+
+            records.append({"batch": b, "history_rows": len(history), "full_refit_s": round(full_s, 4),
+                            "incremental_s": round(incremental_s, 4), "incremental_kind": kind,
+                            "trees": len(incremental_model.estimators_),
+                            "mae_full": round(mae["full"], 5), "mae_incremental": round(mae["incremental"], 5)})
+            print(json.dumps(records[-1]), flush=True)
+
+    update_times = [r["incremental_s"] for r in records if r["incremental_kind"] == "update"]
+    summary = {
+        "batches": batches, "rows_per_batch": rows,
+        "trees_per_update": TREES_PER_UPDATE if trees_per_update is None else trees_per_update,
+        "max_trees": MAX_TREES, "rebuild_every": rebuild_every,
+        "replay_ratio": REPLAY_RATIO if replay_ratio is None else replay_ratio,
+        "reservoir_size": REPLAY_RESERVOIR_SIZE,
+        "full_refit_s_mean": round(float(np.mean([r["full_refit_s"] for r in records])), 4),
+        "full_refit_s_last": records[-1]["full_refit_s"],
+        "incremental_update_s_mean": round(float(np.mean(update_times)), 4) if update_times else None,
+        "incremental_total_s": round(sum(r["incremental_s"] for r in records), 3),
+        "full_total_s": round(sum(r["full_refit_s"] for r in records), 3),
+        "mae_full_mean": round(float(np.mean([r["mae_full"] for r in records])), 5),
+        "mae_incremental_mean": round(float(np.mean([r["mae_incremental"] for r in records])), 5),
+    }
+    summary["mae_drift"] = round(summary["mae_incremental_mean"] - summary["mae_full_mean"], 5)
+    print(json.dumps(summary))
+    return summary
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("command", nargs="?", choices=["bench"], help="bench: update cost / accuracy drift over synthetic batches")
+    parser.add_argument("--incremental", action="store_true", default=MODEL_TRAINING == "incremental",
+                        help="Update model.pkl with the new features instead of refitting")
+    parser.add_argument("--batches", type=int, default=20)
+    parser.add_argument("--rows", type=int, default=200, help="Rows per synthetic batch")
+    parser.add_argument("--trees-per-update", type=int, default=TREES_PER_UPDATE)
+    parser.add_argument("--rebuild-every", type=int, default=REBUILD_EVERY)
+    parser.add_argument("--replay-ratio", type=float, default=REPLAY_RATIO)
+    args = parser.parse_args()
+
+    if args.command == "bench":
+        run_update_benchmark(args.batches, args.rows, args.trees_per_update, args.rebuild_every, args.replay_ratio)
+        return
+
+    configure_console()
+    print("ML Pipeline Step 3: Training & Ranking")
+    print("=" * 60)
+
+    if args.incremental:
+        model = train_incremental("features.csv", "model.pkl")
+    else:
+        model = train_and_save("features.csv", "model.pkl")
+    if model is None:
+        sys.exit(1)
+
     # Run the complete ranking pipeline
-    ranked = rank_new_videos("features.csv")
+    with metrics.span("rank") as span:
+        ranked = rank_new_videos("features.csv", model=model)
+        span["rows"] = len(ranked)
+    metrics.set("rows.ranked", len(ranked))
+    metrics.flush()
     
     print("\nFinal Results:")
     print("=" * 40)
@@ -160,3 +404,6 @@ if __name__ == "__main__":
         
     print("ML Pipeline Complete!")
     print("Videos ranked by: Comment sentiment (40%) + Engagement (50%) + Content quality (10%)")
+
+if __name__ == "__main__":
+    main()
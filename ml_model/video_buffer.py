@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+
+"""
+Typed columnar buffer for collected videos.
+
+The collectors used to accumulate a list of per-video dicts (full description
+strings included) and turn it into object-dtype DataFrame columns, although
+features.py only ever needs a description's length and sentiment. VideoBuffer
+reduces each video as it is appended:
+
+    video_id         fixed-width 11-byte ASCII
+    channel_id       dictionary-encoded (int32 codes)
+    counts           int64 views, uint32 likes / comments
+    duration         parsed to seconds (uint32)
+    publishedAt      parsed to epoch seconds (int64)
+    description      reduced to desc_len / desc_sentiment, plus a short snippet
+                     (VIDEO_DESCRIPTION_SNIPPET_CHARS, what the server displays);
+                     the full text is appended to `spill_path` when one is given
+
+to_frame() returns the raw_videos.csv columns with fixed-width / categorical dtypes.
+
+Usage:
+    python video_buffer.py bench [--videos 100000] [--score-descriptions]
+"""
+
+import argparse
+import json
+import os
+import random
+import time
+import tracemalloc
+from array import array
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from features import clean_text, get_sentiment
+from video_filters import format_duration, parse_duration
+
+ID_WIDTH = 11
+DESCRIPTION_SNIPPET_CHARS = int(os.getenv("VIDEO_DESCRIPTION_SNIPPET_CHARS", 200))
+# Full descriptions are only kept on disk when this is set (video_index.py also stores them)
+DESCRIPTION_SPILL_PATH = os.getenv("VIDEO_DESCRIPTION_SPILL")
+UINT32_MAX = 2 ** 32 - 1
+
+
+def _epoch_seconds(published_at):
+    return int(datetime.fromisoformat(published_at.replace("Z", "+00:00")).timestamp())
+
+
+class VideoBuffer:
+    def __init__(self, spill_path=None, score_descriptions=True, snippet_chars=None):
+        self.spill_path = spill_path
+        self.score_descriptions = score_descriptions
+        self.snippet_chars = DESCRIPTION_SNIPPET_CHARS if snippet_chars is None else snippet_chars
+
+        self.video_ids = bytearray()
+        self.titles = []
+        self.snippets = []
+        self.channels = {}
+        self.channel_codes = array("i")
+        self.view_counts = array("q")
+        self.like_counts = array("I")
+        self.comment_counts = array("I")
+        self.duration_sec = array("I")
+        self.published = array("q")
+        self.desc_len = array("I")
+        self.desc_sentiment = array("f")
+        # Byte offset / length of each description in the spill file
+        self.spill_offsets = array("q")
+        self.spill_lengths = array("I")
+        self._spill = open(spill_path, "ab") if spill_path else None
+
+    def __len__(self):
+        return len(self.view_counts)
+
+    def append(self, video):
+        """Reduce one collected video dict (fetch_video_details shape) into the columns."""
+        video_id = video["video_id"].encode("ascii")
+        if len(video_id) > ID_WIDTH:
+            raise ValueError(f"Video id longer than {ID_WIDTH} characters: {video['video_id']!r}")
+        self.video_ids += video_id.ljust(ID_WIDTH, b"\0")
+        self.titles.append(video["title"])
+        self.channel_codes.append(self.channels.setdefault(video.get("channel_id", ""), len(self.channels)))
+        self.view_counts.append(int(video["view_count"]))
+        self.like_counts.append(min(int(video["like_count"]), UINT32_MAX))
+        self.comment_counts.append(min(int(video["comment_count"]), UINT32_MAX))
+        self.duration_sec.append(parse_duration(video["duration"]))
+        self.published.append(_epoch_seconds(video["publishedAt"]))
+
+        description = video.get("description") or ""
+        self.desc_len.append(len(clean_text(description)))
+        self.desc_sentiment.append(get_sentiment(description) if self.score_descriptions else float("nan"))
+        if self.snippet_chars:
+            # Whitespace collapsed, so the snippet stays on one CSV line
+            self.snippets.append(" ".join(description[:self.snippet_chars].split()))
+        if self._spill:
+            encoded = description.encode("utf-8")
+            self.spill_offsets.append(self._spill.tell())
+            self.spill_lengths.append(len(encoded))
+            self._spill.write(encoded)
+
+    def extend(self, videos):
+        for video in videos:
+            self.append(video)
+        return self
+
+    def description(self, position):
+        """Full description of the video at `position`, read back from the spill file."""
+        if not self.spill_path:
+            raise ValueError("Descriptions were not spilled (no spill_path)")
+        self._spill.flush()
+        with open(self.spill_path, "rb") as f:
+            f.seek(self.spill_offsets[position])
+            return f.read(self.spill_lengths[position]).decode("utf-8")
+
+    def close(self):
+        if self._spill:
+            self._spill.close()
+            self._spill = None
+
+    def to_frame(self):
+        """raw_videos.csv columns with compact dtypes (durations as categorical ISO strings)."""
+        ids = np.frombuffer(bytes(self.video_ids), dtype=f"S{ID_WIDTH}")
+        seconds = np.frombuffer(self.duration_sec, dtype=np.uint32)
+        unique_seconds, duration_codes = np.unique(seconds, return_inverse=True)
+        frame = {
+            "video_id": ids.astype(str),
+            "title": self.titles,
+            "channel_id": pd.Categorical.from_codes(np.frombuffer(self.channel_codes, dtype=np.int32), list(self.channels)),
+            "publishedAt": pd.to_datetime(np.frombuffer(self.published, dtype=np.int64), unit="s", utc=True),
+            "duration": pd.Categorical.from_codes(duration_codes, [format_duration(s) for s in unique_seconds]),
+            "duration_sec": seconds,
+            "view_count": np.frombuffer(self.view_counts, dtype=np.int64),
+            "like_count": np.frombuffer(self.like_counts, dtype=np.uint32),
+            "comment_count": np.frombuffer(self.comment_counts, dtype=np.uint32),
+            "desc_len": np.frombuffer(self.desc_len, dtype=np.uint32),
+            "desc_sentiment": np.frombuffer(self.desc_sentiment, dtype=np.float32),
+        }
+        if self.snippet_chars:
+            frame["description"] = self.snippets
+        return pd.DataFrame(frame)
+
+
+# --- Benchmark: memory per 100k videos, list of dicts vs columnar buffer ---
+
+def _crawl(videos, seed=5):
+    """Batches of 50 video dicts as fetch_video_details returns them, with ~2% as many channels as videos."""
+    import bench_fixtures
+
+    rng = random.Random(seed)
+    channels = [f"UC{rng.getrandbits(120):030x}"[:24] for _ in range(max(1, videos // 50))]
+    for start in range(0, videos, 50):
+        batch = []
+        for index in range(start, min(start + 50, videos)):
+            video = bench_fixtures.make_video(rng, index)
+            video["channel_id"] = rng.choice(channels)
+            batch.append(video)
+        yield batch
+
+
+def _measure(build):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current / 2 ** 20, peak / 2 ** 20, elapsed
+
+
+def run_benchmark(videos=100000, score_descriptions=False, spill=False):
+    import tempfile
+
+    per_100k = 100000 / videos
+
+    def dict_path():
+        rows = []
+        for batch in _crawl(videos):
+            rows.extend(batch)
+        return rows, pd.DataFrame(rows)
+
+    (rows, dict_frame), dict_mb, dict_peak_mb, dict_s = _measure(dict_path)
+    dict_frame_mb = dict_frame.memory_usage(deep=True).sum() / 2 ** 20
+    del rows, dict_frame
+
+    with tempfile.TemporaryDirectory() as scratch:
+        spill_path = os.path.join(scratch, "descriptions.bin") if spill else None
+
+        def buffer_path():
+            buffer = VideoBuffer(spill_path, score_descriptions=score_descriptions)
+            for batch in _crawl(videos):
+                buffer.extend(batch)
+            return buffer, buffer.to_frame()
+
+        (buffer, buffer_frame), buffer_mb, buffer_peak_mb, buffer_s = _measure(buffer_path)
+        buffer_frame_mb = buffer_frame.memory_usage(deep=True).sum() / 2 ** 20
+        spill_mb = os.path.getsize(spill_path) / 2 ** 20 if spill else 0.0
+        buffer.close()
+
+    summary = {
+        "videos": videos,
+        "score_descriptions": score_descriptions,
+        "snippet_chars": DESCRIPTION_SNIPPET_CHARS,
+        # Resident after collection: the dict list plus its DataFrame, vs. the buffer plus its DataFrame
+        "dicts_retained_mb_per_100k": round(dict_mb * per_100k, 1),
+        "dicts_peak_mb_per_100k": round(dict_peak_mb * per_100k, 1),
+        "dicts_frame_mb_per_100k": round(dict_frame_mb * per_100k, 1),
+        "buffer_retained_mb_per_100k": round(buffer_mb * per_100k, 1),
+        "buffer_peak_mb_per_100k": round(buffer_peak_mb * per_100k, 1),
+        "buffer_frame_mb_per_100k": round(buffer_frame_mb * per_100k, 1),
+        "spilled_mb_per_100k": round(spill_mb * per_100k, 1),
+        "frame_reduction": round(1 - buffer_frame_mb / dict_frame_mb, 3),
+        "peak_reduction": round(1 - buffer_peak_mb / dict_peak_mb, 3),
+        "dicts_s": round(dict_s, 2),
+        "buffer_s": round(buffer_s, 2),
+    }
+    print(json.dumps(summary))
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    sub = parser.add_subparsers(dest="command", required=True)
+    bench = sub.add_parser("bench", help="Memory per 100k videos: list of dicts vs columnar buffer")
+    bench.add_argument("--videos", type=int, default=100000)
+    bench.add_argument("--score-descriptions", action="store_true",
+                       help="Run description sentiment at ingestion (~2.5ms per video with TextBlob)")
+    bench.add_argument("--spill", action="store_true", help="Also spill full descriptions to disk")
+    args = parser.parse_args()
+
+    if args.command == "bench":
+        run_benchmark(args.videos, args.score_descriptions, args.spill)
+
+
+if __name__ == "__main__":
+    main()
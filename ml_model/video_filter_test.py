@@ -9,7 +9,7 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from collect_data_modified import parse_duration, is_valid_tutorial_video
+from video_filters import parse_duration, is_valid_tutorial_video
 
 def test_duration_parsing():
     """Test duration parsing function with various YouTube duration formats."""
@@ -0,0 +1,93 @@
+"""
+Duration / quality predicates applied to collected videos right after the metadata
+fetch, before any per-video comment or sentiment work is spent on them.
+
+Thresholds can be overridden from the environment:
+    VIDEO_MIN_DURATION_MINUTES  (default 120)
+    VIDEO_MIN_VIEWS             (default 1000)
+    VIDEO_MIN_SHORT_SECONDS     (default 60, videos shorter than this are treated as Shorts)
+    VIDEO_FALLBACK_COUNT        (default 3, longest videos kept when nothing passes)
+"""
+
+import os
+import re
+
+MIN_DURATION_MINUTES = float(os.getenv("VIDEO_MIN_DURATION_MINUTES", 120))
+MIN_VIEWS = int(os.getenv("VIDEO_MIN_VIEWS", 1000))
+SHORT_VIDEO_SECONDS = int(os.getenv("VIDEO_MIN_SHORT_SECONDS", 60))
+FALLBACK_COUNT = int(os.getenv("VIDEO_FALLBACK_COUNT", 3))
+
+
+def parse_duration(duration_str):
+    """Parse an ISO 8601 YouTube duration (e.g. PT2H30M15S) into seconds"""
+    if not duration_str or duration_str == 'PT0S':
+        return 0
+
+    match = re.match(r'P(?:(\d+)D)?T?(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?$', duration_str)
+    if not match:
+        return 0
+
+    days, hours, minutes, seconds = (int(part) if part else 0 for part in match.groups())
+    return days * 86400 + hours * 3600 + minutes * 60 + seconds
+
+
+def format_duration(seconds):
+    """Seconds back to an ISO 8601 duration (e.g. 9015 -> PT2H30M15S)"""
+    hours, rest = divmod(int(seconds), 3600)
+    minutes, secs = divmod(rest, 60)
+    parts = (f"{hours}H" if hours else "") + (f"{minutes}M" if minutes else "") + (f"{secs}S" if secs else "")
+    return "PT" + (parts or "0S")
+
+
+def is_valid_tutorial_video(video, min_duration_minutes=None, min_views=None, short_video_seconds=None):
+    """
+    Check a collected video against the duration, Shorts and view-count predicates.
+    Returns (is_valid, reason).
+    """
+    min_duration_minutes = MIN_DURATION_MINUTES if min_duration_minutes is None else min_duration_minutes
+    min_views = MIN_VIEWS if min_views is None else min_views
+    short_video_seconds = SHORT_VIDEO_SECONDS if short_video_seconds is None else short_video_seconds
+
+    duration_sec = parse_duration(video.get("duration", ""))
+    title = video.get("title", "").lower()
+
+    if duration_sec < short_video_seconds or "#shorts" in title:
+        return False, f"YouTube Short ({duration_sec}s)"
+    if duration_sec < min_duration_minutes * 60:
+        return False, f"Too short ({duration_sec / 60:.1f}min < {min_duration_minutes}min)"
+    if video.get("view_count", 0) < min_views:
+        return False, f"Too few views ({video.get('view_count', 0):,} < {min_views:,})"
+    return True, f"Valid tutorial ({duration_sec / 60:.1f}min, {video.get('view_count', 0):,} views)"
+
+
+def filter_videos(videos, min_duration_minutes=None, min_views=None, short_video_seconds=None, fallback_count=None):
+    """
+    Apply the predicates to a list of video dicts.
+    If nothing passes, fall back to the `fallback_count` longest videos (the ranking step used to decide this).
+    Returns (kept_videos, stats).
+    """
+    fallback_count = FALLBACK_COUNT if fallback_count is None else fallback_count
+
+    kept = []
+    reasons = {}
+    for video in videos:
+        is_valid, reason = is_valid_tutorial_video(video, min_duration_minutes, min_views, short_video_seconds)
+        if is_valid:
+            kept.append(video)
+        else:
+            category = reason.split(" (")[0]
+            reasons[category] = reasons.get(category, 0) + 1
+
+    fallback = False
+    if not kept and videos:
+        fallback = True
+        kept = sorted(videos, key=lambda v: parse_duration(v.get("duration", "")), reverse=True)[:fallback_count]
+
+    stats = {
+        "fetched": len(videos),
+        "kept": len(kept),
+        "dropped": len(videos) - len(kept),
+        "fallback": fallback,
+        "reasons": reasons,
+    }
+    return kept, stats
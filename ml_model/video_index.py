@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+
+"""
+Local BM25 index over every video the collectors have seen, so repeat topics
+can be answered without a 100-unit search().list call.
+
+Stored in a single SQLite file (VIDEO_INDEX_PATH, default video_index.sqlite):
+    docs      one row per video (metadata + token count)
+    postings  one row per (term, segment) with packed doc id / term frequency arrays
+
+Each add_videos() call writes a new segment, so incremental updates never
+rewrite existing postings; optimize() merges a term's segments into one.
+
+Usage:
+    python video_index.py build raw_videos.csv [more.csv ...]
+    python video_index.py query "python programming" [--top 10]
+    python video_index.py optimize
+    python video_index.py bench --docs 100000 1000000
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import time
+from array import array
+from collections import Counter, defaultdict
+
+import numpy as np
+
+from features import clean_text
+
+INDEX_PATH = os.getenv("VIDEO_INDEX_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "video_index.sqlite"))
+# Local hits (after video_filters) needed before the live search is skipped
+MIN_LOCAL_RESULTS = int(os.getenv("VIDEO_INDEX_MIN_RESULTS", 10))
+# Share of the query terms a hit must contain to count towards MIN_LOCAL_RESULTS
+# (1.0: all of them, so "python programming" is not answered by JavaScript videos)
+MIN_TERM_COVERAGE = float(os.getenv("VIDEO_INDEX_MIN_COVERAGE", 1.0))
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "is", "it",
+    "of", "on", "or", "that", "the", "this", "to", "with", "you", "your", "how", "what",
+    "https", "http", "www", "com",
+}
+
+VIDEO_COLUMNS = ["video_id", "title", "description", "publishedAt", "duration",
+                 "view_count", "like_count", "comment_count"]
+
+
+def tokenize(text):
+    return [token for token in clean_text(text).split() if token not in STOPWORDS and len(token) > 1]
+
+
+class VideoIndex:
+    def __init__(self, path=None):
+        self.path = path or INDEX_PATH
+        self.conn = sqlite3.connect(self.path)
+        self.conn.executescript("""
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+            CREATE TABLE IF NOT EXISTS docs (
+                doc_id INTEGER PRIMARY KEY,
+                video_id TEXT UNIQUE NOT NULL,
+                title TEXT, description TEXT, publishedAt TEXT, duration TEXT,
+                view_count INTEGER, like_count INTEGER, comment_count INTEGER,
+                length INTEGER NOT NULL,
+                indexed_at REAL
+            );
+            CREATE TABLE IF NOT EXISTS postings (
+                term TEXT NOT NULL,
+                segment INTEGER NOT NULL,
+                doc_ids BLOB NOT NULL,
+                tfs BLOB NOT NULL,
+                PRIMARY KEY (term, segment)
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER);
+        """)
+        self._lengths = None
+
+    def close(self):
+        self.conn.close()
+
+    def _meta(self, key, default=0):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def _set_meta(self, key, value):
+        self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    @property
+    def doc_count(self):
+        return self._meta("doc_count")
+
+    def add_videos(self, videos):
+        """
+        Index new videos (dicts with raw_videos.csv columns). Videos already in the
+        index only get their statistics refreshed. Returns the number of new documents.
+        """
+        segment_postings = defaultdict(lambda: (array("I"), array("H")))
+        added = 0
+        total_length = 0
+        now = time.time()
+
+        with self.conn:
+            for video in videos:
+                row = [video.get(column) for column in VIDEO_COLUMNS]
+                existing = self.conn.execute("SELECT doc_id FROM docs WHERE video_id = ?", (row[0],)).fetchone()
+                if existing:
+                    self.conn.execute(
+                        "UPDATE docs SET view_count = ?, like_count = ?, comment_count = ? WHERE doc_id = ?",
+                        (row[5], row[6], row[7], existing[0])
+                    )
+                    continue
+
+                tokens = tokenize(f"{video.get('title', '')} {video.get('description', '')}")
+                cursor = self.conn.execute(
+                    f"INSERT INTO docs ({', '.join(VIDEO_COLUMNS)}, length, indexed_at) VALUES ({', '.join('?' * (len(VIDEO_COLUMNS) + 2))})",
+                    (*row, len(tokens), now)
+                )
+                doc_id = cursor.lastrowid
+                for term, tf in Counter(tokens).items():
+                    doc_ids, tfs = segment_postings[term]
+                    doc_ids.append(doc_id)
+                    tfs.append(min(tf, 65535))
+                added += 1
+                total_length += len(tokens)
+
+            if added:
+                segment = self._meta("next_segment")
+                self.conn.executemany(
+                    "INSERT INTO postings (term, segment, doc_ids, tfs) VALUES (?, ?, ?, ?)",
+                    ((term, segment, doc_ids.tobytes(), tfs.tobytes()) for term, (doc_ids, tfs) in segment_postings.items())
+                )
+                self._set_meta("next_segment", segment + 1)
+                self._set_meta("doc_count", self.doc_count + added)
+                self._set_meta("total_length", self._meta("total_length") + total_length)
+
+        self._lengths = None
+        return added
+
+    def optimize(self):
+        """Merge each term's segments into a single postings row."""
+        with self.conn:
+            terms = [row[0] for row in self.conn.execute(
+                "SELECT term FROM postings GROUP BY term HAVING COUNT(*) > 1"
+            )]
+            for term in terms:
+                doc_ids, tfs = self._postings(term)
+                self.conn.execute("DELETE FROM postings WHERE term = ?", (term,))
+                self.conn.execute(
+                    "INSERT INTO postings (term, segment, doc_ids, tfs) VALUES (?, 0, ?, ?)",
+                    (term, doc_ids.astype(np.uint32).tobytes(), tfs.astype(np.uint16).tobytes())
+                )
+        self.conn.execute("VACUUM")
+        return len(terms)
+
+    def _postings(self, term):
+        rows = self.conn.execute("SELECT doc_ids, tfs FROM postings WHERE term = ? ORDER BY segment", (term,)).fetchall()
+        if not rows:
+            return np.empty(0, dtype=np.uint32), np.empty(0, dtype=np.uint16)
+        doc_ids = np.concatenate([np.frombuffer(row[0], dtype=np.uint32) for row in rows])
+        tfs = np.concatenate([np.frombuffer(row[1], dtype=np.uint16) for row in rows])
+        return doc_ids, tfs
+
+    def _doc_lengths(self):
+        # Loaded once per process (and after updates); doc ids are dense rowids so this is a flat array
+        if self._lengths is None:
+            max_id = self.conn.execute("SELECT COALESCE(MAX(doc_id), 0) FROM docs").fetchone()[0]
+            lengths = np.zeros(max_id + 1, dtype=np.float32)
+            for doc_id, length in self.conn.execute("SELECT doc_id, length FROM docs"):
+                lengths[doc_id] = length
+            self._lengths = lengths
+        return self._lengths
+
+    def search(self, query, top_k=50, min_coverage=0.0):
+        """
+        Return [(score, video_dict), ...] ranked by BM25 over title + description,
+        keeping only videos that contain at least `min_coverage` of the query terms.
+        """
+        terms = set(tokenize(query))
+        n_docs = self.doc_count
+        if not terms or not n_docs:
+            return []
+
+        lengths = self._doc_lengths()
+        avg_length = max(self._meta("total_length") / n_docs, 1.0)
+        scores = np.zeros(len(lengths), dtype=np.float32)
+        matched = np.zeros(len(lengths), dtype=np.uint16)
+
+        for term in terms:
+            doc_ids, tfs = self._postings(term)
+            if not len(doc_ids):
+                continue
+            idf = np.log(1 + (n_docs - len(doc_ids) + 0.5) / (len(doc_ids) + 0.5))
+            tf = tfs.astype(np.float32)
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths[doc_ids] / avg_length)
+            scores[doc_ids] += idf * tf * (BM25_K1 + 1) / (tf + norm)
+            matched[doc_ids] += 1
+
+        candidates = np.flatnonzero(matched >= max(1, min_coverage * len(terms)))
+        if not len(candidates):
+            return []
+        if len(candidates) > top_k:
+            candidates = candidates[np.argpartition(scores[candidates], -top_k)[-top_k:]]
+        ranked = sorted(candidates.tolist(), key=lambda doc_id: scores[doc_id], reverse=True)
+
+        rows = {}
+        placeholders = ", ".join("?" * len(ranked))
+        for row in self.conn.execute(f"SELECT doc_id, {', '.join(VIDEO_COLUMNS)} FROM docs WHERE doc_id IN ({placeholders})", ranked):
+            rows[row[0]] = dict(zip(VIDEO_COLUMNS, row[1:]))
+        return [(float(scores[doc_id]), rows[doc_id]) for doc_id in ranked if doc_id in rows]
+
+
+def build_from_csv(index, paths):
+    import pandas as pd
+
+    added = 0
+    for path in paths:
+        df = pd.read_csv(path)
+        df = df.where(pd.notna(df), None)
+        added += index.add_videos(df.to_dict("records"))
+    return added
+
+
+# --- Benchmark ---
+
+def synthetic_docs(count, seed=0, vocab_size=50000):
+    """Zipf-distributed titles/descriptions so postings lengths look like real text."""
+    rng = np.random.default_rng(seed)
+    topic_words = ["python", "javascript", "react", "django", "docker", "kubernetes", "machine",
+                   "learning", "data", "science", "web", "development", "sql", "aws", "linux", "git"]
+    for i in range(count):
+        words = [f"w{rank}" for rank in np.minimum(rng.zipf(1.3, rng.integers(30, 80)), vocab_size)]
+        topic = rng.choice(topic_words, 2).tolist()
+        yield {
+            "video_id": f"s{seed}_{i:09d}", "title": " ".join(topic + ["tutorial"] + words[:6]),
+            "description": " ".join(words), "publishedAt": "2024-01-01T00:00:00Z", "duration": "PT2H10M",
+            "view_count": int(rng.integers(100, 10**6)), "like_count": 0, "comment_count": 0,
+        }
+
+
+def run_benchmark(sizes, queries=200, batch=10000):
+    import tempfile
+
+    results = []
+    query_rng = np.random.default_rng(1)
+    topic_queries = ["python programming", "javascript react development", "machine learning data science",
+                     "docker kubernetes devops", "sql database tutorial", "web development course"]
+
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            index = VideoIndex(os.path.join(tmp, "bench.sqlite"))
+            docs = synthetic_docs(size)
+            start = time.perf_counter()
+            while index.doc_count < size:
+                chunk = [doc for _, doc in zip(range(min(batch, size - index.doc_count)), docs)]
+                index.add_videos(chunk)
+            build_s = time.perf_counter() - start
+
+            start = time.perf_counter()
+            index.optimize()
+            optimize_s = time.perf_counter() - start
+
+            index.search("warmup")
+            latencies = []
+            for i in range(queries):
+                query = topic_queries[i % len(topic_queries)] + f" w{int(query_rng.zipf(1.3)) % 1000}"
+                start = time.perf_counter()
+                index.search(query, top_k=50)
+                latencies.append((time.perf_counter() - start) * 1000)
+
+            start = time.perf_counter()
+            index.add_videos(list(synthetic_docs(1000, seed=99)))
+            incremental_ms = (time.perf_counter() - start) * 1000
+
+            latencies.sort()
+            results.append({
+                "docs": size,
+                "build_s": round(build_s, 2),
+                "optimize_s": round(optimize_s, 2),
+                "index_mb": round(os.path.getsize(index.path) / 2**20, 1),
+                "query_p50_ms": round(latencies[len(latencies) // 2], 2),
+                "query_p95_ms": round(latencies[int(len(latencies) * 0.95)], 2),
+                "query_max_ms": round(latencies[-1], 2),
+                "incremental_add_1k_ms": round(incremental_ms, 1),
+            })
+            index.close()
+            print(json.dumps(results[-1]), flush=True)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="Add videos from raw_videos.csv-style files")
+    build.add_argument("csv", nargs="+")
+    query = sub.add_parser("query", help="Run a local topic lookup")
+    query.add_argument("text")
+    query.add_argument("--top", type=int, default=10)
+    query.add_argument("--min-coverage", type=float, default=MIN_TERM_COVERAGE,
+                       help="Share of query terms a hit must contain")
+    sub.add_parser("optimize", help="Merge postings segments")
+    bench = sub.add_parser("bench", help="Query latency at synthetic corpus sizes")
+    bench.add_argument("--docs", type=int, nargs="+", default=[100000, 1000000])
+    bench.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--index", default=None, help="Index file (default: VIDEO_INDEX_PATH)")
+    args = parser.parse_args()
+
+    if args.command == "bench":
+        run_benchmark(args.docs, args.queries)
+        return
+
+    index = VideoIndex(args.index)
+    if args.command == "build":
+        added = build_from_csv(index, args.csv)
+        print(f"Indexed {added} new videos ({index.doc_count} total) in {index.path}")
+    elif args.command == "optimize":
+        print(f"Merged segments for {index.optimize()} terms")
+    elif args.command == "query":
+        start = time.perf_counter()
+        hits = index.search(args.text, top_k=args.top, min_coverage=args.min_coverage)
+        elapsed = (time.perf_counter() - start) * 1000
+        for score, video in hits:
+            print(f"{score:6.2f}  {video['video_id']}  {video['duration']:>10}  {video['title'][:70]}")
+        print(f"{len(hits)} hits in {elapsed:.1f} ms from {index.doc_count} indexed videos")
+    index.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+
+"""
+Video Index Test Utility
+Check that the local index only answers a topic when its hits actually cover the
+query, so topics sharing a single word with indexed videos still use the live search.
+"""
+
+import os
+import sys
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from bench_fixtures import FakeYouTube
+from collect_data_for_ml import lookup_local_videos
+from video_index import MIN_LOCAL_RESULTS, VideoIndex
+
+
+class CountingYouTube(FakeYouTube):
+    """FakeYouTube that counts videos().list calls (the refresh lookup_local_videos makes)."""
+
+    def __init__(self):
+        super().__init__()
+        self.video_calls = 0
+
+    def videos(self):
+        self.video_calls += 1
+        return super().videos()
+
+
+def make_videos(topic, count):
+    return [{
+        "video_id": f"{topic.split()[0][:4]}{i:07d}", "title": f"{topic} Full Course part {i}",
+        "description": f"Learn {topic} from scratch", "publishedAt": "2024-01-01T00:00:00Z",
+        "duration": "PT2H10M", "view_count": 50000, "like_count": 900, "comment_count": 40,
+    } for i in range(count)]
+
+
+def with_index(run):
+    with tempfile.TemporaryDirectory() as tmp:
+        index = VideoIndex(os.path.join(tmp, "index.sqlite"))
+        try:
+            return run(index)
+        finally:
+            index.close()
+
+
+def test_shared_term_is_not_a_hit():
+    """12 JavaScript Programming videos must not answer "python programming"."""
+    print("🧪 Testing topics that share one term")
+
+    def run(index):
+        index.add_videos(make_videos("JavaScript Programming", MIN_LOCAL_RESULTS + 2))
+        assert len(index.search("python programming")) == MIN_LOCAL_RESULTS + 2
+        assert index.search("python programming", min_coverage=1.0) == []
+        youtube = CountingYouTube()
+        assert lookup_local_videos(index, youtube, "python programming", 50, apply_filters=False) is None
+        assert youtube.video_calls == 0
+        print(f"✅ 'python programming' falls back to live search ({index.doc_count} JavaScript videos indexed)")
+
+    with_index(run)
+    print()
+
+
+def test_covered_topic_is_a_hit():
+    """The same index answers its own topic once both topics are indexed."""
+    print("🧪 Testing a fully covered topic")
+
+    def run(index):
+        index.add_videos(make_videos("JavaScript Programming", MIN_LOCAL_RESULTS + 2))
+        index.add_videos(make_videos("Python Programming", MIN_LOCAL_RESULTS + 2))
+        youtube = CountingYouTube()
+        videos = lookup_local_videos(index, youtube, "python programming", 50, apply_filters=False)
+        assert videos is not None and len(videos) == MIN_LOCAL_RESULTS + 2, videos
+        assert all(video["video_id"].startswith("Pyth") for video in videos)
+        assert youtube.video_calls == 1
+        print(f"✅ 'python programming' answered locally with {len(videos)} videos, 1 videos.list call")
+
+    with_index(run)
+    print()
+
+
+if __name__ == "__main__":
+    print("🗂️ Video Index Test Suite")
+    print("=" * 70)
+    print()
+
+    test_shared_term_is_not_a_hit()
+    test_covered_topic_is_a_hit()
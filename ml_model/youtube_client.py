@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+
+"""
+YouTube Data API client factory with offline transports.
+
+Every pipeline module builds its client through build_youtube(), so the API can
+be swapped out with environment variables alone (child processes inherit them):
+
+    YOUTUBE_API_MODE        live (default) | fake | record | replay
+    YOUTUBE_API_FIXTURES    directory for recorded responses (record / replay)
+    YOUTUBE_FAKE_SEED       seed for synthetic responses (default 42)
+    YOUTUBE_FAKE_LATENCY    per-call latency in ms, "80", with optional jitter "80:0.6"
+                            (sigma of a lognormal spread around the 80ms median)
+    YOUTUBE_FAKE_ERROR_RATE fraction of calls failing with 503 backendError (default 0)
+    YOUTUBE_FAKE_QUOTA      quota units per process before 403 quotaExceeded
+                            (search costs 100, videos/commentThreads cost 1)
+    YOUTUBE_FAKE_RESULTS    total search results per query across pages (default 500)
+    YOUTUBE_FAKE_COMMENTS   comment threads available per video (default 20)
+
+fake   serves synthetic search / videos / commentThreads responses (bench_fixtures.FakeYouTube)
+record proxies to the live API and saves every response under YOUTUBE_API_FIXTURES
+replay serves those saved responses; unrecorded requests get a 404
+
+Latency, error and quota injection apply to fake and replay.
+
+Usage:
+    YOUTUBE_API_MODE=fake YOUTUBE_FAKE_LATENCY=80:0.6 python youtube_client.py smoke "react"
+"""
+
+import abc
+import hashlib
+import json
+import os
+import random
+import sys
+import threading
+import time
+from urllib.parse import parse_qs, urlencode, urlparse
+
+PLACEHOLDER_KEY = 'your_youtube_api_key_here'
+QUOTA_COSTS = {"search": 100, "videos": 1, "commentThreads": 1}
+
+
+_dotenv_loaded = False
+
+
+def youtube_api_key():
+    """YOUTUBE_API_KEY, reading .env on first use rather than at import."""
+    global _dotenv_loaded
+    if not _dotenv_loaded:
+        from dotenv import load_dotenv
+        load_dotenv()
+        _dotenv_loaded = True
+    return os.getenv("YOUTUBE_API_KEY")
+
+
+def api_mode():
+    return os.getenv("YOUTUBE_API_MODE", "live").lower()
+
+
+def youtube_configured(api_key=None):
+    """Whether a client can be built: always offline, otherwise only with a real key."""
+    api_key = api_key or youtube_api_key()
+    return api_mode() != "live" or bool(api_key and api_key != PLACEHOLDER_KEY)
+
+
+def build_youtube(api_key=None):
+    """Build a YouTube v3 client for the configured mode."""
+    import googleapiclient.discovery
+
+    api_key = api_key or youtube_api_key()
+    mode = api_mode()
+    if mode == "live":
+        return googleapiclient.discovery.build("youtube", "v3", developerKey=api_key)
+
+    fixtures = os.getenv("YOUTUBE_API_FIXTURES", os.path.join(os.path.dirname(os.path.abspath(__file__)), "api_fixtures"))
+    if mode == "fake":
+        http = FakeYouTubeHttp()
+    elif mode == "record":
+        import httplib2
+        http = RecordingHttp(httplib2.Http(), fixtures)
+    elif mode == "replay":
+        http = ReplayHttp(fixtures)
+    else:
+        raise ValueError(f"Unknown YOUTUBE_API_MODE: {mode}")
+    return googleapiclient.discovery.build(
+        "youtube", "v3", developerKey=api_key or "offline", http=http, static_discovery=True
+    )
+
+
+def parse_latency(spec):
+    """Turn "MS" or "MS:JITTER" into a sampler returning seconds (JITTER: lognormal sigma, default 0)."""
+    if not spec:
+        return lambda rng: 0.0
+    ms, _, jitter = spec.partition(":")
+    seconds, jitter = float(ms) / 1000, float(jitter or 0)
+    if not jitter:
+        return lambda rng: seconds
+    return lambda rng: seconds * rng.lognormvariate(0, jitter)
+
+
+def _response(status, payload):
+    import httplib2
+
+    content = payload if isinstance(payload, bytes) else json.dumps(payload).encode("utf-8")
+    return httplib2.Response({"status": str(status), "content-type": "application/json; charset=UTF-8"}), content
+
+
+def _error(status, reason, message):
+    return _response(status, {"error": {"code": status, "message": message,
+                                        "errors": [{"reason": reason, "domain": "youtube", "message": message}]}})
+
+
+def _endpoint(uri):
+    parsed = urlparse(uri)
+    params = {k: v[0] for k, v in parse_qs(parsed.query).items() if k not in ("key", "alt")}
+    return parsed.path.rstrip("/").rsplit("/", 1)[-1], params
+
+
+def request_key(method, uri):
+    """Stable fixture name for a request, ignoring the API key."""
+    endpoint, params = _endpoint(uri)
+    canonical = f"{method} {endpoint}?{urlencode(sorted(params.items()))}"
+    return f"{endpoint}-{hashlib.sha1(canonical.encode()).hexdigest()[:16]}"
+
+
+class _InjectingHttp(abc.ABC):
+    """httplib2.Http-compatible base adding latency, error and quota injection."""
+
+    def __init__(self):
+        self.rng = random.Random(int(os.getenv("YOUTUBE_FAKE_SEED", 42)))
+        self.latency = parse_latency(os.getenv("YOUTUBE_FAKE_LATENCY", ""))
+        self.error_rate = float(os.getenv("YOUTUBE_FAKE_ERROR_RATE", 0))
+        quota = os.getenv("YOUTUBE_FAKE_QUOTA")
+        self.quota_left = int(quota) if quota else None
+        self.lock = threading.Lock()
+        self.latencies = []
+        self.calls = {}
+
+    def request(self, uri, method="GET", body=None, headers=None, **kwargs):
+        endpoint, params = _endpoint(uri)
+        with self.lock:
+            delay = self.latency(self.rng)
+            failed = self.rng.random() < self.error_rate
+            self.calls[endpoint] = self.calls.get(endpoint, 0) + 1
+            over_quota = False
+            if self.quota_left is not None:
+                self.quota_left -= QUOTA_COSTS.get(endpoint, 1)
+                over_quota = self.quota_left < 0
+        time.sleep(delay)
+        with self.lock:
+            self.latencies.append(delay)
+
+        if over_quota:
+            return _error(403, "quotaExceeded", "The request cannot be completed because you have exceeded your quota.")
+        if failed:
+            return _error(503, "backendError", "Backend Error")
+        return self.serve(method, uri, endpoint, params)
+
+    @abc.abstractmethod
+    def serve(self, method, uri, endpoint, params):
+        """Return the (response, content) pair for a request that got past injection."""
+
+
+class FakeYouTubeHttp(_InjectingHttp):
+    def __init__(self):
+        super().__init__()
+        from bench_fixtures import FakeYouTube
+
+        self.api = FakeYouTube(seed=int(os.getenv("YOUTUBE_FAKE_SEED", 42)),
+                               comments_per_video=int(os.getenv("YOUTUBE_FAKE_COMMENTS", 20)),
+                               max_search_results=int(os.getenv("YOUTUBE_FAKE_RESULTS", 500)))
+        self.handlers = {"search": self.api._search, "videos": self.api._videos_list,
+                         "commentThreads": self.api._comment_threads}
+
+    def serve(self, method, uri, endpoint, params):
+        handler = self.handlers.get(endpoint)
+        if handler is None:
+            return _error(404, "notFound", f"Endpoint {endpoint} is not simulated")
+        return _response(200, handler(**params))
+
+
+class ReplayHttp(_InjectingHttp):
+    def __init__(self, fixtures_dir):
+        super().__init__()
+        self.fixtures_dir = fixtures_dir
+
+    def serve(self, method, uri, endpoint, params):
+        path = os.path.join(self.fixtures_dir, request_key(method, uri) + ".json")
+        if not os.path.exists(path):
+            return _error(404, "notRecorded", f"No recorded response for {endpoint} {params}")
+        with open(path, encoding="utf-8") as f:
+            recorded = json.load(f)
+        return _response(recorded["status"], json.dumps(recorded["body"]).encode("utf-8"))
+
+
+class RecordingHttp:
+    """Pass-through to a real transport that saves each response for ReplayHttp."""
+
+    def __init__(self, inner, fixtures_dir):
+        self.inner = inner
+        self.fixtures_dir = fixtures_dir
+        os.makedirs(fixtures_dir, exist_ok=True)
+
+    def request(self, uri, method="GET", body=None, headers=None, **kwargs):
+        response, content = self.inner.request(uri, method=method, body=body, headers=headers, **kwargs)
+        try:
+            body_json = json.loads(content)
+        except ValueError:
+            return response, content
+        path = os.path.join(self.fixtures_dir, request_key(method, uri) + ".json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"status": response.status, "body": body_json}, f)
+        return response, content
+
+
+def smoke(query, max_results=50):
+    """Run collection + comment sentiment against the configured transport and report call latencies."""
+    import contextlib
+    import io
+
+    from collect_data_for_ml import fetch_videos_for_ml
+    from features import create_features
+
+    youtube = build_youtube()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        df = fetch_videos_for_ml(query, max_results, youtube=youtube, use_index=False, dedupe=False)
+        if len(df):
+            create_features(df, youtube=youtube)
+    elapsed = time.perf_counter() - start
+
+    http = youtube._http
+    latencies = sorted(getattr(http, "latencies", []))
+    pick = lambda q: round(latencies[min(len(latencies) - 1, int(len(latencies) * q))] * 1000, 1) if latencies else None
+    print(json.dumps({
+        "mode": api_mode(),
+        "videos": len(df),
+        "elapsed_s": round(elapsed, 3),
+        "calls": getattr(http, "calls", None),
+        "calls_per_s": round(len(latencies) / elapsed, 1) if elapsed else None,
+        "latency_p50_ms": pick(0.5), "latency_p95_ms": pick(0.95), "latency_p99_ms": pick(0.99),
+    }))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "smoke":
+        smoke(sys.argv[2] if len(sys.argv) > 2 else "programming", int(sys.argv[3]) if len(sys.argv) > 3 else 50)
+    else:
+        print(__doc__)
@@ -22,7 +22,7 @@ try {
   console.log('⚠️ PDF parsing not available - resume upload will be disabled');
   console.log('Error:', error.message);
 }
-import { extractMainTopic, getVideoRecommendations, createModifiedPythonScripts, runPythonScript, ML_MODEL_DIR } from './mlService.js';
+import { extractMainTopic, getVideoRecommendations, createModifiedPythonScripts, runPythonScript, startTopicPrewarmer, ML_MODEL_DIR } from './mlService.js';
 
 // In-memory cache for video recommendations (topic -> {videos, timestamp})
 const videoCache = new Map();
@@ -2562,4 +2562,6 @@ app.listen(PORT, '127.0.0.1', () => {
   console.log('🔑 Mistral API configured:', mistralConfigured);
   console.log('🌐 CORS enabled for production');
   console.log('🏠 Root endpoint: http://localhost:' + PORT + '/');
+  const prewarmer = startTopicPrewarmer();
+  console.log('🔥 Topic pre-warmer running:', !!prewarmer);
 });
\ No newline at end of file
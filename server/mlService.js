@@ -8,6 +8,32 @@ dotenv.config();
 export const ML_MODEL_DIR = path.join(process.cwd(), 'ml_model');
 const YOUTUBE_API_KEY = process.env.YOUTUBE_API_KEY;
 
+// Offline API modes (fake / record / replay, see ml_model/youtube_client.py) need no key
+function youtubeConfigured() {
+  const mode = (process.env.YOUTUBE_API_MODE || 'live').toLowerCase();
+  return mode !== 'live' || (YOUTUBE_API_KEY && YOUTUBE_API_KEY !== 'your_youtube_api_key_here');
+}
+
+// Handle specific cases; the mapped topics are also the pre-warmer's default hot topics
+const topicMappings = {
+  'web development': 'web development',
+  'web dev': 'web development',
+  'frontend development': 'frontend development',
+  'backend development': 'backend development',
+  'full stack development': 'full stack development',
+  'machine learning': 'machine learning',
+  'data science': 'data science',
+  'artificial intelligence': 'artificial intelligence',
+  'mobile development': 'mobile app development',
+  'android development': 'android development',
+  'ios development': 'ios development',
+  'react': 'react development',
+  'nodejs': 'node.js development',
+  'python': 'python programming',
+  'javascript': 'javascript programming',
+  'devops': 'devops engineering'
+};
+
 // Function to extract main topic from roadmap input
 export function extractMainTopic(userInput) {
   // Remove common prefixes and suffixes
@@ -17,26 +43,6 @@ export function extractMainTopic(userInput) {
     .replace(/\s+(roadmap|plan|guide|tutorial)$/i, '')
     .trim();
 
-  // Handle specific cases
-  const topicMappings = {
-    'web development': 'web development',
-    'web dev': 'web development',
-    'frontend development': 'frontend development',
-    'backend development': 'backend development',
-    'full stack development': 'full stack development',
-    'machine learning': 'machine learning',
-    'data science': 'data science',
-    'artificial intelligence': 'artificial intelligence',
-    'mobile development': 'mobile app development',
-    'android development': 'android development',
-    'ios development': 'ios development',
-    'react': 'react development',
-    'nodejs': 'node.js development',
-    'python': 'python programming',
-    'javascript': 'javascript programming',
-    'devops': 'devops engineering'
-  };
-
   // Check if the cleaned input matches any mapping
   for (const [key, value] of Object.entries(topicMappings)) {
     if (cleaned.includes(key)) {
@@ -95,7 +101,7 @@ export async function getVideoRecommendationsSimple(topic, maxVideos = 5, minDur
     console.log(`🎥 Fetching FILTERED videos for topic: ${topic}`);
     console.log(`📏 Filter: Min duration ${minDurationMinutes}min, Max results ${maxVideos}`);
 
-    if (!YOUTUBE_API_KEY || YOUTUBE_API_KEY === 'your_youtube_api_key_here') {
+    if (!youtubeConfigured()) {
       console.log('⚠️ YouTube API key not configured, using fallback recommendations');
       return getFallbackRecommendations(topic);
     }
@@ -190,14 +196,63 @@ export async function getVideoRecommendationsSimple(topic, maxVideos = 5, minDur
   }
 }
 
+// Ranked results shared with the pre-warming job (ml_model/topic_cache.py), keyed by topic,
+// maxVideos and minDurationMinutes; a lookup also counts the request towards the
+// pre-warmer's recent-topic frequencies
+function cacheArgs(maxVideos, minDurationMinutes) {
+  return ['--max-videos', String(maxVideos), '--min-duration', String(minDurationMinutes)];
+}
+
+async function getCachedRecommendations(topic, maxVideos, minDurationMinutes) {
+  try {
+    const output = await runPythonScript('topic_cache.py', ['get', topic, ...cacheArgs(maxVideos, minDurationMinutes)]);
+    const cached = JSON.parse(output.trim().split('\n').pop());
+    return cached.hit ? cached : null;
+  } catch (error) {
+    console.log('⚠️ Topic cache lookup failed:', error.message);
+    return null;
+  }
+}
+
+async function cacheRecommendations(topic, videos, maxVideos, minDurationMinutes) {
+  try {
+    await runPythonScript('topic_cache.py', ['put', topic, JSON.stringify(videos), ...cacheArgs(maxVideos, minDurationMinutes)]);
+  } catch (error) {
+    console.log('⚠️ Topic cache store failed:', error.message);
+  }
+}
+
+// Start the background pre-warming job (opt-in with ML_PREWARM=true, since it spends YouTube quota)
+export function startTopicPrewarmer() {
+  if ((process.env.ML_PREWARM || '').toLowerCase() !== 'true' || !youtubeConfigured()) {
+    return null;
+  }
+  const hotTopics = process.env.PREWARM_HOT_TOPICS || [...new Set(Object.values(topicMappings))].join(',');
+  const prewarmer = spawn('python', ['topic_cache.py', 'prewarm'], {
+    cwd: ML_MODEL_DIR,
+    env: { ...process.env, PREWARM_HOT_TOPICS: hotTopics },
+    stdio: ['ignore', 'inherit', 'inherit']
+  });
+  prewarmer.on('error', (err) => console.error('❌ Topic pre-warmer failed to start:', err.message));
+  prewarmer.on('exit', (code) => console.log(`Topic pre-warmer exited with code ${code}`));
+  process.on('exit', () => prewarmer.kill());
+  return prewarmer;
+}
+
 // Main ML pipeline function with consistent filtering
 export async function getVideoRecommendations(topic, maxVideos = 10, minDurationMinutes = 120) {
   try {
+    const cached = await getCachedRecommendations(topic, maxVideos, minDurationMinutes);
+    if (cached) {
+      console.log(`⚡ Topic cache hit for ${topic} (${Math.round(cached.age_s)}s old)`);
+      return cached.videos;
+    }
+
     console.log(`🔍 Starting FULL ML pipeline for topic: ${topic}`);
     console.log(`📏 Filtering: Min ${minDurationMinutes}min duration, Max ${maxVideos} results`);
 
     // Check if YouTube API key is configured
-    if (!YOUTUBE_API_KEY || YOUTUBE_API_KEY === 'your_youtube_api_key_here') {
+    if (!youtubeConfigured()) {
       console.log('⚠️ YouTube API key not configured, using fallback recommendations');
       return getFallbackRecommendations(topic);
     }
@@ -205,7 +260,8 @@ export async function getVideoRecommendations(topic, maxVideos = 10, minDuration
     // Step 1: Collect UNFILTERED data (50+ videos for ML analysis)
     console.log('Step 1: Collecting UNFILTERED video data for ML analysis...');
     const collectDataScript = 'collect_data_for_ml.py';
-    const fetchCount = Math.max(maxVideos * 10, 50); // Collect many videos for ML analysis
+    // Collect many videos for ML analysis (ml_model/topic_cache.py fetch_count mirrors this)
+    const fetchCount = Math.max(maxVideos * 10, 50);
     await runPythonScript(collectDataScript, [topic, fetchCount.toString()]);
     console.log(`Collected ${fetchCount} unfiltered videos for ML analysis`);
 
@@ -224,6 +280,7 @@ export async function getVideoRecommendations(topic, maxVideos = 10, minDuration
 
     if (videoLinks.length > 0) {
       console.log(`✅ ML pipeline completed. Found ${videoLinks.length} ML-ranked videos`);
+      await cacheRecommendations(topic, videoLinks, maxVideos, minDurationMinutes);
       return videoLinks;
     } else {
       console.log('⚠️ ML pipeline returned no videos, trying filtered fallback');
@@ -377,159 +434,17 @@ function calculateTopicSimilarity(topic1, topic2) {
   return matches / Math.max(words1.length, words2.length);
 }
 
-// Enhanced ML pipeline integration for better Python script execution
+// Verify the ML pipeline scripts are present. They are versioned in ml_model/ and
+// instrumented there, so they must not be regenerated from inline copies here.
 export async function createModifiedPythonScripts() {
+  const requiredScripts = ['collect_data_modified.py', 'pipeline_runner.py'];
   try {
-    // Create a modified collect_data.py that accepts command line arguments
-    const modifiedCollectData = `
-import os
-import sys
-from dotenv import load_dotenv
-import googleapiclient.discovery
-import pandas as pd
-
-load_dotenv()
-API_KEY = os.getenv("YOUTUBE_API_KEY")
-
-def fetch_videos(query, max_results=10):
-    if not API_KEY or API_KEY == 'your_youtube_api_key_here':
-        print("Warning: YouTube API key not configured")
-        # Return empty dataframe for fallback
-        return pd.DataFrame()
-        
-    youtube = googleapiclient.discovery.build("youtube", "v3", developerKey=API_KEY)
-    search_response = youtube.search().list(
-        q=query, part="snippet", maxResults=max_results, type="video"
-    ).execute()
-
-    videos = []
-    for item in search_response["items"]:
-        video_id = item["id"]["videoId"]
-
-        # Fetch video statistics
-        stats = youtube.videos().list(
-            part="statistics,contentDetails,snippet", id=video_id
-        ).execute()
-
-        for vid in stats["items"]:
-            data = {
-                "video_id": video_id,
-                "title": vid["snippet"]["title"],
-                "description": vid["snippet"].get("description", ""),
-                "publishedAt": vid["snippet"]["publishedAt"],
-                "duration": vid["contentDetails"]["duration"],
-                "view_count": int(vid["statistics"].get("viewCount", 0)),
-                "like_count": int(vid["statistics"].get("likeCount", 0)),
-                "comment_count": int(vid["statistics"].get("commentCount", 0)),
-            }
-            videos.append(data)
-
-    return pd.DataFrame(videos)
-
-if __name__ == "__main__":
-    if len(sys.argv) > 1:
-        query = sys.argv[1]
-        max_results = int(sys.argv[2]) if len(sys.argv) > 2 else 10
-    else:
-        query = "programming tutorial"
-        max_results = 10
-        
-    print(f"Fetching videos for: {query}")
-    df = fetch_videos(query, max_results)
-    
-    if df.empty:
-        print("No videos fetched - API key not configured or API error")
-        # Create dummy data for testing
-        df = pd.DataFrame({
-            'video_id': ['dQw4w9WgXcQ', 'jNQXAC9IVRw', 'fJ9rUzIMcZQ'],
-            'title': [f'{query} Tutorial 1', f'{query} Tutorial 2', f'{query} Tutorial 3'],
-            'description': [f'Learn {query}', f'Complete {query} guide', f'{query} for beginners'],
-            'publishedAt': ['2023-01-01T00:00:00Z', '2023-01-02T00:00:00Z', '2023-01-03T00:00:00Z'],
-            'duration': ['PT10M30S', 'PT15M45S', 'PT8M20S'],
-            'view_count': [1000000, 500000, 750000],
-            'like_count': [10000, 5000, 7500],
-            'comment_count': [1000, 500, 750]
-        })
-    
-    df.to_csv("raw_videos.csv", index=False)
-    print(f"Fetched and saved {len(df)} videos to raw_videos.csv")
-`;
-
-    await fs.writeFile(path.join(ML_MODEL_DIR, 'collect_data_modified.py'), modifiedCollectData);
-
-    // Create a simple runner script that handles the full pipeline
-    const pipelineRunner = `
-import subprocess
-import sys
-import os
-import pandas as pd
-
-import time
-
-def run_ml_pipeline(topic, max_videos=10):
-    try:
-        start_total = time.time()
-        
-        # Step 1: Collect data
-        print(f"Collecting data for: {topic}", flush=True)
-        start_t = time.time()
-        subprocess.run([sys.executable, "collect_data_modified.py", topic, str(max_videos)], check=True)
-        print(f"Step 1 Complete: {time.time() - start_t:.2f}s", flush=True)
-        
-        # Step 2: Create features
-        print("Creating features...", flush=True)
-        start_t = time.time()
-        subprocess.run([sys.executable, "features.py"], check=True)
-        print(f"Step 2 Complete: {time.time() - start_t:.2f}s", flush=True)
-        
-        # Step 3: Train and rank
-        print("Training and ranking...", flush=True)
-        start_t = time.time()
-        subprocess.run([sys.executable, "train_and_rank.py"], check=True)
-        print(f"Step 3 Complete: {time.time() - start_t:.2f}s", flush=True)
-        
-        print(f"Total Pipeline Time: {time.time() - start_total:.2f}s", flush=True)
-        
-        # Read the results
-        if os.path.exists("features.csv"):
-            df = pd.read_csv("features.csv")
-            if "video_id" in df.columns:
-                top_videos = df.nlargest(5, "target_score") if "target_score" in df.columns else df.head(5)
-                print("Top 5 ranked video links:", flush=True)
-                for i, (_, row) in enumerate(top_videos.iterrows()):
-                    video_link = f"{i+1}. https://www.youtube.com/watch?v={row['video_id']}"
-                    print(video_link, flush=True)
-                    print(f"   - Title: {row.get('title', 'Unknown Title')}", flush=True)
-                    # Try to get duration from numeric minutes or string
-                    duration = row.get('duration_minutes', 0)
-                    if isinstance(duration, (int, float)):
-                         print(f"   - Duration: {duration:.1f} minutes", flush=True)
-                    else:
-                         print(f"   - Duration: {row.get('duration', '0')} minutes", flush=True)
-                         
-                    print(f"   - ML Score: {row.get('target_score', 0):.3f}", flush=True)
-                return True
-        
-        print("No results generated", flush=True)
-        return False
-        
-    except Exception as e:
-        print(f"Pipeline failed: {str(e)}", flush=True)
-        return False
-
-if __name__ == "__main__":
-    topic = sys.argv[1] if len(sys.argv) > 1 else "programming"
-    max_videos = int(sys.argv[2]) if len(sys.argv) > 2 else 10
-    run_ml_pipeline(topic, max_videos)
-`;
-
-    await fs.writeFile(path.join(ML_MODEL_DIR, 'pipeline_runner.py'), pipelineRunner);
-
-    console.log('✅ Modified Python scripts created successfully');
+    for (const script of requiredScripts) {
+      await fs.access(path.join(ML_MODEL_DIR, script));
+    }
     return true;
-
   } catch (error) {
-    console.error('❌ Failed to create modified Python scripts:', error);
+    console.error('❌ ML pipeline scripts missing from ml_model/:', error.message);
     return false;
   }
-}
\ No newline at end of file
+}